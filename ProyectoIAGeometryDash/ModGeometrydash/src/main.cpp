@@ -2,6 +2,18 @@
 #include <Geode/modify/PlayLayer.hpp>
 #include <fstream>
 #include <filesystem>
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+#include <cstring>
+
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <unistd.h>
+#endif
 
 using namespace geode::prelude;
 
@@ -9,6 +21,18 @@ static std::ofstream g_TempLogFile;
 const std::filesystem::path AI_LOG_DIR = std::filesystem::current_path() / "geode" / "logs";
 const std::filesystem::path AI_LOG_TEMP = AI_LOG_DIR / "gd_ai_log_temp.log";
 const std::filesystem::path AI_LOG_FINAL = AI_LOG_DIR / "gd_ai_log.log";
+const std::filesystem::path AI_RING_PATH = AI_LOG_DIR / "gd_ai_ring.bin";
+
+static bool g_TextLogEnabled = true;
+static bool g_RingEnabled = false;
+static uint32_t g_AttemptId = 0;
+static uint32_t g_FrameSeq = 0;
+
+// Instante de emisión en µs desde epoch (mismo reloj que time.time_ns() en Python)
+uint64_t nowMicros() {
+    return std::chrono::duration_cast<std::chrono::microseconds>(
+        std::chrono::system_clock::now().time_since_epoch()).count();
+}
 
 void openTempLog() {
     if (g_TempLogFile.is_open()) g_TempLogFile.close();
@@ -31,6 +55,122 @@ void saveLogAsFinal() {
     }
 }
 
+// --- BUFFER CIRCULAR BINARIO (ver gd_ring.py) ---
+// Registros de tamaño fijo en un archivo mapeado en memoria. El slot se marca
+// con seq=0 mientras se escribe y luego se publica su seq y el writeSeq global.
+constexpr uint32_t RING_VERSION = 2;
+constexpr uint32_t RING_CAPACITY = 4096;
+
+enum RingKind : uint32_t {
+    RING_STATE = 1,
+    RING_DEATH = 2,
+    RING_WIN = 3,
+    RING_SESSION_START = 4
+};
+
+#pragma pack(push, 1)
+struct RingHeader {
+    char magic[4];
+    uint32_t version;
+    uint32_t recordSize;
+    uint32_t capacity;
+    uint64_t writeSeq;
+    uint8_t reserved[40];
+};
+
+struct RingRecord {
+    uint64_t seq;
+    uint32_t kind;
+    float x;
+    float y;
+    float vely;
+    uint8_t ground;
+    uint8_t matrix[15];
+    uint32_t frame;
+    uint64_t tUs;
+};
+#pragma pack(pop)
+
+static_assert(sizeof(RingHeader) == 64, "RingHeader debe medir 64 bytes");
+static_assert(sizeof(RingRecord) == 52, "RingRecord debe medir 52 bytes");
+
+static RingHeader* g_Ring = nullptr;
+static RingRecord* g_RingRecords = nullptr;
+
+void openRing() {
+    if (g_Ring) return;
+    std::filesystem::create_directories(AI_RING_PATH.parent_path());
+    size_t size = sizeof(RingHeader) + RING_CAPACITY * sizeof(RingRecord);
+    void* view = nullptr;
+
+#ifdef _WIN32
+    HANDLE file = CreateFileW(AI_RING_PATH.wstring().c_str(), GENERIC_READ | GENERIC_WRITE,
+        FILE_SHARE_READ | FILE_SHARE_WRITE, nullptr, OPEN_ALWAYS, FILE_ATTRIBUTE_NORMAL, nullptr);
+    if (file == INVALID_HANDLE_VALUE) return;
+    HANDLE mapping = CreateFileMappingW(file, nullptr, PAGE_READWRITE, 0, (DWORD)size, nullptr);
+    CloseHandle(file);
+    if (!mapping) return;
+    view = MapViewOfFile(mapping, FILE_MAP_ALL_ACCESS, 0, 0, size);
+    CloseHandle(mapping);
+#else
+    int fd = ::open(AI_RING_PATH.c_str(), O_RDWR | O_CREAT, 0644);
+    if (fd < 0) return;
+    if (::ftruncate(fd, size) != 0) { ::close(fd); return; }
+    view = ::mmap(nullptr, size, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+    ::close(fd);
+    if (view == MAP_FAILED) view = nullptr;
+#endif
+    if (!view) return;
+
+    g_Ring = static_cast<RingHeader*>(view);
+    g_RingRecords = reinterpret_cast<RingRecord*>(g_Ring + 1);
+
+    // Cabecera nueva en cada arranque del juego: el lector detecta el reinicio
+    std::memset(view, 0, size);
+    std::memcpy(g_Ring->magic, "GDRB", 4);
+    g_Ring->recordSize = sizeof(RingRecord);
+    g_Ring->capacity = RING_CAPACITY;
+    std::atomic_thread_fence(std::memory_order_release);
+    g_Ring->version = RING_VERSION;
+}
+
+void writeRing(uint32_t kind, float x = 0.0f, float y = 0.0f, float vely = 0.0f,
+               bool ground = false, const uint8_t* matrix = nullptr,
+               uint32_t frame = 0, uint64_t tUs = 0) {
+    if (!g_Ring) return;
+    uint64_t seq = g_Ring->writeSeq + 1;
+    RingRecord& rec = g_RingRecords[(seq - 1) % RING_CAPACITY];
+
+    rec.seq = 0;
+    std::atomic_thread_fence(std::memory_order_release);
+    rec.kind = kind;
+    rec.x = x;
+    rec.y = y;
+    rec.vely = vely;
+    rec.ground = ground ? 1 : 0;
+    if (matrix) std::memcpy(rec.matrix, matrix, sizeof(rec.matrix));
+    else std::memset(rec.matrix, 0, sizeof(rec.matrix));
+    rec.frame = frame;
+    rec.tUs = tUs;
+    std::atomic_thread_fence(std::memory_order_release);
+    rec.seq = seq;
+    std::atomic_thread_fence(std::memory_order_release);
+    g_Ring->writeSeq = seq;
+}
+
+void writeEvent(const char* text, uint32_t kind) {
+    if (g_TextLogEnabled) writeTempLog(text);
+    if (g_RingEnabled) writeRing(kind);
+}
+
+// Handshake de reinicio: SESSION_START|id con id creciente en cada intento.
+// En el buffer circular el id viaja en el campo x.
+void writeSessionStart() {
+    g_AttemptId++;
+    if (g_TextLogEnabled) writeTempLog(fmt::format("SESSION_START|{}", g_AttemptId));
+    if (g_RingEnabled) writeRing(RING_SESSION_START, static_cast<float>(g_AttemptId));
+}
+
 // 0: Aire, 1: Sólido, 2: Mortal
 int scanPoint(float x, float y, CCArray* objects) {
     if (!objects) return 0;
@@ -91,8 +231,11 @@ public:
 
     bool init(GJGameLevel* level, bool useReplay, bool dontCreateObjects) {
         if (!PlayLayer::init(level, useReplay, dontCreateObjects)) return false;
-        openTempLog();
-        writeTempLog("SESSION_START");
+        g_TextLogEnabled = Mod::get()->getSettingValue<bool>("text-log");
+        g_RingEnabled = Mod::get()->getSettingValue<bool>("ring-buffer");
+        if (g_TextLogEnabled) openTempLog();
+        if (g_RingEnabled) openRing();
+        writeSessionStart();
         this->schedule(schedule_selector(MyPlayLayer::updateBot));
         return true;
     }
@@ -115,36 +258,58 @@ public:
         // +0  (Centro/Frente)
         // +30 (Cabeza/Aéreo)
         
-        std::string matrixData = "";
+        uint8_t matrix[15];
         
         for (int i = 1; i <= 5; i++) {
             float dist = i * 30.0f; // 30, 60, 90, 120, 150
             float checkX = px + dist;
             
-            int valLow  = scanPoint(checkX, py - 20.0f, m_objects);
-            int valMid  = scanPoint(checkX, py, m_objects);
-            int valHigh = scanPoint(checkX, py + 30.0f, m_objects);
+            // Formato: L,M,H por distancia
+            matrix[(i - 1) * 3 + 0] = scanPoint(checkX, py - 20.0f, m_objects);
+            matrix[(i - 1) * 3 + 1] = scanPoint(checkX, py, m_objects);
+            matrix[(i - 1) * 3 + 2] = scanPoint(checkX, py + 30.0f, m_objects);
+        }
+
+        float vely = m_player1->m_yVelocity;
+        bool ground = m_player1->m_isOnGround;
+
+        // Contador de STATE emitidos (huecos = frames perdidos) e instante de emisión
+        uint32_t frame = ++g_FrameSeq;
+        uint64_t tUs = nowMicros();
+
+        if (g_RingEnabled) {
+            writeRing(RING_STATE, px, py, vely, ground, matrix, frame, tUs);
+        }
+
+        if (g_TextLogEnabled) {
+            std::string matrixData = "";
+            for (int i = 0; i < 15; i += 3) {
+                matrixData += fmt::format("{},{},{},", matrix[i], matrix[i + 1], matrix[i + 2]);
+            }
+
+            // STATE|X|Y|Vel|G|GridMatrix...|Frame|T_us
+            std::string logLine = fmt::format("STATE|{:.1f}|{:.1f}|{:.1f}|{}|{}|{}|{}", 
+                px, py, vely, ground ? 1 : 0, matrixData, frame, tUs);
             
-            // Formato: L,M,H,
-            matrixData += fmt::format("{},{},{},", valLow, valMid, valHigh);
+            writeTempLog(logLine);
         }
+    }
 
-        // STATE|X|Y|Vel|G|GridMatrix...
-        std::string logLine = fmt::format("STATE|{:.1f}|{:.1f}|{:.1f}|{}|{}", 
-            px, py, m_player1->m_yVelocity, m_player1->m_isOnGround ? 1 : 0, matrixData);
-        
-        writeTempLog(logLine);
+    void resetLevel() {
+        PlayLayer::resetLevel();
+        m_fields->lastPlayerPos = {0.0f, 0.0f};
+        writeSessionStart();
     }
 
     void destroyPlayer(PlayerObject* player, GameObject* object) {
         PlayLayer::destroyPlayer(player, object);
-        writeTempLog("DEATH");
+        writeEvent("DEATH", RING_DEATH);
         saveLogAsFinal();
     }
 
     void levelComplete() {
         PlayLayer::levelComplete();
-        writeTempLog("WIN");
+        writeEvent("WIN", RING_WIN);
         saveLogAsFinal();
     }
 };
\ No newline at end of file
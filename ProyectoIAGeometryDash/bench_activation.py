@@ -0,0 +1,141 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Benchmark de activación de redes
+================================================================================
+
+Descripción:
+    Genera una población con la config.txt real (50 genomas) y la muta varias
+    veces para tener topologías con nodos ocultos. Luego:
+
+    1. Verifica que CompiledNetwork y PopulationNetwork coincidan con
+       ``FeedForwardNetwork.activate`` (error máximo absoluto).
+    2. Mide activaciones/segundo de la red genérica genoma por genoma contra
+       la población apilada en una sola llamada por lote.
+    3. Latencia por frame (una llamada, como en vivo) de la red genérica
+       contra la función generada del modo "play".
+
+Uso:
+    python bench_activation.py [--batch 256] [--mutations 30]
+================================================================================
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import neat
+import numpy as np
+
+from gd_compiled import CompiledNetwork, PopulationNetwork, load_generated, max_abs_error
+
+
+def load_config() -> neat.Config:
+    config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.txt')
+    return neat.Config(
+        neat.DefaultGenome,
+        neat.DefaultReproduction,
+        neat.DefaultSpeciesSet,
+        neat.DefaultStagnation,
+        config_path
+    )
+
+
+def mutated_population(config: neat.Config, mutations: int, seed: int = 0) -> list:
+    random.seed(seed)
+    population = neat.Population(config)
+    genomes = sorted(population.population.items())
+    for _, genome in genomes:
+        for _ in range(mutations):
+            genome.mutate(config.genome_config)
+    return genomes
+
+
+def random_inputs(batch: int, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    inputs = np.empty((batch, 19))
+    inputs[:, 0] = rng.uniform(-0.5, 1.5, batch)
+    inputs[:, 1] = rng.uniform(-1.0, 1.0, batch)
+    inputs[:, 2] = rng.integers(0, 2, batch)
+    inputs[:, 3] = 1.0
+    inputs[:, 4:] = rng.integers(0, 3, (batch, 15))
+    return inputs
+
+
+def best_rate(fn, activations: int, repeat: int = 5) -> float:
+    """Mejor tasa (activaciones/s) de varias repeticiones, para filtrar ruido."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return activations / best
+
+
+def frame_latency_us(activations, rows: list) -> float:
+    """Latencia media de una llamada activate(row), como en el bucle en vivo."""
+    start = time.perf_counter()
+    for activate in activations:
+        for row in rows:
+            activate(row)
+    return (time.perf_counter() - start) / (len(activations) * len(rows)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de activación NEAT")
+    parser.add_argument('--batch', type=int, default=256)
+    parser.add_argument('--mutations', type=int, default=30)
+    args = parser.parse_args()
+
+    config = load_config()
+    genomes = mutated_population(config, args.mutations)
+    inputs = random_inputs(args.batch)
+
+    # --- Equivalencia ---
+    worst = max(max_abs_error(g, config, inputs[:64]) for _, g in genomes)
+    population = PopulationNetwork.create(genomes, config)
+    stacked = population.activate_batch(inputs[:64])
+    for g, (_, genome) in enumerate(genomes):
+        net = neat.nn.FeedForwardNetwork.create(genome, config)
+        expected = np.array([net.activate(list(row)) for row in inputs[:64]])
+        worst = max(worst, float(np.max(np.abs(stacked[g] - expected))))
+
+    hidden = [len(g.nodes) - config.genome_config.num_outputs for _, g in genomes]
+    print(f"genomas: {len(genomes)}  ocultos: media {np.mean(hidden):.1f} máx {max(hidden)}"
+          f"  capas: {len(population.offsets)}")
+    print(f"error máximo vs FeedForwardNetwork: {worst:.2e}")
+
+    # --- Rendimiento ---
+    nets = [neat.nn.FeedForwardNetwork.create(g, config) for _, g in genomes]
+    rows = [list(row) for row in inputs]
+    start = time.perf_counter()
+    for net in nets:
+        for row in rows:
+            net.activate(row)
+    generic = len(nets) * len(rows) / (time.perf_counter() - start)
+    print(f"FeedForwardNetwork.activate (genoma x fila): {generic:>12,.0f} activaciones/s")
+
+    compiled = [CompiledNetwork.create(g, config) for _, g in genomes]
+    print(f"{'lote':>6}{'Compiled (por genoma)':>24}{'Population (1 llamada)':>24}")
+    for batch in (1, 16, args.batch):
+        chunk = inputs[:batch]
+        per_genome = best_rate(lambda: [net.activate_batch(chunk) for net in compiled],
+                               len(compiled) * batch)
+        batched = best_rate(lambda: population.activate_batch(chunk), len(genomes) * batch)
+        print(f"{batch:>6}{per_genome:>24,.0f}{batched:>24,.0f}")
+
+    # --- Latencia por frame: genérica vs generada ---
+    cache_dir = tempfile.mkdtemp(prefix='gd_nets_')
+    generated = [load_generated(g, config, cache_dir) for _, g in genomes]
+    for net, gen in zip(nets, generated):
+        for row in rows[:32]:
+            assert net.activate(row) == gen.activate(row)
+
+    generic_us = frame_latency_us([net.activate for net in nets], rows)
+    generated_us = frame_latency_us([gen.activate for gen in generated], rows)
+    print(f"latencia por frame: genérica {generic_us:.2f}µs → generada {generated_us:.2f}µs"
+          f" ({generic_us / generated_us:.1f}x, salidas idénticas)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Modelo de islas vs una población grande
+================================================================================
+
+Descripción:
+    Evalúa en ``gd_sim`` (determinista) dos cosas:
+
+    1. Escalado de throughput: genomas evaluados por segundo con 1, 2, 4...
+       islas de ``--pop`` genomas cada una (un proceso por isla). En una
+       máquina con C núcleos debería crecer casi lineal hasta K = C.
+    2. Tiempo hasta el objetivo: una población de K × ``--pop`` en un solo
+       proceso contra K islas de ``--pop`` con migración cada
+       ``--interval`` generaciones, hasta que el mejor llega a ``--target``
+       % del nivel (mismas semillas en los dos modos).
+
+Uso:
+    python bench_islands.py [--islands 4] [--pop 50] [--generations 30]
+                            [--interval 5] [--target 100] [--seeds 3]
+================================================================================
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import types
+
+sys.modules.setdefault('keyboard', types.ModuleType('keyboard'))
+
+from gd_islands import IslandModel
+from gd_common import distance_fitness
+from gd_sim import SimBackend
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.txt')
+
+
+class SimFitness:
+    """``eval_genomes`` en el simulador; serializable (el backend se crea en cada proceso)."""
+
+    def __init__(self, level_path=None):
+        self.level_path = level_path
+        self._backend = None
+
+    def __getstate__(self):
+        return {'level_path': self.level_path, '_backend': None}
+
+    def __call__(self, genomes, config):
+        if self._backend is None:
+            self._backend = SimBackend(self.level_path)
+        for _, genome in genomes:
+            genome.fitness = self._backend.simulate(genome, config).fitness
+
+
+def _run(islands: int, pop: int, generations: int, interval: int, migrants: int,
+         seed: int, target=None, level=None) -> tuple[IslandModel, float]:
+    model = IslandModel(CONFIG_PATH, SimFitness(level), islands=islands,
+                        migration_interval=interval, migrants=migrants, pop_size=pop,
+                        seed=seed, target=target, verbose=False)
+    start = time.perf_counter()
+    model.run(generations)
+    return model, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modelo de islas vs población única (gd_sim)")
+    parser.add_argument('--islands', type=int, default=4)
+    parser.add_argument('--pop', type=int, default=50, help="genomas por isla")
+    parser.add_argument('--generations', type=int, default=30)
+    parser.add_argument('--interval', type=int, default=5, help="generaciones entre migraciones")
+    parser.add_argument('--migrants', type=int, default=2)
+    parser.add_argument('--target', type=float, default=100.0, help="% del nivel")
+    parser.add_argument('--seeds', type=int, default=3)
+    parser.add_argument('--level', default=None, help="nivel ASCII (por defecto DEMO_LEVEL)")
+    args = parser.parse_args()
+
+    sys.stdout.reconfigure(encoding='utf-8')
+    print(f"🖥 {os.cpu_count()} núcleos")
+
+    # 1. Throughput: cada isla con --pop genomas, pocas generaciones sin objetivo
+    print(f"\n{'islas':>6}{'genomas/s':>12}{'escala':>9}")
+    base = None
+    k = 1
+    while k <= args.islands:
+        model, elapsed = _run(k, args.pop, 5, 5, args.migrants, 0, level=args.level)
+        rate = model.evaluations / elapsed
+        base = base or rate
+        print(f"{k:>6}{rate:>12.0f}{rate / base:>8.2f}x")
+        k *= 2
+
+    # 2. Tiempo hasta el objetivo
+    length = SimBackend(args.level).level.length
+    target = distance_fitness(length * args.target / 100.0)
+    modes = {
+        f"1 × {args.islands * args.pop}": (1, args.islands * args.pop),
+        f"{args.islands} × {args.pop}": (args.islands, args.pop),
+    }
+    print(f"\nhasta {args.target:.0f}% del nivel (fitness {target:.0f}), "
+          f"máximo {args.generations} generaciones:")
+    results = {name: [] for name in modes}
+    for seed in range(args.seeds):
+        for name, (islands, pop) in modes.items():
+            model, elapsed = _run(islands, pop, args.generations, args.interval,
+                                  args.migrants, seed, target, args.level)
+            results[name].append(model.reached_at)
+            reached = "✗" if model.reached_at is None else f"{model.reached_at:.1f}s"
+            print(f"   semilla {seed} {name:<10}: {reached:>7}, mejor "
+                  f"{model.best_genome.fitness:.0f}, {model.evaluations} evaluaciones "
+                  f"en {elapsed:.1f}s")
+
+    print(f"\n{'modo':<12}{'mediana':>10}{'llegaron':>10}")
+    for name, times in results.items():
+        done = [t for t in times if t is not None]
+        median = f"{statistics.median(done):.1f}s" if done else "-"
+        print(f"{name:<12}{median:>10}{len(done):>7}/{len(times)}")
+
+
+if __name__ == "__main__":
+    main()
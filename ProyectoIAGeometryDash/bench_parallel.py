@@ -0,0 +1,80 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Escalado de la evaluación paralela
+================================================================================
+
+Descripción:
+    Evalúa la misma población mutada con SimBackend en serie y con
+    ParallelEvaluator de 1 a N procesos. Verifica que las fitness sean
+    idénticas a la serie y reporta genomas/segundo y aceleración.
+
+    La primera generación de cada evaluador incluye el arranque de procesos y
+    la compilación de redes, por eso se reportan aparte "frío" y "caliente"
+    (segunda pasada, redes ya en la caché de cada worker).
+
+Uso:
+    python bench_parallel.py [--genomes 400] [--max-workers N]
+================================================================================
+"""
+
+import argparse
+import os
+import sys
+import time
+import types
+from functools import partial
+
+sys.modules.setdefault('keyboard', types.ModuleType('keyboard'))
+
+from bench_activation import load_config, mutated_population
+from gd_parallel import ParallelEvaluator, SerialEvaluator
+from gd_sim import SimBackend
+
+
+def timed(evaluator, genomes, config):
+    start = time.perf_counter()
+    fitnesses = evaluator.evaluate(genomes, config)
+    return fitnesses, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Escalado de ParallelEvaluator")
+    parser.add_argument('--genomes', type=int, default=400)
+    parser.add_argument('--mutations', type=int, default=30)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    parser.add_argument('--level', default=None, help="nivel ASCII (por defecto DEMO_LEVEL)")
+    args = parser.parse_args()
+
+    config = load_config()
+    genomes = []
+    seed = 0
+    while len(genomes) < args.genomes:
+        batch = mutated_population(config, args.mutations, seed=seed)
+        genomes.extend((len(genomes) + i, g) for i, (_, g) in enumerate(batch))
+        seed += 1
+    genomes = genomes[:args.genomes]
+
+    factory = partial(SimBackend, args.level)
+    serial = SerialEvaluator(factory)
+    expected, _ = timed(serial, genomes, config)
+    _, serial_time = timed(serial, genomes, config)
+    serial_rate = len(genomes) / serial_time
+
+    print(f"núcleos: {os.cpu_count()}  genomas: {len(genomes)}")
+    print(f"{'workers':>8}{'frío g/s':>12}{'caliente g/s':>14}{'aceleración':>13}  idéntica")
+    print(f"{'serie':>8}{'':>12}{serial_rate:>14,.0f}{1.0:>13.2f}  sí")
+
+    for workers in range(1, args.max_workers + 1):
+        evaluator = ParallelEvaluator(factory, workers)
+        cold, cold_time = timed(evaluator, genomes, config)
+        warm, warm_time = timed(evaluator, genomes, config)
+        evaluator.close()
+
+        same = cold == expected and warm == expected
+        rate = len(genomes) / warm_time
+        print(f"{workers:>8}{len(genomes) / cold_time:>12,.0f}{rate:>14,.0f}"
+              f"{rate / serial_rate:>13.2f}  {'sí' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
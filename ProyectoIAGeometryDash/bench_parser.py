@@ -0,0 +1,95 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Microbenchmark del parser
+================================================================================
+
+Descripción:
+    Compara parses por segundo de:
+    - antes:  GameStateParser.parse + LevelSession._build_inputs (GameState,
+              lista de matriz, time.time() y lista de inputs por frame)
+    - ahora:  GameStateParser.parse_into sobre un CompactState reutilizado
+
+    Usa líneas STATE sintéticas con matrices variadas (como en un nivel real)
+    y verifica que ambos caminos produzcan los mismos 19 inputs.
+
+Uso:
+    python bench_parser.py [--lines 200000]
+================================================================================
+"""
+
+import argparse
+import random
+import sys
+import time
+import types
+
+sys.modules.setdefault('keyboard', types.ModuleType('keyboard'))
+
+from gd_common import CompactState
+from gd_live import GameStateParser, LevelSession
+
+
+def synthetic_lines(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    # Pocas matrices distintas, como en un nivel: mayormente aire con obstáculos
+    matrices = [
+        "".join(f"{rng.choice((0, 0, 0, 1, 2))}," for _ in range(15))
+        for _ in range(64)
+    ]
+    lines = []
+    for i in range(count):
+        lines.append(
+            f"STATE|{i * 5.2:.1f}|{105.0 + rng.uniform(0, 90):.1f}|"
+            f"{rng.uniform(-15, 15):.1f}|{rng.randint(0, 1)}|{rng.choice(matrices)}"
+        )
+    return lines
+
+
+def bench_before(lines: list[str]) -> float:
+    parser = GameStateParser()
+    session = LevelSession.__new__(LevelSession)
+    start = time.perf_counter()
+    for line in lines:
+        _, state = parser.parse(line)
+        session._build_inputs(state)
+    return len(lines) / (time.perf_counter() - start)
+
+
+def bench_after(lines: list[str]) -> float:
+    parser = GameStateParser()
+    state = CompactState()
+    start = time.perf_counter()
+    for line in lines:
+        parser.parse_into(line, state)
+    return len(lines) / (time.perf_counter() - start)
+
+
+def check_equivalence(lines: list[str]):
+    parser = GameStateParser()
+    session = LevelSession.__new__(LevelSession)
+    compact = CompactState()
+    for line in lines[:1000]:
+        _, state = parser.parse(line)
+        parser.parse_into(line, compact)
+        assert list(compact.inputs) == session._build_inputs(state), line
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark de GameStateParser")
+    parser.add_argument('--lines', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    lines = synthetic_lines(args.lines)
+    check_equivalence(lines)
+
+    before = max(bench_before(lines) for _ in range(args.repeat))
+    after = max(bench_after(lines) for _ in range(args.repeat))
+
+    print(f"antes (parse + _build_inputs): {before:>12,.0f} parses/s")
+    print(f"ahora (parse_into):            {after:>12,.0f} parses/s")
+    print(f"aceleración:                   {after / before:>12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
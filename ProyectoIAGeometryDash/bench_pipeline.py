@@ -0,0 +1,282 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Benchmark del pipeline de entrenamiento
+================================================================================
+
+Descripción:
+    Línea base reproducible del bucle en vivo, sin el juego ni ``keyboard``
+    (se reemplaza por un módulo vacío, funciona en un Linux cualquiera):
+
+    - reader.read_raw / read_lines: SafeLogReader sobre un log ya escrito
+    - parser.parse / parse_into:    GameStateParser
+    - build_inputs:                 LevelSession._build_inputs
+    - activate.generic / generated: FeedForwardNetwork vs función generada
+    - session.*:                    LevelSession.run completo contra un
+      proceso escritor que agrega líneas al log a ``--fps`` (como el mod):
+      latencia de lectura y de la IA por frame, frames saltados y CPU del
+      lector. El progreso que imprime la sesión se descarta para no
+      mezclarse con la tabla.
+
+    ``--save`` guarda las métricas en JSON y ``--compare`` las contrasta con
+    una línea base: cualquier métrica que empeore más que ``--tolerance``
+    hace que el script termine con código 1 (útil antes de entrenar horas).
+
+Uso:
+    python bench_pipeline.py [--fps 240] [--lines 2000] [--micro-lines 100000]
+    python bench_pipeline.py --save baseline.json
+    python bench_pipeline.py --compare baseline.json [--tolerance 0.25]
+================================================================================
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+import types
+
+sys.modules.setdefault('keyboard', types.ModuleType('keyboard'))
+
+import neat
+
+from bench_activation import load_config, mutated_population
+from bench_parser import synthetic_lines
+from gd_compiled import compile_generated
+from gd_latency import FrameStats
+from gd_common import CompactState
+from gd_live import GameStateParser, LevelSession, RecordingController, SafeLogReader
+
+HIGHER = "higher"
+LOWER = "lower"
+
+
+# ============================================================================
+# ESCRITOR SINTÉTICO
+# ============================================================================
+def write_log(path: str, lines: list[str]):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def writer_process(path: str, fps: float, count: int, seed: int = 0):
+    """Emula al mod: SESSION_START, ``count`` STATE a ``fps`` y WIN."""
+    rng = random.Random(seed)
+    matrices = ["".join(f"{rng.choice((0, 0, 0, 1, 2))}," for _ in range(15))
+                for _ in range(64)]
+    period = 1.0 / fps
+
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write("SESSION_START|1\n")
+        f.flush()
+
+        next_t = time.perf_counter()
+        for frame in range(1, count + 1):
+            f.write(f"STATE|{frame * 5.2:.1f}|{105.0 + rng.uniform(0, 90):.1f}|"
+                    f"{rng.uniform(-15, 15):.1f}|{rng.randint(0, 1)}|{rng.choice(matrices)}"
+                    f"|{frame}|{time.time_ns() // 1000}\n")
+            f.flush()
+
+            next_t += period
+            delay = next_t - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        f.write("WIN\n")
+        f.flush()
+
+
+# ============================================================================
+# MEDICIONES
+# ============================================================================
+def best_rate(fn, items: int, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return items / best
+
+
+def bench_reader(lines: list[str], repeat: int) -> dict:
+    path = os.path.join(tempfile.mkdtemp(prefix='gd_bench_'), 'gd_ai_log_temp.log')
+    write_log(path, lines)
+
+    def read_raw():
+        reader = SafeLogReader(path)
+        while reader.read_raw() is not None:
+            pass
+        reader.close()
+
+    def read_lines():
+        reader = SafeLogReader(path)
+        reader.read_lines()
+        reader.close()
+
+    return {
+        'reader.read_raw': (best_rate(read_raw, len(lines), repeat), "líneas/s", HIGHER),
+        'reader.read_lines': (best_rate(read_lines, len(lines), repeat), "líneas/s", HIGHER),
+    }
+
+
+def bench_parser(lines: list[str], repeat: int) -> dict:
+    parser = GameStateParser()
+    session = LevelSession.__new__(LevelSession)
+    state = CompactState()
+    parsed = [parser.parse(line)[1] for line in lines]
+
+    def parse():
+        for line in lines:
+            parser.parse(line)
+
+    def parse_into():
+        for line in lines:
+            parser.parse_into(line, state)
+
+    def build_inputs():
+        for game_state in parsed:
+            session._build_inputs(game_state)
+
+    return {
+        'parser.parse': (best_rate(parse, len(lines), repeat), "líneas/s", HIGHER),
+        'parser.parse_into': (best_rate(parse_into, len(lines), repeat), "líneas/s", HIGHER),
+        'build_inputs': (best_rate(build_inputs, len(lines), repeat), "frames/s", HIGHER),
+    }
+
+
+def input_rows(lines: list[str]) -> list[list[float]]:
+    state = CompactState()
+    rows = []
+    for line in lines:
+        GameStateParser.parse_into(line, state)
+        rows.append(list(state.inputs))
+    return rows
+
+
+def bench_activation(nets: list, rows: list, repeat: int) -> dict:
+    generic, generated = nets
+
+    def run(net):
+        for row in rows:
+            net.activate(row)
+
+    return {
+        'activate.generic': (best_rate(lambda: run(generic), len(rows), repeat),
+                             "activaciones/s", HIGHER),
+        'activate.generated': (best_rate(lambda: run(generated), len(rows), repeat),
+                               "activaciones/s", HIGHER),
+    }
+
+
+def bench_session(net, fps: float, count: int) -> dict:
+    path = os.path.join(tempfile.mkdtemp(prefix='gd_bench_'), 'gd_ai_log_temp.log')
+    open(path, 'w').close()
+
+    reader = SafeLogReader(path)
+    stats = FrameStats()
+    controller = RecordingController()
+    session = LevelSession(reader, GameStateParser(), 0, controller=controller, stats=stats)
+
+    writer = multiprocessing.Process(target=writer_process, args=(path, fps, count))
+    writer.start()
+    cpu_start = time.thread_time()
+    wall_start = time.perf_counter()
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            if not session.wait_for_reset(timeout=10.0):
+                raise RuntimeError("el escritor no envió SESSION_START")
+            session.run(net)
+    finally:
+        reader.close()
+        writer.join()
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.thread_time() - cpu_start
+    read = stats.read.summary()
+    return {
+        'session.read_p50': (read['p50'], "µs", LOWER),
+        'session.read_p99': (read['p99'], "µs", LOWER),
+        'session.ai_p50': (stats.ai_p50_us(), "µs", LOWER),
+        'session.skipped': (100.0 * stats.skipped / max(1, stats.states), "% frames", LOWER),
+        'session.cpu': (100.0 * cpu / wall, "% núcleo", LOWER),
+        'session.key_events': (100.0 * controller.event_count / max(1, controller.decision_count),
+                               "% decisiones", LOWER),
+    }
+
+
+# ============================================================================
+# LÍNEA BASE
+# ============================================================================
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Métricas que empeoraron más que ``tolerance`` respecto a la línea base."""
+    regressions = []
+    for name, (value, unit, better) in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name][0]
+        if better == HIGHER:
+            worse = value < base * (1.0 - tolerance)
+        else:
+            # Latencias de pocos µs: margen absoluto para no fallar por ruido
+            worse = value > base * (1.0 + tolerance) + 1.0
+        if worse:
+            regressions.append(f"{name}: {value:,.1f} vs {base:,.1f} {unit}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del pipeline de entrenamiento")
+    parser.add_argument('--fps', type=float, default=240.0, help="frecuencia del escritor")
+    parser.add_argument('--lines', type=int, default=2000, help="líneas STATE del escritor")
+    parser.add_argument('--micro-lines', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--mutations', type=int, default=30)
+    parser.add_argument('--save', default=None, help="guardar métricas en JSON")
+    parser.add_argument('--compare', default=None, help="línea base JSON a comparar")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    config = load_config()
+    _, genome = max(mutated_population(config, args.mutations),
+                    key=lambda item: len(item[1].connections))
+    generic = neat.nn.FeedForwardNetwork.create(genome, config)
+    generated = compile_generated(genome, config)
+
+    # Mismo formato que el mod: contador de frame e instante de emisión al final
+    lines = [line + f"|{i}|0" for i, line in enumerate(synthetic_lines(args.micro_lines), 1)]
+    rows = input_rows(lines[:20_000])
+
+    results = {}
+    results.update(bench_reader(lines, args.repeat))
+    results.update(bench_parser(lines, args.repeat))
+    results.update(bench_activation((generic, generated), rows, args.repeat))
+    results.update(bench_session(generated, args.fps, args.lines))
+
+    print(f"{'métrica':<22}{'valor':>16}  unidad")
+    for name, (value, unit, _) in results.items():
+        print(f"{name:<22}{value:>16,.1f}  {unit}")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 línea base: {args.save}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} regresiones (tolerancia {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print(f"✅ sin regresiones (tolerancia {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
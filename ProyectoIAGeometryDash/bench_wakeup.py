@@ -0,0 +1,125 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Benchmark de espera: spin vs sondeo vs inotify
+================================================================================
+
+Descripción:
+    Un proceso escritor agrega líneas STATE al log a una frecuencia fija (como
+    el mod) con la hora de emisión al final. El lector mide, para cada modo:
+
+    - CPU del hilo lector (% de un núcleo)
+    - Latencia evento → "tecla" (desde que se escribe la línea hasta que el
+      lector la tiene lista para ``keyboard.press``), p50 / p99 / máx.
+
+Uso:
+    python bench_wakeup.py [--fps 240] [--seconds 5]
+================================================================================
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import types
+
+# keyboard no hace falta para medir y en Linux exige root
+sys.modules.setdefault('keyboard', types.ModuleType('keyboard'))
+
+from gd_live import SafeLogReader
+from gd_watch import InotifyWatcher, PollingWatcher
+
+MATRIX = ",".join("0" for _ in range(15)) + ","
+
+
+def writer_process(path: str, fps: float, seconds: float):
+    """Emula al mod: una línea STATE por frame con la hora de emisión (ns)."""
+    period = 1.0 / fps
+    frames = int(fps * seconds)
+
+    with open(path, 'a', encoding='utf-8') as f:
+        next_t = time.perf_counter()
+        for i in range(frames):
+            f.write(f"STATE|{i}.0|105.0|0.0|1|{MATRIX}|{time.time_ns()}\n")
+            f.flush()
+
+            next_t += period
+            delay = next_t - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        f.write(f"WIN|{time.time_ns()}\n")
+        f.flush()
+
+
+def measure(mode: str, fps: float, seconds: float) -> dict:
+    directory = tempfile.mkdtemp(prefix='gd_bench_')
+    path = os.path.join(directory, 'gd_ai_log_temp.log')
+    open(path, 'w').close()
+
+    if mode == 'inotify':
+        watcher = InotifyWatcher(path)
+    elif mode == 'polling':
+        watcher = PollingWatcher(path)
+    else:
+        watcher = None
+
+    reader = SafeLogReader(path, watcher=watcher)
+    latencies = []
+
+    writer = multiprocessing.Process(target=writer_process, args=(path, fps, seconds))
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    writer.start()
+
+    done = False
+    while not done:
+        lines = reader.read_lines()
+        if not lines:
+            if watcher is not None:
+                reader.wait()
+            continue
+
+        now = time.time_ns()
+        for line in lines:
+            latencies.append((now - int(line.rsplit('|', 1)[1])) / 1000.0)
+            if line.startswith('WIN'):
+                done = True
+
+    cpu = time.thread_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    writer.join()
+    reader.close()
+
+    latencies.sort()
+    n = len(latencies)
+    return {
+        'mode': mode,
+        'frames': n,
+        'cpu_pct': 100.0 * cpu / wall,
+        'p50_us': latencies[n // 2],
+        'p99_us': latencies[min(n - 1, int(n * 0.99))],
+        'max_us': latencies[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('Uso:')[0])
+    parser.add_argument('--fps', type=float, default=240.0)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    modes = ['spin', 'polling']
+    if sys.platform.startswith('linux'):
+        modes.append('inotify')
+
+    print(f"{'modo':<10}{'frames':>8}{'CPU %':>9}{'p50 µs':>10}{'p99 µs':>10}{'máx µs':>10}")
+    for mode in modes:
+        r = measure(mode, args.fps, args.seconds)
+        print(f"{r['mode']:<10}{r['frames']:>8}{r['cpu_pct']:>9.1f}"
+              f"{r['p50_us']:>10.0f}{r['p99_us']:>10.0f}{r['max_us']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
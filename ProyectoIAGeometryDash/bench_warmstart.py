@@ -0,0 +1,218 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Arranque en caliente vs población aleatoria
+================================================================================
+
+Descripción:
+    Mide cuántas generaciones tarda NEAT en llegar a un porcentaje del nivel
+    empezando desde ``neat.Population(config)`` (frío) y desde la población
+    preentrenada por imitación de ``gd_warmstart`` (caliente). Las
+    generaciones se evalúan en ``gd_sim`` (misma lógica que el juego real),
+    con las mismas semillas para los dos arranques.
+
+    Trazas: con ``--traces`` se usan intentos grabados en vivo (gd_trace).
+    Si no, un planificador con búsqueda en el simulador resuelve el nivel y
+    sus intentos se graban con ``TraceRecorder`` (mismo formato .npz), de
+    modo que el preentrenamiento pasa por ``gd_trace.load_dataset`` igual
+    que con trazas reales.
+
+Uso:
+    python bench_warmstart.py [--seeds 3] [--generations 40] [--demos 3]
+    python bench_warmstart.py --traces traces/*.npz
+================================================================================
+"""
+
+import argparse
+import copy
+import random
+import statistics
+import sys
+import tempfile
+import time
+import types
+
+sys.modules.setdefault('keyboard', types.ModuleType('keyboard'))
+
+import neat
+
+from bench_activation import load_config
+from gd_common import CompactState, EventType, distance_fitness
+from gd_sim import SIM_FPS, CubeSimulator, SimBackend, load_level
+from gd_trace import TraceRecorder, load_dataset
+from gd_warmstart import warm_start
+
+TARGETS = (25, 50, 100)   # % del nivel
+
+
+# ============================================================================
+# DEMOSTRACIONES
+# ============================================================================
+def _state_key(sim: CubeSimulator) -> tuple:
+    return sim.frame, round(sim.y, 4), round(sim.vely, 4), sim.on_ground
+
+
+def plan_level(level, fps: int = SIM_FPS, jump_bias: float = 0.0,
+               seed: int = 0) -> list[bool]:
+    """Acciones que completan el nivel (búsqueda en profundidad con estados muertos).
+
+    En el suelo se prueba primero no saltar (con probabilidad ``jump_bias``,
+    saltar); en el aire la acción no cambia nada y solo se prueba no saltar.
+    """
+    rng = random.Random(seed)
+    dead = set()
+
+    def options(sim):
+        if not sim.on_ground:
+            return [False]
+        return [False, True] if rng.random() < jump_bias else [True, False]
+
+    sim = CubeSimulator(level, fps)
+    if sim.step(False) != EventType.STATE:
+        raise ValueError("El nivel mata al cubo en el primer frame")
+
+    path = [(sim, options(sim))]
+    actions: list[bool] = []
+    while path:
+        parent, remaining = path[-1]
+        if not remaining:
+            dead.add(_state_key(parent))
+            path.pop()
+            if actions:
+                actions.pop()
+            continue
+
+        action = remaining.pop()
+        child = copy.copy(parent)
+        child.matrix = list(parent.matrix)
+        event = child.step(action)
+        if event == EventType.WIN:
+            return actions + [action]
+        if event == EventType.DEATH or _state_key(child) in dead:
+            continue
+        actions.append(action)
+        path.append((child, options(child)))
+
+    raise ValueError("El planificador no encontró cómo completar el nivel")
+
+
+def record_demo(level, actions: list[bool], directory: str, index: int,
+                fps: int = SIM_FPS) -> str:
+    """Juega ``actions`` en el simulador y guarda la traza como un intento en vivo."""
+    sim = CubeSimulator(level, fps)
+    state = CompactState()
+    recorder = TraceRecorder(-1, source="sim")
+
+    jump = False
+    for action in [*actions, False]:
+        recorder.begin_batch(sim.frame / fps)
+        event = sim.step(jump)
+        if event != EventType.STATE:
+            recorder.record_event(event, state)
+            break
+        sim.fill(state)
+        recorder.record_event(EventType.STATE, state)
+        jump = action
+        recorder.record_action(jump)
+
+    return recorder.save(directory, index, distance_fitness(sim.x))
+
+
+# ============================================================================
+# EVOLUCIÓN EN EL SIMULADOR
+# ============================================================================
+def generations_to_targets(p: neat.Population, config, backend: SimBackend,
+                           generations: int) -> tuple[dict, list[float]]:
+    """Primera generación (1 = la inicial) en la que el mejor llega a cada objetivo."""
+    length = backend.level.length
+    reached: dict[int, int] = {}
+    curve: list[float] = []
+
+    def evaluate(genomes, config):
+        best = 0.0
+        for _, genome in genomes:
+            result = backend.simulate(genome, config)
+            genome.fitness = result.fitness
+            best = max(best, length if result.outcome == "win" else result.distance)
+        curve.append(100.0 * best / length)
+        for target in TARGETS:
+            if target not in reached and curve[-1] >= target:
+                reached[target] = len(curve)
+
+    for _ in range(generations):
+        p.run(evaluate, 1)
+        if len(reached) == len(TARGETS):
+            break
+    return reached, curve
+
+
+def _fmt(values: list, generations: int) -> str:
+    done = [v for v in values if v is not None]
+    missing = len(values) - len(done)
+    if not done:
+        return f"{'>' + str(generations):>10}"
+    text = f"{statistics.median(done):.0f}" + (f" ({missing}✗)" if missing else "")
+    return f"{text:>10}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arranque en caliente vs frío (gd_sim)")
+    parser.add_argument('--seeds', type=int, default=3)
+    parser.add_argument('--generations', type=int, default=40)
+    parser.add_argument('--demos', type=int, default=3, help="trazas del planificador")
+    parser.add_argument('--traces', nargs='*', default=None, help="trazas grabadas (.npz)")
+    parser.add_argument('--level', default=None, help="nivel ASCII (por defecto DEMO_LEVEL)")
+    parser.add_argument('--steps', type=int, default=30, help="pasos de escalada")
+    args = parser.parse_args()
+
+    sys.stdout.reconfigure(encoding='utf-8')
+    config = load_config()
+    level = load_level(args.level)
+
+    paths = args.traces
+    if not paths:
+        directory = tempfile.mkdtemp(prefix='gd_demos_')
+        start = time.perf_counter()
+        paths = [record_demo(level, plan_level(level, jump_bias=0.1 * i, seed=i), directory, i)
+                 for i in range(args.demos)]
+        print(f"🧭 {len(paths)} demostraciones del planificador en "
+              f"{time.perf_counter() - start:.1f}s → {directory}")
+
+    inputs, actions = load_dataset(paths)
+    print(f"📼 dataset: {len(inputs)} frames, {int(actions.sum())} saltos")
+
+    results = {'frío': {t: [] for t in TARGETS}, 'caliente': {t: [] for t in TARGETS}}
+    initial = {'frío': [], 'caliente': []}
+    pretrain_times = []
+
+    for seed in range(args.seeds):
+        for mode in results:
+            random.seed(seed)
+            if mode == 'frío':
+                p = neat.Population(config)
+            else:
+                start = time.perf_counter()
+                p, scores = warm_start(config, inputs, actions, steps=args.steps, seed=seed)
+                pretrain_times.append(time.perf_counter() - start)
+                print(f"   semilla {seed}: exactitud de imitación media {scores.mean():.0%}, "
+                      f"mejor {scores.max():.0%}")
+
+            reached, curve = generations_to_targets(p, config, SimBackend(args.level),
+                                                    args.generations)
+            initial[mode].append(curve[0])
+            for target in TARGETS:
+                results[mode][target].append(reached.get(target))
+            print(f"   semilla {seed} {mode:<8}: gen 1 {curve[0]:5.1f}%, "
+                  f"máximo {max(curve):5.1f}% en {len(curve)} generaciones")
+
+    print(f"\npreentrenamiento: {statistics.mean(pretrain_times):.1f}s por población")
+    print(f"generaciones hasta el objetivo (mediana de {args.seeds} semillas, ✗ = no llegó "
+          f"en {args.generations}):")
+    print(f"{'arranque':<10}{'gen 1':>8}" + "".join(f"{str(t) + '%':>10}" for t in TARGETS))
+    for mode in results:
+        row = f"{mode:<10}{statistics.median(initial[mode]):>7.1f}%"
+        row += "".join(_fmt(results[mode][t], args.generations) for t in TARGETS)
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
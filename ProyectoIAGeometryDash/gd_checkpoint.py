@@ -0,0 +1,352 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Checkpoints incrementales
+================================================================================
+
+Descripción:
+    Reemplaza el pickle completo por generación (``checkpoint_gen_N.pkl``).
+    Un directorio de checkpoints tiene:
+
+    - ``objects/ab/<sha256>.z``: cada genoma una sola vez, direccionado por
+      el hash de su contenido (sin la fitness) y comprimido con zlib. Un
+      genoma que sobrevive varias generaciones no se vuelve a escribir.
+    - ``gen_NNNNN.manifest``: por generación, solo ids → hash + fitness, las
+      especies (miembros por id, representante por hash), el estado del RNG,
+      el contador de innovaciones y el siguiente id de nodo.
+    - ``state.z``: estado extra de la última generación (caché de fitness).
+
+    Cada archivo se escribe a un temporal y se renombra (``os.replace``), y el
+    manifiesto va después de sus genomas: un corte a mitad de escritura nunca
+    deja un checkpoint que apunte a datos incompletos.
+
+    ``CheckpointStore.save`` solo serializa en el hilo de entrenamiento; el
+    hash, la compresión, la escritura y la poda se hacen en un hilo aparte.
+    Retención: los ``keep`` manifiestos más recientes y uno cada
+    ``keep_every`` generaciones; los genomas que ya no referencia ningún
+    manifiesto se borran.
+
+    Se guarda el estado de la generación siguiente (después de reproducir,
+    como ``neat.Checkpointer``): ``load_population`` la retoma sin volver a
+    evaluar la última. También lee los ``checkpoint_gen_N.pkl`` viejos.
+
+Uso:
+    python gd_checkpoint.py [checkpoints]   # generaciones guardadas y tamaño
+================================================================================
+"""
+
+import copy
+import hashlib
+import os
+import pickle
+import queue
+import random
+import re
+import sys
+import threading
+import zlib
+from itertools import count
+from typing import Optional
+
+import neat
+try:
+    from neat.innovation import InnovationTracker
+except ImportError as e:
+    raise ImportError("gd_checkpoint requiere neat-python >= 1.0 "
+                      "(pip install -r requirements.txt)") from e
+
+MANIFEST_VERSION = 1
+COMPRESS_LEVEL = 6
+
+_MANIFEST_RE = re.compile(r'^gen_(\d+)\.manifest$')
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_compressed(path: str):
+    with open(path, 'rb') as f:
+        return pickle.loads(zlib.decompress(f.read()))
+
+
+def _peek(counter) -> int:
+    """Siguiente valor de un ``itertools.count`` sin consumirlo."""
+    return next(copy.copy(counter))
+
+
+def _genome_bytes(genome) -> bytes:
+    """Contenido del genoma sin la fitness (que cambia al reevaluarlo)."""
+    content = copy.copy(genome)
+    content.fitness = None
+    return pickle.dumps(content, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class CheckpointStore:
+    """Checkpoints por generación con genomas direccionados por contenido."""
+
+    def __init__(self, directory: str = 'checkpoints', keep: int = 5, keep_every: int = 25):
+        self.directory = directory
+        self.keep = keep
+        self.keep_every = keep_every
+        self.objects_dir = os.path.join(directory, 'objects')
+
+        self.written_objects = 0
+        self.written_bytes = 0
+        self.error: Optional[BaseException] = None
+
+        # El hilo escritor se crea con el primer ``save`` (leer no lo necesita)
+        self._jobs: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+    def save(self, generation: int, config: neat.Config, population: dict, species_set,
+             best_genome=None, state: Optional[dict] = None):
+        """Encola el checkpoint de ``generation`` (la próxima a evaluar)."""
+        genome_config = config.genome_config
+        tracker = getattr(genome_config, 'innovation_tracker', None)
+        node_indexer = getattr(genome_config, 'node_indexer', None)
+
+        genomes = {genome_id: _genome_bytes(genome) for genome_id, genome in population.items()}
+        species = []
+        for skey, s in species_set.species.items():
+            representative = s.representative
+            if representative is not None and representative.key not in population:
+                genomes.setdefault(representative.key, _genome_bytes(representative))
+            species.append({
+                'key': skey,
+                'created': s.created,
+                'last_improved': s.last_improved,
+                'representative': None if representative is None else representative.key,
+                'members': list(s.members),
+                'fitness': s.fitness,
+                'adjusted_fitness': s.adjusted_fitness,
+                'fitness_history': list(s.fitness_history),
+            })
+
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'generation': generation,
+            'population': {genome_id: genome.fitness for genome_id, genome in population.items()},
+            'species': species,
+            'species_indexer': _peek(species_set.indexer),
+            'innovation': None if tracker is None else tracker.global_counter,
+            'node_indexer': None if node_indexer is None else _peek(node_indexer),
+            'rndstate': random.getstate(),
+            'best': None,
+        }
+        if best_genome is not None:
+            genomes['best'] = _genome_bytes(best_genome)
+            manifest['best'] = best_genome.fitness
+
+        if self._thread is None:
+            os.makedirs(self.objects_dir, exist_ok=True)
+            self._thread = threading.Thread(target=self._writer, daemon=True)
+            self._thread.start()
+        self._jobs.put((generation, manifest, genomes, state))
+
+    def flush(self):
+        """Espera a que se escriban los checkpoints encolados."""
+        self._jobs.join()
+
+    def close(self):
+        if self._thread is None:
+            return
+        self.flush()
+        self._jobs.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _writer(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is None:
+                    return
+                self._write(*job)
+                self._prune()
+            except Exception as e:  # el entrenamiento sigue aunque falle el disco
+                self.error = e
+                sys.stderr.write(f"⚠ checkpoint: {e}\n")
+            finally:
+                self._jobs.task_done()
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest + '.z')
+
+    def _write(self, generation: int, manifest: dict, genomes: dict, state: Optional[dict]):
+        hashes = {}
+        for genome_id, data in genomes.items():
+            digest = hashlib.sha256(data).hexdigest()
+            hashes[genome_id] = digest
+            path = self._object_path(digest)
+            if os.path.exists(path):
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            packed = zlib.compress(data, COMPRESS_LEVEL)
+            _write_atomic(path, packed)
+            self.written_objects += 1
+            self.written_bytes += len(packed)
+
+        manifest['genomes'] = hashes
+        packed = zlib.compress(pickle.dumps(manifest, protocol=pickle.HIGHEST_PROTOCOL),
+                               COMPRESS_LEVEL)
+        _write_atomic(self.manifest_path(generation), packed)
+        self.written_bytes += len(packed)
+
+        if state is not None:
+            _write_atomic(os.path.join(self.directory, 'state.z'),
+                          zlib.compress(pickle.dumps(state), COMPRESS_LEVEL))
+
+    def _prune(self):
+        generations = self.generations()
+        retained = set(generations[-self.keep:]) if self.keep > 0 else set(generations)
+        if self.keep_every > 0:
+            retained.update(g for g in generations if g % self.keep_every == 0)
+
+        removed = [g for g in generations if g not in retained]
+        if not removed:
+            return
+        for generation in removed:
+            os.remove(self.manifest_path(generation))
+
+        # Barrido: genomas que ya no referencia ningún manifiesto
+        referenced = set()
+        for generation in retained:
+            referenced.update(self.load_manifest(generation)['genomes'].values())
+        for root, _, files in os.walk(self.objects_dir):
+            for name in files:
+                if name.endswith('.z') and name[:-2] not in referenced:
+                    os.remove(os.path.join(root, name))
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+    def manifest_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f'gen_{generation:05d}.manifest')
+
+    def generations(self) -> list[int]:
+        found = []
+        for name in os.listdir(self.directory):
+            match = _MANIFEST_RE.match(name)
+            if match:
+                found.append(int(match.group(1)))
+        return sorted(found)
+
+    def load_manifest(self, generation: int) -> dict:
+        manifest = _read_compressed(self.manifest_path(generation))
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"Versión de manifiesto no soportada: {manifest.get('version')}")
+        return manifest
+
+    def load_genome(self, digest: str):
+        return _read_compressed(self._object_path(digest))
+
+    def load_state(self) -> dict:
+        path = os.path.join(self.directory, 'state.z')
+        return _read_compressed(path) if os.path.exists(path) else {}
+
+    def restore(self, config: neat.Config, generation: Optional[int] = None) -> Optional[neat.Population]:
+        """Población de ``generation`` (None = la última guardada), o None si no hay."""
+        generations = self.generations() if os.path.isdir(self.directory) else []
+        if not generations:
+            return None
+        if generation is None:
+            generation = generations[-1]
+
+        manifest = self.load_manifest(generation)
+        loaded = {genome_id: self.load_genome(digest)
+                  for genome_id, digest in manifest['genomes'].items()}
+
+        population = {}
+        for genome_id, fitness in manifest['population'].items():
+            genome = loaded[genome_id]
+            genome.fitness = fitness
+            population[genome_id] = genome
+
+        p = neat.Population(config, (population, _restore_species(config, manifest, loaded),
+                                     manifest['generation']))
+        if manifest['innovation'] is not None:
+            p.reproduction.innovation_tracker = InnovationTracker(manifest['innovation'])
+        if manifest['node_indexer'] is not None:
+            config.genome_config.node_indexer = count(manifest['node_indexer'])
+        if manifest['best'] is not None:
+            p.best_genome = loaded['best']
+            p.best_genome.fitness = manifest['best']
+        random.setstate(manifest['rndstate'])
+        return p
+
+
+def _restore_species(config: neat.Config, manifest: dict, loaded: dict):
+    species_set = config.species_set_type(config.species_set_config, neat.reporting.ReporterSet())
+    species_set.indexer = count(manifest['species_indexer'])
+
+    for entry in manifest['species']:
+        s = neat.species.Species(entry['key'], entry['created'])
+        s.last_improved = entry['last_improved']
+        s.fitness = entry['fitness']
+        s.adjusted_fitness = entry['adjusted_fitness']
+        s.fitness_history = entry['fitness_history']
+        s.members = {genome_id: loaded[genome_id] for genome_id in entry['members']}
+        if entry['representative'] is not None:
+            s.representative = loaded[entry['representative']]
+        species_set.species[s.key] = s
+        for genome_id in s.members:
+            species_set.genome_to_species[genome_id] = s.key
+
+    return species_set
+
+
+def load_population(config: neat.Config, source: str,
+                    generation: Optional[int] = None) -> tuple[Optional[neat.Population], dict]:
+    """Retoma el entrenamiento desde ``source`` y devuelve (población, estado extra).
+
+    ``source`` es un directorio de ``CheckpointStore`` (``generation`` o la
+    última) o un ``checkpoint_gen_N.pkl`` del formato anterior. Devuelve
+    (None, {}) si no hay nada que retomar.
+    """
+    if os.path.isfile(source):
+        with open(source, 'rb') as f:
+            data = pickle.load(f)
+        p = neat.Population(config)
+        p.population = data['population']
+        p.species = data['species_set']
+        random.setstate(data['rndstate'])
+        p.generation = data['generation']
+        return p, {key: data[key] for key in ('fitness_cache',) if key in data}
+
+    if not os.path.isdir(source):
+        return None, {}
+
+    store = CheckpointStore(source)
+    p = store.restore(config, generation)
+    return p, (store.load_state() if p is not None else {})
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else 'checkpoints'
+    sys.stdout.reconfigure(encoding='utf-8')
+
+    reader = CheckpointStore(directory)
+
+    total = 0
+    objects = 0
+    for root, _, files in os.walk(reader.objects_dir):
+        for name in files:
+            objects += 1
+            total += os.path.getsize(os.path.join(root, name))
+    manifests = reader.generations()
+    total += sum(os.path.getsize(reader.manifest_path(g)) for g in manifests)
+
+    print(f"📁 {directory}: {len(manifests)} generaciones, {objects} genomas, {total / 1024:.0f} KiB")
+    for generation in manifests:
+        manifest = reader.load_manifest(generation)
+        best = "-" if manifest['best'] is None else f"{manifest['best']:.0f}"
+        print(f"   gen {generation:5d}: {len(manifest['population'])} genomas, "
+              f"{len(manifest['species'])} especies, mejor fitness {best}")
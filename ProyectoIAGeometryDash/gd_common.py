@@ -0,0 +1,94 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Definiciones compartidas
+================================================================================
+
+Descripción:
+    Lo que necesitan a la vez el entrenamiento con el juego real
+    (gd_neat_ai) y el simulador (gd_sim): eventos del protocolo, el estado
+    compacto que se pasa a la red, la fitness y la interfaz de los backends
+    de evaluación.
+
+    No importa gd_neat_ai (ni neat, ni keyboard): así gd_sim y los workers de
+    la simulación no arrastran el cliente real, y ``python gd_neat_ai.py``
+    no carga una segunda copia de sí mismo como módulo al importar gd_sim.
+================================================================================
+"""
+
+from array import array
+from enum import Enum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import neat
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+NUM_INPUTS = 19
+MATRIX_SIZE = 15
+
+# Frames sin avanzar tras los que el intento se da por terminado
+STUCK_THRESHOLD = 150
+
+# Distancia extra que suma completar el nivel (solo a la fitness)
+WIN_BONUS = 50000
+
+# ============================================================================
+# ESTRUCTURAS DE DATOS
+# ============================================================================
+class EventType(Enum):
+    NONE = 0
+    STATE = 1
+    DEATH = 2
+    WIN = 3
+    SESSION_START = 4
+
+class CompactState:
+    """Estado reutilizable del camino rápido: se sobrescribe en cada frame.
+
+    ``inputs`` ya contiene los 19 inputs normalizados igual que
+    ``LevelSession._build_inputs`` y se pasa tal cual a ``net.activate``.
+    ``session`` es el id del último SESSION_START recibido; ``frame`` y
+    ``emit_us`` son el contador y el instante de emisión (µs desde epoch) que
+    pone el mod en cada STATE, 0 si no vienen.
+    """
+
+    __slots__ = ('x', 'y', 'vely', 'ground', 'inputs', 'session', 'frame', 'emit_us')
+
+    def __init__(self):
+        self.session = 0
+        self.frame = 0
+        self.emit_us = 0
+        self.x = 0.0
+        self.y = 0.0
+        self.vely = 0.0
+        self.ground = False
+        self.inputs = array('d', [0.0] * NUM_INPUTS)
+        self.inputs[3] = 1.0  # bias constante
+
+# ============================================================================
+# FITNESS Y BACKENDS
+# ============================================================================
+def distance_fitness(distance: float, won: bool = False) -> float:
+    """Fitness cuadrática en la distancia recorrida (premia avanzar más)."""
+    if won:
+        distance += WIN_BONUS
+    return (distance * distance) / 100.0
+
+class EvaluationBackend:
+    """Fuente de fitness de un genoma. Las subclases implementan ``evaluate``.
+
+    Un backend se construye una vez y se reutiliza (en paralelo, una vez por
+    proceso), así que puede guardar estado caliente: nivel cargado, redes
+    compiladas, etc.
+    """
+
+    name = "base"
+
+    def evaluate(self, genome_id: int, genome: "neat.DefaultGenome",
+                 config: "neat.Config") -> float:
+        raise NotImplementedError
+
+    def close(self):
+        pass
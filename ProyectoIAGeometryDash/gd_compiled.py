@@ -0,0 +1,474 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Redes NEAT compiladas a NumPy
+================================================================================
+
+Descripción:
+    Convierte genomas ``neat.DefaultGenome`` en programas de matrices por capas
+    para evaluarlos en lote con NumPy, en lugar de recorrer ``node_evals`` en
+    Python como hace ``neat.nn.FeedForwardNetwork.activate``.
+
+    - CompiledNetwork: un genoma → una matriz de pesos por capa.
+      ``activate`` es reemplazo directo de ``net.activate``;
+      ``activate_batch`` evalúa (B, 19) inputs de una vez.
+    - PopulationNetwork: apila toda la población (pop_size=50) en tensores
+      con relleno, de modo que una sola llamada activa todos los genomas
+      sobre un lote de inputs → (G, B, salidas). Base para evaluar offline
+      contra trazas grabadas.
+    - GeneratedNetwork: función Python en línea recta para el genoma ganador
+      (modo "play"), con caché en disco por hash de la red.
+
+Compatibilidad:
+    Se compila a partir de ``FeedForwardNetwork.create`` (mismos nodos,
+    conexiones y orden), así que las salidas coinciden con ``activate`` hasta
+    la tolerancia de punto flotante. Solo se admite agregación ``sum`` (la
+    única de config.txt).
+================================================================================
+"""
+
+import hashlib
+import os
+from typing import Optional, Sequence
+
+import neat
+import numpy as np
+
+# ============================================================================
+# ACTIVACIONES (mismas fórmulas que neat.activations)
+# ============================================================================
+def _sigmoid(z):
+    z = np.clip(5.0 * z, -60.0, 60.0)
+    return 1.0 / (1.0 + np.exp(-z))
+
+def _tanh(z):
+    return np.tanh(np.clip(2.5 * z, -60.0, 60.0))
+
+def _relu(z):
+    return np.maximum(z, 0.0)
+
+def _identity(z):
+    return z
+
+def _clamped(z):
+    return np.clip(z, -1.0, 1.0)
+
+def _abs(z):
+    return np.abs(z)
+
+def _sin(z):
+    return np.sin(np.clip(5.0 * z, -60.0, 60.0))
+
+def _gauss(z):
+    z = np.clip(z, -3.4, 3.4)
+    return np.exp(-5.0 * z * z)
+
+# El índice es el código que usa PopulationNetwork; identity (0) para relleno
+ACTIVATIONS = [
+    ('identity', _identity),
+    ('sigmoid', _sigmoid),
+    ('tanh', _tanh),
+    ('relu', _relu),
+    ('clamped', _clamped),
+    ('abs', _abs),
+    ('sin', _sin),
+    ('gauss', _gauss),
+]
+ACTIVATION_CODES = {name: code for code, (name, _) in enumerate(ACTIVATIONS)}
+
+
+class CompiledLayer:
+    """Nodos de una capa: ocupan los slots [start, end) del vector de valores."""
+
+    __slots__ = ('start', 'end', 'weights', 'bias', 'response', 'codes')
+
+    def __init__(self, start, end, weights, bias, response, codes):
+        self.start = start
+        self.end = end
+        self.weights = weights      # (ancho, start): solo lee slots anteriores
+        self.bias = bias
+        self.response = response
+        self.codes = codes          # código de activación por nodo
+
+
+def _apply_activations(z, codes):
+    """Aplica a cada fila de ``z`` (filas, B) la activación de su código en ``codes`` (filas,)."""
+    present = np.unique(codes)
+    if len(present) == 1:
+        return ACTIVATIONS[present[0]][1](z)
+
+    # Solo se calcula cada función sobre sus propias filas
+    out = np.empty_like(z)
+    for code in present:
+        rows = np.flatnonzero(codes == code)
+        out[rows] = ACTIVATIONS[code][1](z[rows])
+    return out
+
+
+class CompiledNetwork:
+    """Un genoma como programa por capas: V[start:end] = act(b + r * W @ V[:start])."""
+
+    def __init__(self, num_inputs: int, num_slots: int, zero_slots: int,
+                 layers: list[CompiledLayer], output_slots: np.ndarray):
+        self.num_inputs = num_inputs
+        self.num_slots = num_slots
+        self.zero_slots = zero_slots
+        self.layers = layers
+        self.output_slots = output_slots
+
+    @staticmethod
+    def create(genome: neat.DefaultGenome, config: neat.Config) -> 'CompiledNetwork':
+        net = neat.nn.FeedForwardNetwork.create(genome, config)
+        return CompiledNetwork.from_network(net, genome)
+
+    @staticmethod
+    def from_network(net: neat.nn.FeedForwardNetwork,
+                     genome: neat.DefaultGenome) -> 'CompiledNetwork':
+        input_keys = list(net.input_nodes)
+        evaluated = {node for node, *_ in net.node_evals}
+
+        # Profundidad de cada nodo: 1 + la máxima de sus fuentes (inputs = 0)
+        depth = {key: 0 for key in input_keys}
+        by_depth: dict[int, list] = {}
+        for node_eval in net.node_evals:
+            node, _, _, _, _, links = node_eval
+            if genome.nodes[node].aggregation != 'sum':
+                raise ValueError(f"Agregación no soportada en el nodo {node}")
+            d = 1 + max((depth.get(i, 0) for i, _ in links), default=0)
+            depth[node] = d
+            by_depth.setdefault(d, []).append(node_eval)
+
+        # Salidas que nunca se evalúan valen 0.0 (igual que en FeedForwardNetwork)
+        slot = {key: i for i, key in enumerate(input_keys)}
+        zero_keys = [key for key in net.output_nodes if key not in evaluated]
+        for key in zero_keys:
+            slot[key] = len(slot)
+
+        layers = []
+        for d in sorted(by_depth):
+            node_evals = by_depth[d]
+            start = len(slot)
+            for node, *_ in node_evals:
+                slot[node] = len(slot)
+
+            weights = np.zeros((len(node_evals), start))
+            bias = np.empty(len(node_evals))
+            response = np.empty(len(node_evals))
+            codes = np.empty(len(node_evals), dtype=np.int64)
+
+            for row, (node, _, _, node_bias, node_response, links) in enumerate(node_evals):
+                for i, w in links:
+                    weights[row, slot[i]] += w
+                bias[row] = node_bias
+                response[row] = node_response
+
+                activation = genome.nodes[node].activation
+                if activation not in ACTIVATION_CODES:
+                    raise ValueError(f"Activación no soportada: {activation}")
+                codes[row] = ACTIVATION_CODES[activation]
+
+            layers.append(CompiledLayer(start, len(slot), weights, bias, response, codes))
+
+        output_slots = np.array([slot[key] for key in net.output_nodes], dtype=np.int64)
+        return CompiledNetwork(len(input_keys), len(slot), len(zero_keys), layers, output_slots)
+
+    def activate(self, inputs: Sequence[float]) -> list[float]:
+        """Reemplazo directo de ``FeedForwardNetwork.activate``."""
+        return self.activate_batch(np.asarray(inputs, dtype=np.float64)[None, :])[0].tolist()
+
+    def activate_batch(self, inputs: np.ndarray) -> np.ndarray:
+        """(B, num_inputs) → (B, num_outputs)."""
+        inputs = np.asarray(inputs, dtype=np.float64)
+        if inputs.shape[-1] != self.num_inputs:
+            raise RuntimeError(f"Expected {self.num_inputs} inputs, got {inputs.shape[-1]}")
+
+        # Disposición (slots, B): cada capa es W @ V[:start] sobre filas contiguas
+        values = np.zeros((self.num_slots, inputs.shape[0]))
+        values[:self.num_inputs] = inputs.T
+
+        for layer in self.layers:
+            z = layer.weights @ values[:layer.start]
+            values[layer.start:layer.end] = _apply_activations(
+                layer.bias[:, None] + layer.response[:, None] * z, layer.codes)
+
+        return values[self.output_slots].T
+
+
+class PopulationNetwork:
+    """Toda una población en tensores con relleno para activarla en una llamada.
+
+    Disposición común de slots: [inputs | salidas en cero | capa 1 | capa 2 ...],
+    donde cada capa tiene el ancho máximo de esa profundidad entre los genomas.
+    Los slots de relleno tienen pesos, bias y respuesta en 0 y activación
+    identity, así que valen 0 y nadie los lee.
+    """
+
+    def __init__(self, genome_ids: list, networks: list[CompiledNetwork]):
+        if not networks:
+            raise ValueError("PopulationNetwork necesita al menos un genoma")
+
+        self.genome_ids = genome_ids
+        self.num_inputs = networks[0].num_inputs
+        num_outputs = len(networks[0].output_slots)
+        num_genomes = len(networks)
+        num_depths = max(len(n.layers) for n in networks)
+
+        zero_width = max(n.zero_slots for n in networks)
+        widths = [
+            max((n.layers[d].end - n.layers[d].start for n in networks if d < len(n.layers)), default=0)
+            for d in range(num_depths)
+        ]
+
+        offsets = []
+        cursor = self.num_inputs + zero_width
+        for width in widths:
+            offsets.append(cursor)
+            cursor += width
+        self.num_slots = cursor
+
+        self.weights = [np.zeros((num_genomes, w, off)) for w, off in zip(widths, offsets)]
+        self.bias = [np.zeros((num_genomes, w)) for w in widths]
+        self.response = [np.zeros((num_genomes, w)) for w in widths]
+        self.codes = [np.zeros((num_genomes, w), dtype=np.int64) for w in widths]
+        self.offsets = offsets
+        self.widths = widths
+        self.output_slots = np.zeros((num_genomes, num_outputs), dtype=np.int64)
+
+        for g, net in enumerate(networks):
+            # Slot propio → slot común
+            remap = np.zeros(net.num_slots, dtype=np.int64)
+            remap[:self.num_inputs] = np.arange(self.num_inputs)
+            remap[self.num_inputs:self.num_inputs + net.zero_slots] = (
+                self.num_inputs + np.arange(net.zero_slots))
+
+            for d, layer in enumerate(net.layers):
+                width = layer.end - layer.start
+                remap[layer.start:layer.end] = offsets[d] + np.arange(width)
+
+                self.weights[d][g, :width, remap[:layer.start]] = layer.weights.T
+                self.bias[d][g, :width] = layer.bias
+                self.response[d][g, :width] = layer.response
+                self.codes[d][g, :width] = layer.codes
+
+            self.output_slots[g] = remap[net.output_slots]
+
+    @staticmethod
+    def create(genomes, config: neat.Config) -> 'PopulationNetwork':
+        """``genomes`` como lo recibe eval_genomes: [(genome_id, genome), ...]."""
+        genomes = list(genomes)
+        networks = [CompiledNetwork.create(genome, config) for _, genome in genomes]
+        return PopulationNetwork([gid for gid, _ in genomes], networks)
+
+    def activate_batch(self, inputs: np.ndarray) -> np.ndarray:
+        """(B, num_inputs) → (G, B, num_outputs): todos los genomas, todo el lote."""
+        inputs = np.asarray(inputs, dtype=np.float64)
+        num_genomes = len(self.genome_ids)
+
+        # Disposición (G, slots, B): cada capa es un matmul por genoma contiguo
+        values = np.zeros((num_genomes, self.num_slots, inputs.shape[0]))
+        values[:, :self.num_inputs, :] = inputs.T
+
+        for d, start in enumerate(self.offsets):
+            end = start + self.widths[d]
+            z = np.matmul(self.weights[d], values[:, :start, :])
+            z = self.bias[d][:, :, None] + self.response[d][:, :, None] * z
+            values[:, start:end, :] = _apply_activations(
+                z.reshape(-1, z.shape[-1]), self.codes[d].ravel()).reshape(z.shape)
+
+        rows = np.arange(num_genomes)[:, None]
+        return values[rows, self.output_slots, :].transpose(0, 2, 1)
+
+
+def max_abs_error(genome: neat.DefaultGenome, config: neat.Config,
+                  inputs: np.ndarray, compiled: Optional[CompiledNetwork] = None) -> float:
+    """Diferencia máxima entre la red compilada y ``FeedForwardNetwork.activate``."""
+    net = neat.nn.FeedForwardNetwork.create(genome, config)
+    compiled = compiled or CompiledNetwork.from_network(net, genome)
+
+    expected = np.array([net.activate(list(row)) for row in inputs])
+    return float(np.max(np.abs(compiled.activate_batch(inputs) - expected)))
+
+
+# ============================================================================
+# CÓDIGO GENERADO PARA JUEGO EN VIVO
+# ============================================================================
+# Para un solo vector por frame, NumPy pierde contra Python puro por el costo
+# de cada llamada. Aquí se genera una función sin bucles, con los pesos como
+# literales, que reproduce exactamente FeedForwardNetwork.activate.
+GENERATOR_VERSION = 1
+
+# Plantillas equivalentes a neat.activations ({z} es una variable local)
+_PY_ACTIVATIONS = {
+    'identity': "{z}",
+    'sigmoid': "1.0 / (1.0 + math.exp(-max(-60.0, min(60.0, 5.0 * {z}))))",
+    'tanh': "math.tanh(max(-60.0, min(60.0, 2.5 * {z})))",
+    'relu': "({z} if {z} > 0.0 else 0.0)",
+    'clamped': "max(-1.0, min(1.0, {z}))",
+    'abs': "abs({z})",
+    'sin': "math.sin(max(-60.0, min(60.0, 5.0 * {z})))",
+    'gauss': "math.exp(-5.0 * max(-3.4, min(3.4, {z})) ** 2)",
+}
+
+
+class GeneratedNetwork:
+    """Red como función Python generada; ``activate`` es la función misma."""
+
+    __slots__ = ('activate', 'key', 'source')
+
+    def __init__(self, activate, key: str, source: str):
+        self.activate = activate
+        self.key = key
+        self.source = source
+
+
+def _quantize(value: float, quantum: float) -> int:
+    return round(value / quantum) or 0
+
+
+def _canonical_network(net: neat.nn.FeedForwardNetwork, genome: neat.DefaultGenome,
+                       quantum: Optional[float] = None) -> str:
+    """Descripción textual de la red expresada (solo nodos y enlaces que se evalúan).
+
+    Los ids de nodos ocultos dependen del linaje (cada ``add_node`` estrena
+    uno), así que no entran en la clave: los ocultos se renombran por capa
+    (camino más largo desde las entradas) y, dentro de la capa, por su firma
+    (activación, parámetros y enlaces entrantes ya renombrados). Entradas y
+    salidas conservan su id. Con ``quantum`` los parámetros se redondean a
+    múltiplos de ``quantum``; sin él la clave es exacta (la misma que usa el
+    caché en disco).
+    """
+    outputs = set(net.output_nodes)
+    labels = {key: _name(key) for key in net.input_nodes}
+    labels.update((key, f"o{key}") for key in outputs)
+
+    layers: dict[int, list] = {}
+    depth = dict.fromkeys(net.input_nodes, 0)
+    for node, _, _, bias, response, links in net.node_evals:
+        depth[node] = 1 + max((depth.get(i, 0) for i, _ in links), default=0)
+        layers.setdefault(depth[node], []).append((node, bias, response, links))
+
+    parts = []
+    for layer in sorted(layers):
+        signatures = []
+        for node, bias, response, links in layers[layer]:
+            ng = genome.nodes[node]
+            if quantum:
+                bias, response = _quantize(bias, quantum), _quantize(response, quantum)
+                links = [(i, _quantize(w, quantum)) for i, w in links]
+            # Las fuentes están en capas anteriores: ya tienen nombre canónico
+            sources = sorted((labels.get(i, f"?{i}"), w) for i, w in links)
+            signatures.append((f"{ng.activation}:{ng.aggregation}:{bias!r}:{response!r}:{sources!r}",
+                               node))
+        hidden = sorted(entry for entry in signatures if entry[1] not in outputs)
+        for position, (_, node) in enumerate(hidden):
+            labels[node] = f"h{layer}.{position}"
+        parts.extend(f"{labels[node]}:{signature}" for signature, node in signatures)
+
+    parts.sort()
+    return "\n".join([f"v{GENERATOR_VERSION}", f"in{list(net.input_nodes)}",
+                       f"out{list(net.output_nodes)}"] + parts)
+
+
+def genome_hash(genome: neat.DefaultGenome, config: neat.Config,
+                quantum: Optional[float] = None) -> str:
+    """Hash de la red expresada: genes desactivados, nodos podados o ids de nodos
+    ocultos distintos no cambian la clave."""
+    net = neat.nn.FeedForwardNetwork.create(genome, config)
+    return hashlib.sha256(_canonical_network(net, genome, quantum).encode('utf-8')).hexdigest()
+
+
+def _name(key: int) -> str:
+    return f"i{-key}" if key < 0 else f"n{key}"
+
+
+def generate_source(genome: neat.DefaultGenome, config: neat.Config) -> str:
+    """Código de ``activate(inputs)`` en línea recta con constantes plegadas."""
+    net = neat.nn.FeedForwardNetwork.create(genome, config)
+    input_names = [_name(key) for key in net.input_nodes]
+
+    constants: dict[int, float] = {}
+    body = []
+    used_inputs = set()
+
+    for node, act_func, agg_func, bias, response, links in net.node_evals:
+        ng = genome.nodes[node]
+        if ng.aggregation != 'sum':
+            raise ValueError(f"Agregación no soportada en el nodo {node}")
+        if ng.activation not in _PY_ACTIVATIONS:
+            raise ValueError(f"Activación no soportada: {ng.activation}")
+
+        # Si todas las fuentes son constantes, se evalúa aquí con neat mismo
+        if all(i in constants for i, _ in links):
+            constants[node] = act_func(bias + response * agg_func([constants[i] * w for i, w in links]))
+            continue
+
+        terms = []
+        for i, w in links:
+            if i in constants:
+                terms.append(f"{constants[i] * w!r}")
+            else:
+                terms.append(f"{_name(i)} * {w!r}")
+                if i < 0:
+                    used_inputs.add(i)
+
+        # Mismo orden de redondeo que neat: bias + response * (t1 + t2 + ...)
+        total = " + ".join(terms)
+        if len(terms) > 1:
+            total = f"({total})"
+        z = total if response == 1.0 else f"{response!r} * {total}"
+        body.append(f"    z = {bias!r} + {z}")
+        body.append(f"    {_name(node)} = " + _PY_ACTIVATIONS[ng.activation].format(z='z'))
+
+    evaluated = {node for node, *_ in net.node_evals}
+    outputs = []
+    for key in net.output_nodes:
+        if key in constants:
+            outputs.append(repr(constants[key]))
+        elif key in evaluated:
+            outputs.append(_name(key))
+        else:
+            outputs.append("0.0")
+
+    lines = [
+        f"# Generado por gd_compiled v{GENERATOR_VERSION} para el genoma {genome.key}. No editar.",
+        "import math",
+        "",
+        "",
+        "def activate(inputs):",
+    ]
+    if used_inputs:
+        lines.append(f"    {', '.join(input_names)}, = inputs")
+    lines.extend(body)
+    lines.append(f"    return [{', '.join(outputs)}]")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def compile_generated(genome: neat.DefaultGenome, config: neat.Config,
+                      source: Optional[str] = None, key: Optional[str] = None) -> GeneratedNetwork:
+    """Genera (o usa ``source``) y compila la función en memoria, sin tocar disco."""
+    key = key or genome_hash(genome, config)
+    source = source or generate_source(genome, config)
+
+    namespace: dict = {}
+    exec(compile(source, f"<net_{key[:20]}>", 'exec'), namespace)
+    return GeneratedNetwork(namespace['activate'], key, source)
+
+
+def load_generated(genome: neat.DefaultGenome, config: neat.Config,
+                   cache_dir: str = 'compiled_nets') -> GeneratedNetwork:
+    """Carga la función del caché en disco (por hash del genoma) o la genera."""
+    key = genome_hash(genome, config)
+    path = os.path.join(cache_dir, f"net_{key[:20]}.py")
+
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+    else:
+        source = generate_source(genome, config)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(source)
+        os.replace(tmp_path, path)
+
+    return compile_generated(genome, config, source, key)
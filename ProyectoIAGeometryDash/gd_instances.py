@@ -0,0 +1,302 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Entrenamiento con varias instancias del juego
+================================================================================
+
+Descripción:
+    ``InstanceScheduler`` reparte los genomas de una generación entre N
+    clientes del juego que corren a la vez (``INSTANCES`` en gd_neat_ai): un
+    hilo por instancia toma el siguiente genoma de una cola común en cuanto su
+    cliente queda libre y juega el intento con el ``run_attempt`` que recibe
+    (el de gd_neat_ai: sus métricas, racing y latencias son las del script
+    que entrena; este módulo no importa gd_neat_ai). Como cada
+    intento es casi todo espera en tiempo real, el tiempo por generación baja
+    casi linealmente con el número de instancias.
+
+    Si un intento vence (el nivel no se reinicia o el juego deja de enviar
+    frames, ``AttemptTimeout``) el genoma vuelve a la cola para otra instancia,
+    hasta ``max_requeues`` veces. Una instancia que falla ``max_failures``
+    veces seguidas se deja de usar en la generación.
+
+    ``FakeGameInstance`` es un cliente local de reemplazo: un hilo con
+    ``gd_sim.CubeSimulator`` escribe el log en el formato del mod (handshake
+    SESSION_START|id, STATE con frame/t_us, DEATH/WIN) a ``fps`` frames por
+    segundo y recibe las teclas de su propio controlador. ``drop_restarts``
+    simula reinicios perdidos para ejercitar los reintentos.
+
+Uso:
+    python gd_instances.py [--instances 4] [--genomes 24]   # escalado con clientes falsos
+================================================================================
+"""
+
+import io
+import os
+import queue
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Optional
+
+import neat
+
+from gd_common import EventType
+from gd_live import AttemptTimeout, Controller, GameInstance
+
+
+class _ThreadOutput(io.TextIOBase):
+    """stdout compartido: lo que escribe cada hilo worker se junta en su
+    propio buffer y se imprime como una sola línea al terminar el intento."""
+
+    def __init__(self, target):
+        self.target = target
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def begin(self, prefix: str):
+        self._local.buffer = [prefix]
+
+    def end(self, suffix: str = ""):
+        buffer = self._local.buffer
+        self._local.buffer = None
+        with self._lock:
+            self.target.write("".join(buffer) + suffix + "\n")
+            self.target.flush()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            with self._lock:
+                return self.target.write(text)
+        buffer.append(text)
+        return len(text)
+
+    def flush(self):
+        if getattr(self._local, 'buffer', None) is None:
+            self.target.flush()
+
+
+class InstanceScheduler:
+    """Evalúa genomas en varias instancias del juego a la vez.
+
+    Mismo contrato que ``gd_parallel.SerialEvaluator``: ``evaluate`` devuelve
+    las fitness en el orden de ``genomes``. ``run_attempt(net, genome_id,
+    instance)`` juega un intento y devuelve su fitness.
+    """
+
+    def __init__(self, instances: list[GameInstance], run_attempt, max_requeues: int = 2,
+                 max_failures: int = 3):
+        if sum(1 for instance in instances if not instance.window
+               and type(instance).create_controller is GameInstance.create_controller) > 1:
+            raise ValueError("Solo una instancia puede usar el teclado global: "
+                             "indica 'window' en las demás")
+
+        self.instances = instances
+        self.run_attempt = run_attempt
+        self.max_requeues = max_requeues
+        self.max_failures = max_failures
+        self.requeued = 0
+        self.failures = {instance.name: 0 for instance in instances}
+        self._output: Optional[_ThreadOutput] = None
+
+    def evaluate(self, genomes, config) -> list[float]:
+        genomes = list(genomes)
+        results: list[Optional[float]] = [None] * len(genomes)
+        jobs: queue.Queue = queue.Queue()
+        for index, (genome_id, genome) in enumerate(genomes):
+            jobs.put((index, genome_id, genome, 0))
+
+        # Una generación nueva: todas las instancias vuelven a tener oportunidad
+        self.failures = {instance.name: 0 for instance in self.instances}
+        self.requeued = 0
+
+        output = self._install_output()
+        try:
+            while not jobs.empty():
+                active = [instance for instance in self.instances
+                          if self.failures[instance.name] < self.max_failures]
+                if not active:
+                    break
+
+                workers = [threading.Thread(target=self._worker,
+                                            args=(instance, jobs, results, config, output),
+                                            daemon=True)
+                           for instance in active]
+                for worker in workers:
+                    worker.start()
+                for worker in workers:
+                    worker.join()
+        finally:
+            self._restore_output()
+
+        # Sin instancias sanas: lo que quedó en la cola no se pudo jugar
+        return [0.0 if fitness is None else fitness for fitness in results]
+
+    def _worker(self, instance: GameInstance, jobs: queue.Queue, results: list,
+                config, output: _ThreadOutput):
+        while self.failures[instance.name] < self.max_failures:
+            try:
+                index, genome_id, genome, tries = jobs.get_nowait()
+            except queue.Empty:
+                return
+
+            output.begin(f"[{instance.name}] G{genome_id:2d}:")
+            net = neat.nn.FeedForwardNetwork.create(genome, config)
+            try:
+                results[index] = self.run_attempt(net, genome_id, instance)
+                self.failures[instance.name] = 0
+                output.end()
+            except AttemptTimeout as e:
+                self.failures[instance.name] += 1
+                if tries < self.max_requeues:
+                    self.requeued += 1
+                    jobs.put((index, genome_id, genome, tries + 1))
+                    output.end(f"⏳ {e} → a la cola")
+                else:
+                    results[index] = 0.0
+                    output.end(f"❌ {e}")
+
+    def _install_output(self) -> _ThreadOutput:
+        """Redirige sys.stdout a un _ThreadOutput mientras juegan los hilos."""
+        if self._output is None:
+            self._output = _ThreadOutput(sys.stdout)
+            sys.stdout = self._output
+        return self._output
+
+    def _restore_output(self):
+        """Devuelve sys.stdout al original (si nadie lo cambió después)."""
+        if self._output is not None:
+            if sys.stdout is self._output:
+                sys.stdout = self._output.target
+            self._output = None
+
+    def close(self):
+        self._restore_output()
+
+
+# ============================================================================
+# CLIENTE FALSO
+# ============================================================================
+class _FakeController(Controller):
+    def __init__(self, game: 'FakeGameInstance'):
+        super().__init__()
+        self.game = game
+
+    def _send(self, pressed: bool):
+        self.game.jump = pressed
+
+    def _restart(self):
+        self.game.request_restart()
+
+
+class FakeGameInstance(GameInstance):
+    """Cliente local que juega ``gd_sim`` en tiempo real y escribe un log como el mod."""
+
+    def __init__(self, name: str, level_path: Optional[str] = None, fps: int = 60,
+                 drop_restarts: float = 0.0, seed: int = 0):
+        from gd_sim import CubeSimulator, load_level
+
+        directory = tempfile.mkdtemp(prefix=f'gd_fake_{name}_')
+        super().__init__(name, os.path.join(directory, 'gd_ai_log_temp.log'))
+        open(self.log_path, 'w').close()
+
+        self.fps = fps
+        self.drop_restarts = drop_restarts
+        self.jump = False
+        self._sim = CubeSimulator(load_level(level_path), fps)
+        self._rng = random.Random(seed)
+        self._restart = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def create_controller(self) -> Controller:
+        return _FakeController(self)
+
+    def request_restart(self):
+        if self._rng.random() < self.drop_restarts:
+            return  # tecla perdida: el cliente sigue como estaba
+        self._restart.set()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _loop(self):
+        sim = self._sim
+        period = 1.0 / self.fps
+        attempt = 0
+        alive = False
+
+        with open(self.log_path, 'a', encoding='utf-8') as log:
+            next_t = time.perf_counter()
+            while not self._stop.is_set():
+                if self._restart.is_set():
+                    self._restart.clear()
+                    sim.reset()
+                    attempt += 1
+                    alive = True
+                    log.write(f"SESSION_START|{attempt}\n")
+
+                if alive:
+                    event = sim.step(self.jump)
+                    if event == EventType.STATE:
+                        log.write(sim.state_line(time.time_ns() // 1000) + "\n")
+                    else:
+                        log.write(f"{event.name}\n")
+                        alive = False
+                    log.flush()
+
+                next_t += period
+                delay = next_t - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_t = time.perf_counter()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import gd_neat_ai
+    from bench_activation import load_config, mutated_population
+
+    parser = argparse.ArgumentParser(description="Escalado con instancias falsas del juego")
+    parser.add_argument('--instances', type=int, default=4)
+    parser.add_argument('--genomes', type=int, default=24)
+    parser.add_argument('--fps', type=int, default=60)
+    parser.add_argument('--drop-restarts', type=float, default=0.05)
+    args = parser.parse_args()
+
+    sys.stdout.reconfigure(encoding='utf-8')
+    gd_neat_ai.LATENCY_STATS = False
+    gd_neat_ai.RESET_TIMEOUT = 0.2
+    gd_neat_ai.RESET_RETRIES = 1
+
+    config = load_config()
+    genomes = mutated_population(config, 10, seed=3)[:args.genomes]
+
+    baseline = None
+    counts = sorted({1, max(1, args.instances // 2), args.instances})
+    timings = []
+    for count in counts:
+        instances = [FakeGameInstance(f"fake{i}", fps=args.fps,
+                                      drop_restarts=args.drop_restarts, seed=i)
+                     for i in range(count)]
+        scheduler = InstanceScheduler(instances, gd_neat_ai.run_attempt)
+        start = time.perf_counter()
+        fitnesses = scheduler.evaluate(genomes, config)
+        elapsed = time.perf_counter() - start
+        scheduler.close()
+        for instance in instances:
+            instance.close()
+
+        baseline = baseline or elapsed
+        timings.append((count, elapsed, scheduler.requeued, fitnesses))
+
+    print(f"\n{'instancias':>10}{'tiempo':>10}{'aceleración':>13}{'reencolados':>13}")
+    for count, elapsed, requeued, _ in timings:
+        print(f"{count:>10}{elapsed:>9.1f}s{baseline / elapsed:>13.2f}{requeued:>13}")
+    same = all(f == timings[0][3] for *_, f in timings)
+    print(f"fitness iguales en todas las configuraciones: {'sí' if same else 'no'}")
@@ -0,0 +1,342 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Modelo de islas en varios procesos
+================================================================================
+
+Descripción:
+    Cuando la fitness no viene del único cliente en vivo (simulador, una
+    función determinista en pruebas), una sola población de 50 en un proceso
+    desaprovecha la máquina. ``IslandModel`` corre K poblaciones
+    ``neat.Population`` independientes, una por proceso, con cualquier
+    función de evaluación serializable con pickle (misma firma que
+    ``eval_genomes``: ``fitness(genomes, config)``).
+
+    - Épocas de ``migration_interval`` generaciones: el coordinador manda a
+      cada isla "corre M generaciones" por un ``multiprocessing.Pipe`` y
+      espera a todas.
+    - Migración en anillo: los ``migrants`` mejores de la isla i-1 reemplazan
+      genomas al azar de la isla i y la isla se re-especia.
+    - Numeración consistente: la isla i solo emite ids de genoma, ids de
+      nodo e innovaciones nuevas ≡ i (mod K), así un migrante nunca choca con
+      genes locales. Las conexiones iniciales (configure_new) reciben las
+      mismas innovaciones en todas las islas, así que siguen alineándose en
+      el cruce.
+    - Checkpoint combinado: cada isla guarda su población con
+      ``gd_checkpoint`` en ``<dir>/island_<i>`` al final de cada época y el
+      coordinador escribe ``islands.json`` (estado por isla y global) y el
+      mejor genoma. ``resume=True`` retoma cada isla desde su directorio.
+================================================================================
+"""
+
+import copy
+import json
+import multiprocessing
+import os
+import pickle
+import random
+import time
+from itertools import count
+from typing import Optional
+
+import neat
+try:
+    from neat.innovation import InnovationTracker
+except ImportError as e:
+    raise ImportError("gd_islands requiere neat-python >= 1.0 "
+                      "(pip install -r requirements.txt)") from e
+
+
+def _next_congruent(value: int, island: int, islands: int) -> int:
+    """Menor n >= ``value`` con n ≡ ``island`` (mod ``islands``)."""
+    return value + (island - value) % islands
+
+
+class IslandInnovationTracker(InnovationTracker):
+    """Innovaciones nuevas ≡ isla (mod K); ``global_counter`` es la última emitida."""
+
+    def __init__(self, start_number: int, island: int, islands: int):
+        super().__init__(start_number)
+        self.island = island
+        self.islands = islands
+
+    def get_innovation_number(self, input_node, output_node, mutation_type='add_connection'):
+        key = (input_node, output_node, mutation_type)
+        if key in self.generation_innovations:
+            return self.generation_innovations[key]
+
+        number = _next_congruent(self.global_counter + 1, self.island, self.islands)
+        self.global_counter = number
+        self.generation_innovations[key] = number
+        return number
+
+
+def _partition(p: neat.Population, config: neat.Config, island: int, islands: int):
+    """Instala los contadores de genomas, nodos e innovaciones de la isla."""
+    genome_config = config.genome_config
+    next_node = max((key for genome in p.population.values() for key in genome.nodes),
+                    default=genome_config.num_outputs - 1) + 1
+    genome_config.node_indexer = count(_next_congruent(next_node, island, islands), islands)
+
+    next_genome = max(p.population, default=0) + 1
+    p.reproduction.genome_indexer = count(_next_congruent(next_genome, island, islands), islands)
+
+    tracker = p.reproduction.innovation_tracker
+    p.reproduction.innovation_tracker = IslandInnovationTracker(tracker.global_counter,
+                                                                island, islands)
+    genome_config.innovation_tracker = p.reproduction.innovation_tracker
+
+
+def _create_population(config: neat.Config, island: int, islands: int) -> neat.Population:
+    p = neat.Population(config)
+
+    # Ids 1..N se repiten en todas las islas: se renumeran con los de esta isla
+    indexer = count(_next_congruent(1, island, islands), islands)
+    population = {}
+    for genome in p.population.values():
+        genome.key = next(indexer)
+        population[genome.key] = genome
+    p.population = population
+    p.reproduction.ancestors = {key: tuple() for key in population}
+    p.species = config.species_set_type(config.species_set_config, p.reporters)
+    p.species.speciate(config, p.population, p.generation)
+
+    _partition(p, config, island, islands)
+    p.reproduction.genome_indexer = indexer
+    return p
+
+
+class _IslandReporter(neat.reporting.BaseReporter):
+    """Guarda los mejores de la última generación evaluada y cuenta evaluaciones."""
+
+    def __init__(self, migrants: int, target: Optional[float]):
+        self.migrants = migrants
+        self.target = target
+        self.top: list = []
+        self.best_fitness: Optional[float] = None
+        self.evaluations = 0
+        self.reached_at: Optional[float] = None
+
+    def post_evaluate(self, config, population, species, best_genome):
+        ranked = sorted((g for g in population.values() if g.fitness is not None),
+                        key=lambda g: g.fitness, reverse=True)
+        self.top = [copy.deepcopy(g) for g in ranked[:self.migrants]]
+        self.evaluations += len(population)
+        if self.best_fitness is None or best_genome.fitness > self.best_fitness:
+            self.best_fitness = best_genome.fitness
+        if (self.target is not None and self.reached_at is None
+                and best_genome.fitness >= self.target):
+            self.reached_at = time.time()
+
+
+def _insert_immigrants(p: neat.Population, config: neat.Config, immigrants: list,
+                       rng: random.Random):
+    immigrants = [g for g in immigrants if g.key not in p.population]
+    if not immigrants:
+        return
+    residents = list(p.population)
+    rng.shuffle(residents)
+    for key, genome in zip(residents, immigrants):
+        del p.population[key]
+        p.population[genome.key] = genome
+        p.reproduction.ancestors[genome.key] = tuple()
+    p.species.speciate(config, p.population, p.generation)
+
+
+def _island_main(conn, island: int, islands: int, config_path: str, pop_size: Optional[int],
+                 fitness, seed: int, migrants: int, target: Optional[float],
+                 directory: Optional[str], resume: bool):
+    random.seed(seed)
+    rng = random.Random(seed)
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                         neat.DefaultSpeciesSet, neat.DefaultStagnation, config_path)
+    if pop_size:
+        config.pop_size = pop_size
+
+    store = None
+    p = None
+    if directory:
+        from gd_checkpoint import CheckpointStore, load_population
+        island_dir = os.path.join(directory, f"island_{island}")
+        if resume:
+            p, _ = load_population(config, island_dir)
+            if p is not None:
+                _partition(p, config, island, islands)
+        store = CheckpointStore(island_dir)
+    if p is None:
+        p = _create_population(config, island, islands)
+
+    reporter = _IslandReporter(migrants, target)
+    p.add_reporter(reporter)
+
+    def evaluate(genomes, config):
+        fitness(genomes, config)
+
+    while True:
+        command, payload = conn.recv()
+        if command == 'stop':
+            break
+
+        generations, immigrants = payload
+        _insert_immigrants(p, config, immigrants, rng)
+
+        start = time.perf_counter()
+        p.run(evaluate, generations)
+        elapsed = time.perf_counter() - start
+
+        if store is not None:
+            store.save(p.generation, config, p.population, p.species, p.best_genome)
+            store.flush()
+
+        conn.send({
+            'island': island,
+            'generation': p.generation,
+            'best_fitness': reporter.best_fitness,
+            'best_genome': p.best_genome,
+            'emigrants': reporter.top,
+            'evaluations': reporter.evaluations,
+            'species': len(p.species.species),
+            'time': elapsed,
+            'reached_at': reporter.reached_at,
+        })
+
+    if store is not None:
+        store.close()
+    conn.close()
+
+
+class IslandModel:
+    """K poblaciones NEAT en procesos separados con migración en anillo."""
+
+    def __init__(self, config_path: str, fitness, islands: int = 4,
+                 migration_interval: int = 5, migrants: int = 2,
+                 pop_size: Optional[int] = None, seed: int = 0,
+                 target: Optional[float] = None, directory: Optional[str] = None,
+                 resume: bool = False, verbose: bool = True):
+        self.config_path = config_path
+        self.fitness = fitness
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.pop_size = pop_size
+        self.seed = seed
+        self.target = target
+        self.directory = directory
+        self.resume = resume
+        self.verbose = verbose
+
+        self.best_genome = None
+        self.best_island: Optional[int] = None
+        self.results: list[dict] = []
+        self.evaluations = 0
+        self.reached_at: Optional[float] = None
+
+    def run(self, generations: int):
+        """Corre ``generations`` generaciones por isla y devuelve el mejor genoma."""
+        context = multiprocessing.get_context()
+        channels = []
+        processes = []
+        for island in range(self.islands):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=_island_main, daemon=True,
+                args=(child, island, self.islands, self.config_path, self.pop_size,
+                      self.fitness, self.seed * 1000 + island, self.migrants, self.target,
+                      self.directory, self.resume))
+            process.start()
+            channels.append(parent)
+            processes.append(process)
+
+        start = time.time()
+        immigrants: list[list] = [[] for _ in range(self.islands)]
+        done = 0
+        epoch = 0
+        try:
+            while done < generations:
+                step = min(self.migration_interval, generations - done)
+                for island, channel in enumerate(channels):
+                    try:
+                        channel.send(('run', (step, immigrants[island])))
+                    except OSError as e:
+                        raise self._island_died(island, processes[island]) from e
+                self.results = []
+                for island, channel in enumerate(channels):
+                    try:
+                        self.results.append(channel.recv())
+                    except (EOFError, OSError) as e:
+                        raise self._island_died(island, processes[island]) from e
+                done += step
+                epoch += 1
+
+                # Anillo: los mejores de la isla i-1 viajan a la isla i
+                immigrants = [self.results[(i - 1) % self.islands]['emigrants']
+                              if self.islands > 1 else []
+                              for i in range(self.islands)]
+                self._collect(start)
+                if self.verbose:
+                    print(self.report(f"🏝 época {epoch} (gen {done})"))
+                if self.directory:
+                    self._save(epoch, done)
+                if self.reached_at is not None:
+                    break
+        finally:
+            for channel in channels:
+                try:
+                    channel.send(('stop', None))
+                except OSError:
+                    pass    # isla ya terminada: no tapar el error que la delató
+            for process in processes:
+                process.join()
+
+        return self.best_genome
+
+    @staticmethod
+    def _island_died(island: int, process) -> RuntimeError:
+        process.join(1.0)
+        return RuntimeError(f"la isla {island} terminó sin responder "
+                            f"(código de salida {process.exitcode})")
+
+    def _collect(self, start: float):
+        self.evaluations = sum(r['evaluations'] for r in self.results)
+        for result in self.results:
+            genome = result['best_genome']
+            if genome is not None and (self.best_genome is None
+                                       or genome.fitness > self.best_genome.fitness):
+                self.best_genome = genome
+                self.best_island = result['island']
+            if result['reached_at'] is not None:
+                elapsed = result['reached_at'] - start
+                if self.reached_at is None or elapsed < self.reached_at:
+                    self.reached_at = elapsed
+
+    def _save(self, epoch: int, generation: int):
+        os.makedirs(self.directory, exist_ok=True)
+        summary = {
+            'epoch': epoch,
+            'generation': generation,
+            'islands': self.islands,
+            'migration_interval': self.migration_interval,
+            'migrants': self.migrants,
+            'evaluations': self.evaluations,
+            'best_fitness': None if self.best_genome is None else self.best_genome.fitness,
+            'best_island': self.best_island,
+            'per_island': [{key: r[key] for key in ('island', 'generation', 'best_fitness',
+                                                    'evaluations', 'species', 'time')}
+                           for r in self.results],
+        }
+        path = os.path.join(self.directory, 'islands.json')
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+        if self.best_genome is not None:
+            path = os.path.join(self.directory, 'best_genome.pkl')
+            with open(path + '.tmp', 'wb') as f:
+                pickle.dump({'genome': self.best_genome, 'fitness': self.best_genome.fitness,
+                             'island': self.best_island}, f)
+            os.replace(path + '.tmp', path)
+
+    def report(self, title: str) -> str:
+        best = "-" if self.best_genome is None else f"{self.best_genome.fitness:.0f}"
+        islands = "  ".join(f"i{r['island']}:{r['best_fitness']:.0f}/{r['species']}esp"
+                            for r in self.results if r['best_fitness'] is not None)
+        return f"{title}: mejor {best} (isla {self.best_island}) | {islands}"
@@ -0,0 +1,176 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Instrumentación de latencia por frame
+================================================================================
+
+Descripción:
+    Mide cuánto tarda cada frame desde que el mod lo emite hasta que la tecla
+    se envía, separado por etapa:
+
+    - read:     emisión en el mod → lote recibido (log/ring + espera)
+    - parse:    procesar el lote (parse_into + lógica de la sesión)
+    - activate: ``net.activate``
+    - dispatch: enviar la tecla (``controller.set_jump``)
+
+    Además cuenta los frames perdidos (huecos en el contador del mod) y los
+    saltados (STATE viejos de un lote sobre los que la red no actuó).
+
+    ``LatencyHistogram`` es un histograma log-lineal estilo HDR: 16
+    sub-cubetas por potencia de 2 (error relativo < 6.25%), registro O(1) sin
+    asignaciones y fusión por suma de cuentas. Los valores se registran en ns.
+
+    Con ``read`` alto y el resto bajo, el cuello de botella es el juego o el
+    transporte; con ``activate``/``parse`` altos, es el lado de la IA.
+================================================================================
+"""
+
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+LINEAR_LIMIT = SUB_BUCKETS << 1          # por debajo, una cubeta por valor
+MAX_BITS = 48                            # ~78 horas en ns
+NUM_BUCKETS = LINEAR_LIMIT + (MAX_BITS - SUB_BUCKET_BITS) * SUB_BUCKETS
+
+STAGES = ('read', 'parse', 'activate', 'dispatch')
+
+
+def _bucket(value: int) -> int:
+    if value < LINEAR_LIMIT:
+        return value if value > 0 else 0
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    index = LINEAR_LIMIT + (shift - 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+    return index if index < NUM_BUCKETS else NUM_BUCKETS - 1
+
+
+def _bucket_high(index: int) -> int:
+    """Mayor valor que cae en la cubeta ``index``."""
+    if index < LINEAR_LIMIT:
+        return index
+    shift = (index - LINEAR_LIMIT) // SUB_BUCKETS + 1
+    mantissa = (index - LINEAR_LIMIT) % SUB_BUCKETS + SUB_BUCKETS
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Histograma de latencias en ns con precisión relativa acotada."""
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value_ns: int):
+        if value_ns < 0:
+            value_ns = 0
+        self.counts[_bucket(value_ns)] += 1
+        if self.count == 0 or value_ns < self.min:
+            self.min = value_ns
+        if value_ns > self.max:
+            self.max = value_ns
+        self.count += 1
+        self.total += value_ns
+
+    def merge(self, other: 'LatencyHistogram'):
+        if other.count == 0:
+            return
+        counts = self.counts
+        for i, n in enumerate(other.counts):
+            if n:
+                counts[i] += n
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def percentile(self, q: float) -> int:
+        """Valor (ns) bajo el cual está el ``q``% de las muestras."""
+        if self.count == 0:
+            return 0
+        target = max(1, -(-self.count * q // 100))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min(_bucket_high(i), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> dict:
+        """Resumen compacto en µs."""
+        return {
+            'count': self.count,
+            'min': self.min / 1000,
+            'p50': self.percentile(50) / 1000,
+            'p90': self.percentile(90) / 1000,
+            'p99': self.percentile(99) / 1000,
+            'max': self.max / 1000,
+            'mean': self.mean / 1000,
+        }
+
+
+class FrameStats:
+    """Latencias y conteos de frames de un intento (o de una generación fusionada)."""
+
+    def __init__(self, attempts: int = 1):
+        self.read = LatencyHistogram()
+        self.parse = LatencyHistogram()
+        self.activate = LatencyHistogram()
+        self.dispatch = LatencyHistogram()
+        self.states = 0     # STATE recibidos
+        self.frames = 0     # frames sobre los que la red actuó
+        self.dropped = 0    # huecos en el contador de frames del mod
+        self.attempts = attempts
+        self._last_frame = 0
+
+    def observe_frame(self, frame: int):
+        """Registra un STATE recibido; ``frame`` = 0 si el mod no lo envía."""
+        self.states += 1
+        if frame:
+            if self._last_frame and frame > self._last_frame + 1:
+                self.dropped += frame - self._last_frame - 1
+            self._last_frame = frame
+
+    @property
+    def skipped(self) -> int:
+        return max(0, self.states - self.frames)
+
+    def merge(self, other: 'FrameStats'):
+        for stage in STAGES:
+            getattr(self, stage).merge(getattr(other, stage))
+        self.states += other.states
+        self.frames += other.frames
+        self.dropped += other.dropped
+        self.attempts += other.attempts
+
+    def ai_p50_us(self) -> float:
+        return sum(getattr(self, stage).percentile(50) for stage in STAGES[1:]) / 1000
+
+    def short(self) -> str:
+        """Resumen de una línea para el final de cada intento."""
+        read = self.read.summary()
+        return (f"⏱ lectura p50 {read['p50'] / 1000:.1f}ms p99 {read['p99'] / 1000:.1f}ms"
+                f" | IA p50 {self.ai_p50_us():.0f}µs"
+                f" | perdidos {self.dropped} saltados {self.skipped}")
+
+    def report(self, title: str) -> str:
+        """Tabla por etapa (µs) y diagnóstico de dónde se va el tiempo."""
+        lines = [f"{title}: {self.attempts} intentos, {self.frames} frames actuados, "
+                 f"{self.skipped} saltados, {self.dropped} perdidos",
+                 f"   {'etapa':<10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}  µs"]
+        for stage in STAGES:
+            s = getattr(self, stage).summary()
+            lines.append(f"   {stage:<10}{s['p50']:>10.1f}{s['p90']:>10.1f}"
+                         f"{s['p99']:>10.1f}{s['max']:>10.1f}")
+
+        if self.read.count:
+            read_p50 = self.read.percentile(50) / 1000
+            ai_p50 = self.ai_p50_us()
+            side = "juego/transporte" if read_p50 > ai_p50 else "IA"
+            lines.append(f"   → domina {side} (lectura {read_p50:.0f}µs vs IA {ai_p50:.0f}µs)")
+        return "\n".join(lines)
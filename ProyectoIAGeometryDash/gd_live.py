@@ -0,0 +1,742 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Cliente en vivo: transporte, control e intento
+================================================================================
+
+Descripción:
+    Todo lo que toca al juego real y no depende de la configuración del
+    entrenamiento: lectura del log (``SafeLogReader``) o del buffer circular
+    (gd_ring), parsers del protocolo, controladores del salto, la
+    descripción de una instancia del juego (``GameInstance``) y el intento
+    de nivel (``LevelSession``).
+
+    gd_neat_ai se ejecuta como script (``__main__``): los módulos que
+    importa (gd_instances, gd_trace) toman estos tipos de aquí y no de
+    gd_neat_ai, así no se carga una segunda copia del script con su propio
+    estado (métricas, racing, latencias).
+================================================================================
+"""
+
+import os
+import sys
+import threading
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from itertools import count
+from typing import Optional, Tuple
+
+import keyboard
+import neat
+
+from gd_common import CompactState, EventType, MATRIX_SIZE, STUCK_THRESHOLD, distance_fitness
+from gd_ring import RingBufferReader, KIND_STATE, KIND_DEATH, KIND_WIN, KIND_SESSION_START
+from gd_watch import create_watcher
+
+# ============================================================================
+# CONFIGURACIÓN
+# ============================================================================
+IMMUNITY_WINDOW = 0.2      # s tras el inicio en que se ignora DEATH
+READ_RETRY_DELAY = 0.0005
+WAIT_TIMEOUT = 0.05
+MATRIX_CACHE_SIZE = 4096
+
+# ============================================================================
+# ESTRUCTURAS DE DATOS
+# ============================================================================
+@dataclass
+class GameState:
+    x: float
+    y: float
+    vely: float
+    ground: bool
+    matrix: list[float]
+    timestamp: float
+
+# Matrices ya decodificadas: en un nivel se repiten muy pocas combinaciones
+_MATRIX_CACHE: dict[str, array] = {}
+
+def _decode_matrix(text: str) -> array:
+    cells = _MATRIX_CACHE.get(text)
+    if cells is not None:
+        return cells
+    
+    values = [float(v) for v in text.strip(',').split(',') if v][:MATRIX_SIZE]
+    values.extend([0.0] * (MATRIX_SIZE - len(values)))
+    cells = array('d', values)
+    
+    if len(_MATRIX_CACHE) >= MATRIX_CACHE_SIZE:
+        _MATRIX_CACHE.clear()
+    _MATRIX_CACHE[text] = cells
+    
+    return cells
+
+class SafeLogReader:
+    """Sigue el log como `tail -f`: recuerda el offset en bytes y solo lee lo nuevo.
+    
+    Cada línea completa se entrega en orden (no se pierden DEATH/WIN aunque
+    lleguen varias entre consultas), la línea parcial se guarda hasta que llegue
+    su salto de línea, y si el archivo se achica (``openTempLog`` lo trunca en
+    ``PlayLayer::init``) se vuelve a leer desde el inicio.
+    """
+    
+    def __init__(self, filepath: str, watcher=None):
+        self.filepath = filepath
+        self._file = None
+        self._offset = 0
+        self._partial = b""
+        self._pending: deque[str] = deque()
+        self._watcher = watcher
+        
+    def read_raw(self) -> Optional[str]:
+        """Devuelve la siguiente línea pendiente, o None si no hay nada nuevo."""
+        if not self._pending:
+            self._poll()
+        
+        if self._pending:
+            return self._pending.popleft()
+        return None
+    
+    def read_lines(self) -> list[str]:
+        """Devuelve todas las líneas nuevas en orden (lista vacía si no hay)."""
+        if not self._pending:
+            self._poll()
+        
+        lines = list(self._pending)
+        self._pending.clear()
+        return lines
+    
+    def wait(self, timeout: float = WAIT_TIMEOUT) -> bool:
+        """Duerme hasta que el log cambie (inotify o sondeo adaptativo)."""
+        if self._pending:
+            return True
+        
+        if self._watcher is None:
+            # Recién creado: pudo llegar algo antes de empezar a vigilar, releer
+            self._watcher = create_watcher(self.filepath)
+            return True
+        
+        return self._watcher.wait(timeout)
+    
+    def skip_to_end(self):
+        """Descarta lo pendiente y se posiciona al final del log actual."""
+        self._pending.clear()
+        self._partial = b""
+        
+        if self._open():
+            try:
+                self._offset = os.fstat(self._file.fileno()).st_size
+            except OSError:
+                self.close()
+    
+    def close(self):
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+        
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+        self._file = None
+        self._offset = 0
+        self._partial = b""
+    
+    def _open(self) -> bool:
+        if self._file is not None:
+            return True
+        
+        for attempt in range(3):
+            try:
+                # Sin buffer: tras un truncado no debe quedar contenido viejo en caché
+                self._file = open(self.filepath, 'rb', buffering=0)
+                self._offset = 0
+                self._partial = b""
+                return True
+            except FileNotFoundError:
+                return False
+            except (PermissionError, OSError):
+                if attempt < 2:
+                    time.sleep(READ_RETRY_DELAY)
+        
+        return False
+    
+    def _poll(self):
+        if not self._open():
+            return
+        
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            
+            if size < self._offset:
+                # Log truncado: nuevo intento, empezar desde el principio
+                self._offset = 0
+                self._partial = b""
+            
+            if size == self._offset:
+                return
+            
+            self._file.seek(self._offset)
+            chunk = self._file.read(size - self._offset)
+        except OSError:
+            self.close()
+            return
+        
+        if not chunk:
+            return
+        
+        self._offset += len(chunk)
+        
+        if self._watcher is not None:
+            self._watcher.reset()
+        
+        lines = (self._partial + chunk).split(b'\n')
+        self._partial = lines.pop()
+        
+        for line in lines:
+            content = line.strip().decode('utf-8', errors='replace')
+            if content:
+                self._pending.append(content)
+
+class GameStateParser:
+    """Parsea el protocolo del log: STATE|X|Y|Vel|G|Matrix|Frame|T_us, DEATH/WIN
+    o SESSION_START|id (Frame y T_us son opcionales para logs viejos)."""
+    
+    # Ids locales crecientes para SESSION_START sin id: cada uno es una sesión nueva
+    _local_sessions = count(1)
+    
+    @staticmethod
+    def parse(line: str) -> Tuple[EventType, Optional[GameState]]:
+        if not line:
+            return EventType.NONE, None
+        
+        if line == 'DEATH':
+            return EventType.DEATH, None
+        elif line == 'WIN':
+            return EventType.WIN, None
+        elif line.startswith('SESSION_START'):
+            return EventType.SESSION_START, None
+        
+        parts = line.split('|')
+        if parts[0] == 'STATE' and len(parts) >= 6:
+            try:
+                state = GameState(
+                    x=float(parts[1]),
+                    y=float(parts[2]),
+                    vely=float(parts[3]),
+                    ground=int(parts[4]) == 1,
+                    matrix=[float(v) for v in parts[5].strip(',').split(',') if v],
+                    # Instante de emisión del mod si viene, si no el de parseo
+                    timestamp=int(parts[7]) / 1e6 if len(parts) >= 8 else time.time()
+                )
+                return EventType.STATE, state
+                
+            except (ValueError, IndexError):
+                return EventType.NONE, None
+        
+        return EventType.NONE, None
+    
+    @staticmethod
+    def parse_into(line: str, state: CompactState) -> EventType:
+        """Camino rápido: escribe el frame en ``state`` sin crear GameState ni listas."""
+        if not line:
+            return EventType.NONE
+        
+        if line == 'DEATH':
+            return EventType.DEATH
+        elif line == 'WIN':
+            return EventType.WIN
+        
+        parts = line.split('|')
+        if parts[0] != 'STATE' or len(parts) < 6:
+            if parts[0] == 'SESSION_START':
+                # Mods antiguos no escriben el id: sin uno propio, todos los
+                # handshakes posteriores parecerían duplicados del primero
+                try:
+                    if len(parts) > 1:
+                        state.session = int(parts[1])
+                    else:
+                        state.session = next(GameStateParser._local_sessions)
+                except ValueError:
+                    return EventType.NONE
+                return EventType.SESSION_START
+            return EventType.NONE
+        
+        try:
+            x = float(parts[1])
+            y = float(parts[2])
+            vely = float(parts[3])
+            cells = _decode_matrix(parts[5])
+            if len(parts) >= 8:
+                state.frame = int(parts[6])
+                state.emit_us = int(parts[7])
+            else:
+                state.frame = 0
+                state.emit_us = 0
+        except ValueError:
+            return EventType.NONE
+        
+        ground = parts[4] == '1'
+        
+        state.x = x
+        state.y = y
+        state.vely = vely
+        state.ground = ground
+        
+        inputs = state.inputs
+        inputs[0] = (y - 105.0) / 100.0
+        inputs[1] = vely / 20.0
+        inputs[2] = 1.0 if ground else 0.0
+        inputs[4:] = cells
+        
+        return EventType.STATE
+
+class RingRecordParser:
+    """Convierte registros del buffer circular (gd_ring) al mismo par que GameStateParser."""
+    
+    @staticmethod
+    def parse(record: tuple) -> Tuple[EventType, Optional[GameState]]:
+        if not record:
+            return EventType.NONE, None
+        
+        kind = record[1]
+        
+        if kind == KIND_DEATH:
+            return EventType.DEATH, None
+        elif kind == KIND_WIN:
+            return EventType.WIN, None
+        elif kind == KIND_SESSION_START:
+            return EventType.SESSION_START, None
+        elif kind == KIND_STATE:
+            state = GameState(
+                x=record[2],
+                y=record[3],
+                vely=record[4],
+                ground=record[5] == 1,
+                matrix=[float(v) for v in record[6:21]],
+                timestamp=record[22] / 1e6
+            )
+            return EventType.STATE, state
+        
+        return EventType.NONE, None
+    
+    @staticmethod
+    def parse_into(record: tuple, state: CompactState) -> EventType:
+        if not record:
+            return EventType.NONE
+        
+        kind = record[1]
+        
+        if kind == KIND_DEATH:
+            return EventType.DEATH
+        elif kind == KIND_WIN:
+            return EventType.WIN
+        elif kind == KIND_SESSION_START:
+            # El id de intento viaja en el campo x
+            state.session = int(record[2])
+            return EventType.SESSION_START
+        elif kind != KIND_STATE:
+            return EventType.NONE
+        
+        state.x = record[2]
+        state.y = record[3]
+        state.vely = record[4]
+        state.ground = record[5] == 1
+        state.frame = record[21]
+        state.emit_us = record[22]
+        
+        inputs = state.inputs
+        inputs[0] = (state.y - 105.0) / 100.0
+        inputs[1] = state.vely / 20.0
+        inputs[2] = 1.0 if state.ground else 0.0
+        for i in range(MATRIX_SIZE):
+            inputs[4 + i] = record[6 + i]
+        
+        return EventType.STATE
+
+# ============================================================================
+# LÓGICA DE SINCRONIZACIÓN
+# ============================================================================
+class Controller:
+    """Capa de control: recibe la decisión de cada frame y solo envía eventos
+    en los cambios (presionar/soltar), respetando ``min_hold``/``min_release``.
+    
+    Las subclases implementan ``_send`` (y ``_restart`` si reinician el nivel).
+    """
+    
+    def __init__(self, min_hold: float = 0.0, min_release: float = 0.0,
+                 clock=time.perf_counter):
+        self.min_hold = min_hold
+        self.min_release = min_release
+        self.clock = clock
+        self.pressed = False
+        self.decision_count = 0
+        self.event_count = 0
+        self._changed_at = float('-inf')
+    
+    def set_jump(self, pressed: bool):
+        self.decision_count += 1
+        if pressed == self.pressed:
+            return
+        
+        if self.min_hold or self.min_release:
+            now = self.clock()
+            minimum = self.min_hold if self.pressed else self.min_release
+            if now - self._changed_at < minimum:
+                return
+            self._changed_at = now
+        
+        self._send(pressed)
+        self.pressed = pressed
+        self.event_count += 1
+    
+    def release(self):
+        if self.pressed:
+            self._send(False)
+            self.pressed = False
+            self.event_count += 1
+    
+    def restart(self):
+        """Reinicia el nivel. Siempre suelta la tecla para sincronizar el estado."""
+        self._send(False)
+        self.pressed = False
+        self._changed_at = float('-inf')
+        self._restart()
+    
+    def action_rate(self, seconds: float) -> float:
+        """Eventos enviados por segundo."""
+        return self.event_count / seconds if seconds > 0 else 0.0
+    
+    def _send(self, pressed: bool):
+        raise NotImplementedError
+    
+    def _restart(self):
+        pass
+
+class KeyboardController(Controller):
+    """Envía el salto al juego real con el módulo keyboard."""
+    
+    def _send(self, pressed: bool):
+        if pressed:
+            keyboard.press('space')
+        else:
+            keyboard.release('space')
+    
+    def _restart(self):
+        keyboard.press_and_release('r')
+
+class RecordingController(Controller):
+    """Controlador falso: anota decisiones y eventos sin tocar el teclado."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.actions: list[int] = []               # decisión de cada frame
+        self.events: list[tuple[float, bool]] = []  # (instante, presionado)
+        self.restarts = 0
+    
+    def set_jump(self, pressed: bool):
+        self.actions.append(1 if pressed else 0)
+        super().set_jump(pressed)
+    
+    def _send(self, pressed: bool):
+        self.events.append((self.clock(), pressed))
+    
+    def _restart(self):
+        self.restarts += 1
+
+class WindowController(Controller):
+    """Envía el salto a una ventana concreta (Windows) con PostMessage, sin
+    depender del foco: permite varias instancias del juego a la vez."""
+    
+    WM_KEYDOWN = 0x0100
+    WM_KEYUP = 0x0101
+    VK_SPACE = 0x20
+    VK_R = 0x52
+    
+    def __init__(self, window_title: str, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        import ctypes
+        self._user32 = ctypes.windll.user32
+        self.hwnd = self._user32.FindWindowW(None, window_title)
+        if not self.hwnd:
+            raise RuntimeError(f"Ventana no encontrada: {window_title}")
+    
+    def _post(self, key: int, down: bool):
+        if down:
+            self._user32.PostMessageW(self.hwnd, self.WM_KEYDOWN, key, 1)
+        else:
+            self._user32.PostMessageW(self.hwnd, self.WM_KEYUP, key, 0xC0000001)
+    
+    def _send(self, pressed: bool):
+        self._post(self.VK_SPACE, pressed)
+    
+    def _restart(self):
+        self._post(self.VK_R, True)
+        self._post(self.VK_R, False)
+
+@dataclass
+class GameInstance:
+    """Un cliente del juego: de dónde se leen sus frames y a dónde van sus teclas."""
+    
+    name: str
+    log_path: str
+    ring_path: Optional[str] = None
+    transport: str = "text"
+    window: Optional[str] = None  # None = teclado global (solo una instancia)
+    last_session_id: Optional[int] = None  # último SESSION_START jugado
+    min_hold: float = 0.0       # tiempos mínimos del controlador (Controller)
+    min_release: float = 0.0
+    
+    @property
+    def source_path(self) -> str:
+        return self.ring_path if self.transport == "ring" else self.log_path
+    
+    def create_transport(self):
+        """Devuelve (reader, parser) según el transporte de la instancia."""
+        if self.transport == "ring":
+            return RingBufferReader(self.ring_path), RingRecordParser()
+        return SafeLogReader(self.log_path), GameStateParser()
+    
+    def create_controller(self) -> Controller:
+        if self.window:
+            return WindowController(self.window, self.min_hold, self.min_release)
+        return KeyboardController(self.min_hold, self.min_release)
+
+class AttemptTimeout(Exception):
+    """El juego no reinició el nivel o dejó de enviar frames."""
+
+class LevelSession:
+    """Maneja un intento de nivel con handshake y tracking.
+    
+    ``controller``, ``clock``, ``recorder`` y ``stats`` son opcionales: por
+    defecto se juega con el teclado y ``time.time``. La repetición de trazas
+    (gd_trace) inyecta un controlador sin teclado y el reloj grabado, la
+    grabación pasa un ``TraceRecorder`` que guarda cada evento consumido y
+    ``stats`` (``FrameStats``) mide la latencia de cada frame actuado.
+    ``racer`` (``gd_racing.Racer``) corta el intento si ya no puede alcanzar
+    la curva de referencia; queda ``aborted`` y la fitness es la de la
+    distancia recorrida hasta el corte.
+    """
+    
+    attempt_counter = 0  # Contador global de intentos
+    _counter_lock = threading.Lock()  # varias instancias crean sesiones a la vez
+    
+    def __init__(self, reader: SafeLogReader, parser: GameStateParser, genome_id: int,
+                 controller=None, clock=None, recorder=None, stats=None,
+                 previous_session_id: Optional[int] = None, racer=None):
+        self.reader = reader
+        self.parser = parser
+        self.genome_id = genome_id
+        self.controller = controller or KeyboardController()
+        self.recorder = recorder
+        self.stats = stats
+        self.racer = racer
+        self.clock = clock or time.time
+        if recorder is not None:
+            self.clock = recorder.wrap_clock(self.clock)
+        
+        with LevelSession._counter_lock:
+            LevelSession.attempt_counter += 1
+            self.attempt_id = LevelSession.attempt_counter
+        
+        self.start_time = None
+        self.start_x = None
+        self.max_x = 0.0
+        self.frames_stuck = 0
+        self.distance = 0.0
+        self.duration = 0.0
+        self.aborted = False
+        self.won = False
+        self.previous_session_id = previous_session_id
+        self.session_id = None
+        self.state = CompactState()
+        
+    def wait_for_reset(self, timeout: Optional[float] = None) -> bool:
+        """Espera el SESSION_START de un intento nuevo y su primer frame.
+        
+        Un id igual a ``previous_session_id`` (el intento anterior de esta
+        instancia) es un duplicado y se ignora, igual
+        que los frames viejos previos al SESSION_START. Devuelve False si pasa
+        ``timeout`` segundos sin completar el handshake (None = sin límite).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        state = self.state
+        
+        while True:
+            raw = self.reader.read_raw()
+            if not raw:
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self.reader.wait(min(remaining, WAIT_TIMEOUT))
+                else:
+                    self.reader.wait()
+                continue
+            
+            event = self.parser.parse_into(raw, state)
+            
+            if self.recorder is not None:
+                self.recorder.begin_batch(time.time())
+                self.recorder.record_event(event, state)
+            
+            if event == EventType.SESSION_START:
+                if state.session != self.previous_session_id:
+                    self.session_id = state.session
+            elif event == EventType.STATE and self.session_id is not None:
+                return True
+    
+    def run(self, net: neat.nn.FeedForwardNetwork,
+            stall_timeout: Optional[float] = None) -> float:
+        """Ejecuta un intento completo del nivel.
+        
+        Lanza ``AttemptTimeout`` si pasan ``stall_timeout`` segundos sin datos.
+        """
+        self.start_time = self.clock()
+        last_data = time.monotonic()
+        recorder = self.recorder
+        stats = self.stats
+        racer = self.racer
+        valid_attempt = False
+        
+        finished = False
+        
+        while not finished:
+            lines = self.reader.read_lines()
+            if not lines:
+                if stall_timeout is not None and time.monotonic() - last_data > stall_timeout:
+                    self.controller.release()
+                    raise AttemptTimeout(f"sin datos del juego en {stall_timeout:.1f}s")
+                self.reader.wait()
+                continue
+            
+            if stall_timeout is not None:
+                last_data = time.monotonic()
+            now = self.clock()
+            elapsed = now - self.start_time
+            if recorder is not None:
+                recorder.begin_batch(now)
+            if stats is not None:
+                recv_us = time.time_ns() // 1000
+                batch_start = time.perf_counter_ns()
+            
+            # Se procesan todos los eventos en orden, pero la red solo actúa
+            # sobre el estado más reciente del lote (los anteriores ya son viejos)
+            state = self.state
+            has_state = False
+            
+            for raw in lines:
+                event = self.parser.parse_into(raw, state)
+                if recorder is not None:
+                    recorder.record_event(event, state)
+                
+                if event == EventType.SESSION_START and state.session != self.session_id:
+                    # El nivel se reinició a mitad del intento: medir desde el nuevo spawn
+                    self.session_id = state.session
+                    self.start_time = now
+                    self.start_x = None
+                    self.max_x = 0.0
+                    self.frames_stuck = 0
+                    valid_attempt = False
+                    has_state = False
+                    continue
+                
+                if event == EventType.DEATH:
+                    if elapsed < IMMUNITY_WINDOW:
+                        continue
+                    finished = True
+                    break
+                
+                if event == EventType.WIN:
+                    # El bono va solo a la fitness: distance y la curva del
+                    # racing quedan en unidades reales
+                    self.won = True
+                    valid_attempt = True
+                    finished = True
+                    break
+                
+                if event == EventType.STATE:
+                    # Marcar que empezamos a recibir datos válidos
+                    if not valid_attempt and state.x > 10:
+                        valid_attempt = True
+                    
+                    if self.start_x is None:
+                        self.start_x = state.x
+                        self.max_x = state.x
+                    
+                    if state.x > self.max_x + 0.5:
+                        self.max_x = state.x
+                        self.frames_stuck = 0
+                    else:
+                        self.frames_stuck += 1
+                    
+                    if self.frames_stuck > STUCK_THRESHOLD:
+                        valid_attempt = True
+                        finished = True
+                        break
+                    
+                    has_state = True
+                    if stats is not None:
+                        stats.observe_frame(state.frame)
+            
+            if finished or not has_state:
+                continue
+            
+            if racer is not None and racer.hopeless(elapsed, self.max_x - self.start_x):
+                self.aborted = True
+                valid_attempt = True
+                finished = True
+                continue
+            
+            if stats is None:
+                jump = net.activate(state.inputs)[0] > 0.5
+                self.controller.set_jump(jump)
+            else:
+                t_parsed = time.perf_counter_ns()
+                jump = net.activate(state.inputs)[0] > 0.5
+                t_activated = time.perf_counter_ns()
+                self.controller.set_jump(jump)
+                
+                stats.parse.record(t_parsed - batch_start)
+                stats.activate.record(t_activated - t_parsed)
+                stats.dispatch.record(time.perf_counter_ns() - t_activated)
+                if state.emit_us:
+                    stats.read.record((recv_us - state.emit_us) * 1000)
+                stats.frames += 1
+            
+            if recorder is not None:
+                recorder.record_action(jump)
+        
+        self.controller.release()
+        self.duration = self.clock() - self.start_time
+        
+        if self.start_x is None or not valid_attempt:
+            return 0.0
+        
+        distance = self.distance = self.max_x - self.start_x
+        percentage = min((distance / 10000.0) * 100, 100)
+        fitness = distance_fitness(distance, self.won)
+        
+        sys.stdout.write(f"D:{distance:.0f}({percentage:.1f}%){'🏁' if self.aborted else ''} ")
+        sys.stdout.flush()
+        
+        return fitness
+    
+    def _build_inputs(self, state: GameState) -> list[float]:
+        """Construye vector de 19 inputs: 4 físicos + 15 de visión."""
+        inputs = []
+        
+        inputs.append((state.y - 105.0) / 100.0)
+        inputs.append(state.vely / 20.0)
+        inputs.append(1.0 if state.ground else 0.0)
+        inputs.append(1.0)
+        
+        matrix = state.matrix[:15]
+        while len(matrix) < 15:
+            matrix.append(0.0)
+        
+        inputs.extend(matrix)
+        
+        return inputs
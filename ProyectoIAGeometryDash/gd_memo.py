@@ -0,0 +1,140 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Caché de fitness por red expresada
+================================================================================
+
+Descripción:
+    Muchos hijos de NEAT expresan exactamente la misma red que un genoma ya
+    evaluado (mutaciones en genes desactivados, nodos que no llegan a la
+    salida, élites que pasan sin cambios a la generación siguiente), pero cada
+    uno costaría un intento completo en tiempo real.
+
+    ``FitnessCache`` guarda la fitness por ``gd_compiled.genome_hash``: hash
+    de la red podada (solo nodos y enlaces que se evalúan, con pesos, bias,
+    response y activaciones). Con ``quantum`` los parámetros se redondean a
+    múltiplos de ``quantum`` y redes casi iguales comparten entrada.
+
+    - ``lookup`` asigna la fitness de los aciertos y devuelve los genomas a
+      jugar, uno por clave (los duplicados de la misma generación esperan al
+      primero).
+    - ``update`` guarda las fitness jugadas y las copia a los duplicados.
+      Los intentos cortados por el racing (``LevelSession.aborted``) solo
+      dan una cota inferior: no se guardan ni se copian, y sus duplicados
+      se devuelven para jugarlos.
+    - Desalojo LRU con ``max_size`` entradas.
+    - ``state``/``load`` para guardarlo en el checkpoint y retomarlo.
+
+    Las fitness 0 no se guardan: pueden venir de un intento que no llegó a
+    jugarse (AttemptTimeout, sin datos válidos) y conviene repetirlos.
+================================================================================
+"""
+
+from collections import OrderedDict
+from typing import Optional
+
+
+class FitnessCache:
+    """Caché LRU de fitness por red expresada."""
+
+    def __init__(self, max_size: int = 2000, quantum: Optional[float] = None):
+        self.max_size = max_size
+        self.quantum = quantum
+        self._entries: OrderedDict[str, float] = OrderedDict()
+        self._keys: dict[int, str] = {}         # genome_id → clave del lote en curso
+        self._waiting: dict[str, list] = {}     # clave → (genome_id, genome) duplicados del lote
+        self.hits = 0
+        self.lookups = 0
+        self.evictions = 0
+        self._reset_generation()
+
+    def _reset_generation(self):
+        self.generation_hits = 0
+        self.generation_lookups = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, genome, config) -> str:
+        from gd_compiled import genome_hash
+        return genome_hash(genome, config, self.quantum)
+
+    def get(self, key: str) -> Optional[float]:
+        self.lookups += 1
+        self.generation_lookups += 1
+        fitness = self._entries.get(key)
+        if fitness is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.generation_hits += 1
+        return fitness
+
+    def put(self, key: str, fitness: float):
+        if not fitness:
+            return
+        self._entries[key] = fitness
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def lookup(self, genomes, config) -> list:
+        """Asigna la fitness en caché y devuelve los (genome_id, genome) a jugar."""
+        self._keys = {}
+        self._waiting = {}
+        pending = []
+
+        for genome_id, genome in genomes:
+            key = self.key(genome, config)
+            fitness = self.get(key)
+            if fitness is not None:
+                genome.fitness = fitness
+            elif key in self._waiting:
+                # Misma red que otro genoma del lote: se juega una sola vez
+                self.hits += 1
+                self.generation_hits += 1
+                self._waiting[key].append((genome_id, genome))
+            else:
+                self._keys[genome_id] = key
+                self._waiting[key] = []
+                pending.append((genome_id, genome))
+
+        return pending
+
+    def update(self, played, aborted=()) -> list:
+        """Guarda la fitness de los genomas jugados y la copia a sus duplicados.
+
+        ``aborted``: ids de los intentos cortados. Devuelve los duplicados de
+        esos genomas, que siguen sin fitness y hay que jugar.
+        """
+        unresolved = []
+        for genome_id, genome in played:
+            key = self._keys.pop(genome_id, None)
+            if key is None:
+                continue
+            duplicates = self._waiting.pop(key, ())
+            if genome_id in aborted:
+                unresolved.extend(duplicates)
+                continue
+            self.put(key, genome.fitness)
+            for _, duplicate in duplicates:
+                duplicate.fitness = genome.fitness
+        return unresolved
+
+    def state(self) -> dict:
+        return {'quantum': self.quantum, 'entries': list(self._entries.items())}
+
+    def load(self, state: dict):
+        """Restaura las entradas de ``state`` (si se guardaron con el mismo ``quantum``)."""
+        if state.get('quantum') != self.quantum:
+            return
+        for key, fitness in state['entries']:
+            self.put(key, fitness)
+
+    def next_generation(self):
+        self._reset_generation()
+
+    def report(self, title: str) -> str:
+        rate = self.generation_hits / self.generation_lookups if self.generation_lookups else 0.0
+        total = self.hits / self.lookups if self.lookups else 0.0
+        return (f"{title}: {self.generation_hits}/{self.generation_lookups} aciertos ({rate:.0%}), "
+                f"total {total:.0%}, {len(self)} entradas, {self.evictions} desalojadas")
@@ -0,0 +1,161 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Métricas de entrenamiento en streaming (JSONL)
+================================================================================
+
+Descripción:
+    Reemplaza ``neat.StatisticsReporter`` (que guarda en memoria el mejor
+    genoma y las fitness de cada especie de todas las generaciones) por un
+    archivo JSONL que solo crece en disco: una línea compacta por registro,
+    escrita por lotes de ``flush_every`` líneas. La memoria no crece con la
+    cantidad de generaciones.
+
+    Registros (campo ``type``):
+    - ``attempt``:    cada intento en el juego real (run_attempt): genoma,
+      instancia, fitness, distancia, duración, frames, latencias, teclas.
+    - ``genome``:     cada genoma evaluado de la generación: fitness,
+      distancia, especie, nodos y conexiones, origen (juego/caché/sim).
+    - ``generation``: resumen: fitness mejor/media/desvío, especies, tiempo
+      de pared, latencia de la generación y aciertos del caché.
+
+    ``read_metrics`` recorre el archivo sin cargarlo entero y ``columns``
+    arma columnas (listas) de un tipo de registro para graficar.
+
+Uso:
+    python gd_metrics.py [metrics.jsonl]                  # tabla por generación
+    python gd_metrics.py metrics.jsonl --plot curva.png   # requiere matplotlib
+================================================================================
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Iterator, Optional
+
+
+class MetricsWriter:
+    """Agrega registros JSONL a ``path`` por lotes (seguro entre hilos)."""
+
+    def __init__(self, path: str, flush_every: int = 50):
+        self.path = path
+        self.flush_every = flush_every
+        self.records = 0
+        self._buffer: list[str] = []
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, kind: str, **fields):
+        record = {'type': kind, 't': round(time.time(), 3)}
+        record.update(fields)
+        line = json.dumps(record, separators=(',', ':'), ensure_ascii=False)
+        with self._lock:
+            self._buffer.append(line)
+            self.records += 1
+            if len(self._buffer) >= self.flush_every:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._file.flush()
+            self._buffer.clear()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._file.close()
+
+
+def read_metrics(path: str, kind: Optional[str] = None) -> Iterator[dict]:
+    """Registros de ``path`` en orden (solo los de tipo ``kind`` si se indica).
+
+    Una última línea incompleta (corte durante la escritura) se ignora.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if kind is None or record.get('type') == kind:
+                yield record
+
+
+def columns(path: str, kind: str, fields: Optional[list[str]] = None) -> dict[str, list]:
+    """Columnas de los registros ``kind`` (None donde un registro no tiene el campo)."""
+    data: dict[str, list] = {}
+    rows = 0
+    for record in read_metrics(path, kind):
+        names = fields or record.keys()
+        for name in names:
+            if name not in data:
+                data[name] = [None] * rows
+        for name, values in data.items():
+            values.append(record.get(name))
+        rows += 1
+    return data
+
+
+def _plot(path: str, output: str):
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        raise SystemExit("❌ --plot requiere matplotlib (pip install matplotlib)")
+
+    gens = columns(path, 'generation', ['gen', 'best', 'mean', 'best_distance', 'species',
+                                        'read_p50', 'ai_p50'])
+    fig, axes = plt.subplots(3, 1, figsize=(9, 9), sharex=True)
+    axes[0].plot(gens['gen'], gens['best'], label="mejor")
+    axes[0].plot(gens['gen'], gens['mean'], label="media")
+    axes[0].set_ylabel("fitness")
+    axes[0].legend()
+    axes[1].plot(gens['gen'], gens['species'])
+    axes[1].set_ylabel("especies")
+    axes[2].plot(gens['gen'], gens['read_p50'], label="lectura p50")
+    axes[2].plot(gens['gen'], gens['ai_p50'], label="IA p50")
+    axes[2].set_ylabel("µs")
+    axes[2].set_xlabel("generación")
+    axes[2].legend()
+    fig.tight_layout()
+    fig.savefig(output)
+    print(f"📈 {output}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Métricas de entrenamiento (JSONL)")
+    parser.add_argument('path', nargs='?', default='metrics.jsonl')
+    parser.add_argument('--plot', default=None, help="guardar gráfico (PNG)")
+    args = parser.parse_args()
+
+    sys.stdout.reconfigure(encoding='utf-8')
+
+    if args.plot:
+        _plot(args.path, args.plot)
+        sys.exit(0)
+
+    attempts = 0
+    play_time = 0.0
+    for record in read_metrics(args.path, 'attempt'):
+        attempts += 1
+        play_time += record.get('time', 0.0)
+
+    print(f"{'gen':>5}{'mejor':>10}{'media':>10}{'distancia':>11}{'especies':>10}"
+          f"{'jugados':>9}{'caché':>7}{'tiempo':>9}")
+    for g in read_metrics(args.path, 'generation'):
+        print(f"{g['gen']:>5}{g['best']:>10.0f}{g['mean']:>10.0f}{g['best_distance']:>10.0f}u"
+              f"{g['species']:>10}{g.get('played', 0):>9}{g.get('cache_hits', 0):>7}"
+              f"{g['wall']:>8.0f}s")
+    print(f"{attempts} intentos en el juego, {play_time / 60:.1f} min jugados")
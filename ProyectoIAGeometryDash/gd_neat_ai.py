@@ -23,326 +23,479 @@ Arquitectura:
     - Output: 1 (saltar/no saltar)
 
 Uso:
-    python gd_neat_ai_refactored.py
+    pip install -r requirements.txt    # neat-python >= 1.0, numpy, keyboard
+    python gd_neat_ai.py               # entrenar
+    python gd_neat_ai.py play          # jugar con winner_genome.pkl
 
 Continuar desde checkpoint:
-    Descomentar líneas 289-299 y cambiar el número de generación
+    RESUME_FROM = "latest" retoma la última generación de CHECKPOINT_DIR;
+    también acepta un directorio de checkpoints o un checkpoint_gen_N.pkl
 ================================================================================
 """
 
 import neat
 import time
-import keyboard
 import os
 import sys
 import random
-from dataclasses import dataclass
-from typing import Optional, Tuple
-from enum import Enum
+import threading
+from typing import Optional
+
+from gd_common import EvaluationBackend, NUM_INPUTS, distance_fitness
+from gd_latency import FrameStats
+from gd_live import AttemptTimeout, GameInstance, LevelSession
+from gd_memo import FitnessCache
+from gd_metrics import MetricsWriter
+from gd_racing import RaceTracker
 
 # ============================================================================
 # CONFIGURACIÓN
 # ============================================================================
 LOG_PATH = r"D:\SteamLibrary\steamapps\common\Geometry Dash\geode\logs\gd_ai_log_temp.log"
+RING_PATH = r"D:\SteamLibrary\steamapps\common\Geometry Dash\geode\logs\gd_ai_ring.bin"
+TRANSPORT = "text"  # "text" (log) o "ring" (requiere activar 'ring-buffer' en el mod)
 GENERATIONS = 300
 
-IMMUNITY_WINDOW = 0.2
-STUCK_THRESHOLD = 150
-READ_RETRY_DELAY = 0.0005
+# Checkpoints incrementales (gd_checkpoint): se guardan los CHECKPOINT_KEEP
+# más recientes y uno cada CHECKPOINT_KEEP_EVERY generaciones.
+# RESUME_FROM: "latest" (última de CHECKPOINT_DIR, si hay), None (población
+# nueva) o la ruta de un directorio de checkpoints / checkpoint_gen_N.pkl
+CHECKPOINT_DIR = 'checkpoints'
+CHECKPOINT_KEEP = 5
+CHECKPOINT_KEEP_EVERY = 25
+RESUME_FROM = "latest"
+# Sin checkpoint: población inicial preentrenada imitando estas trazas
+# (gd_warmstart), p. ej. "traces/*.npz". None = población aleatoria
+WARM_START_TRACES = None
+
+# Métricas en streaming (gd_metrics): un registro JSONL por intento, por
+# genoma y por generación, escrito cada METRICS_FLUSH_EVERY registros.
+# None = desactivado
+METRICS_PATH = 'metrics.jsonl'
+METRICS_FLUSH_EVERY = 50
+
+# Varias instancias del juego a la vez (gd_instances): cada una con su log/ring
+# (la carpeta geode/logs de su instalación) y el título de su ventana para
+# enviarle las teclas. Vacío = una sola instancia con LOG_PATH/RING_PATH/
+# TRANSPORT y el teclado global. Ejemplo:
+#   {'name': 'gd1', 'log_path': r"C:\GD1\geode\logs\gd_ai_log_temp.log",
+#    'window': "Geometry Dash"}
+INSTANCES: list[dict] = []
+
+# Evaluación: "game" (juego real), "sim" (todo en gd_sim) o "prescreen"
+# (se simula a todos y solo la mejor fracción juega en el cliente real)
+EVAL_MODE = "game"
+SIM_LEVEL_PATH = None  # nivel ASCII para gd_sim; None = DEMO_LEVEL
+PRESCREEN_FRACTION = 0.3
+EVAL_WORKERS = 1  # procesos para la simulación (0 = todos los núcleos)
+
+# Grabación de intentos en vivo (gd_trace): carpeta de trazas .npz, None = no grabar
+TRACE_DIR = None
+# Latencia por frame (gd_latency): resumen por intento y reporte por generación
+LATENCY_STATS = True
+
+# Racing (gd_racing): cortar los intentos que ya no pueden alcanzar a la
+# RACING_ELITES-ésima mejor curva progreso-vs-tiempo. Una fracción
+# RACING_AUDIT de los cortes se juega igual para medir su impacto
+RACING = False
+RACING_ELITES = 3
+RACING_SLACK = 1.2
+RACING_GRACE = 1.0
+RACING_AUDIT = 0.1
+
+# Caché de fitness por red expresada (gd_memo): los genomas cuya red podada
+# ya se jugó no vuelven al juego. FITNESS_CACHE_QUANTUM redondea pesos y
+# bias para la clave (None = exacta)
+FITNESS_CACHE = True
+FITNESS_CACHE_SIZE = 2000
+FITNESS_CACHE_QUANTUM = None
+
+# Handshake de reinicio: tras pulsar 'r' se espera SESSION_START|id y el
+# primer frame; si no llega en RESET_TIMEOUT se vuelve a pulsar
+RESET_TIMEOUT = 0.5
+RESET_RETRIES = 3
+# Segundos sin datos del juego antes de abandonar el intento (AttemptTimeout)
+STALL_TIMEOUT = 5.0
+
+# Control: el salto se envía solo al cambiar; tiempos mínimos (s) antes de
+# soltar o volver a presionar (0 = sin límite)
+MIN_HOLD_TIME = 0.0
+MIN_RELEASE_TIME = 0.0
+
+# STUCK_THRESHOLD, NUM_INPUTS y MATRIX_SIZE están en gd_common (los usa gd_sim);
+# IMMUNITY_WINDOW y los tiempos de lectura del log, en gd_live
 
 # ============================================================================
-# ESTRUCTURAS DE DATOS
+# INSTANCIAS DEL JUEGO
 # ============================================================================
-class EventType(Enum):
-    NONE = 0
-    STATE = 1
-    DEATH = 2
-    WIN = 3
-
-@dataclass
-class GameState:
-    x: float
-    y: float
-    vely: float
-    ground: bool
-    matrix: list[float]
-    timestamp: float
-
-class SafeLogReader:
-    """Lee el log con detección de cambios por mtime."""
-    
-    def __init__(self, filepath: str):
-        self.filepath = filepath
-        self._last_content = ""
-        self._last_mtime = 0.0
-        
-    def read_raw(self) -> Optional[str]:
-        if not os.path.exists(self.filepath):
-            return None
-        
-        try:
-            current_mtime = os.path.getmtime(self.filepath)
-            if current_mtime == self._last_mtime:
-                return None
-            
-            self._last_mtime = current_mtime
-            
-            for attempt in range(3):
-                try:
-                    with open(self.filepath, 'r', encoding='utf-8') as f:
-                        lines = f.readlines()
-                    
-                    if not lines:
-                        return None
-                    
-                    content = lines[-1].strip()
-                    
-                    if content != self._last_content:
-                        self._last_content = content
-                        return content
-                    
-                    return None
-                    
-                except (PermissionError, OSError):
-                    if attempt < 2:
-                        time.sleep(READ_RETRY_DELAY)
-                    continue
-                    
-        except:
-            return None
-            
-        return None
-
-class GameStateParser:
-    """Parsea el protocolo del log: STATE|X|Y|Vel|G|Matrix o DEATH/WIN."""
-    
-    @staticmethod
-    def parse(line: str) -> Tuple[EventType, Optional[GameState]]:
-        if not line:
-            return EventType.NONE, None
-        
-        if line == 'DEATH':
-            return EventType.DEATH, None
-        elif line == 'WIN':
-            return EventType.WIN, None
-        
-        parts = line.split('|')
-        if parts[0] == 'STATE' and len(parts) >= 6:
-            try:
-                state = GameState(
-                    x=float(parts[1]),
-                    y=float(parts[2]),
-                    vely=float(parts[3]),
-                    ground=int(parts[4]) == 1,
-                    matrix=[float(v) for v in parts[5].strip(',').split(',') if v],
-                    timestamp=time.time()
-                )
-                return EventType.STATE, state
-                
-            except (ValueError, IndexError):
-                return EventType.NONE, None
-        
-        return EventType.NONE, None
+def create_transport():
+    """Devuelve (reader, parser) de la instancia por defecto según TRANSPORT."""
+    return default_instance().create_transport()
+
+_default_instance = None
+
+def default_instance() -> GameInstance:
+    """Instancia única configurada con LOG_PATH/RING_PATH/TRANSPORT."""
+    global _default_instance
+    if _default_instance is None:
+        _default_instance = GameInstance("gd", LOG_PATH, RING_PATH, TRANSPORT,
+                                         min_hold=MIN_HOLD_TIME, min_release=MIN_RELEASE_TIME)
+    return _default_instance
+
+def load_instances() -> list[GameInstance]:
+    """Instancias de INSTANCES, o la instancia por defecto si está vacío."""
+    if not INSTANCES:
+        return [default_instance()]
+    return [GameInstance(**{'min_hold': MIN_HOLD_TIME, 'min_release': MIN_RELEASE_TIME, **spec})
+            for spec in INSTANCES]
 
 # ============================================================================
-# LÓGICA DE SINCRONIZACIÓN
+# INTEGRACIÓN CON NEAT
 # ============================================================================
-class LevelSession:
-    """Maneja un intento de nivel con handshake y tracking."""
+class GameBackend(EvaluationBackend):
+    """Cliente real de Geometry Dash (teclado + log): uno a la vez, tiempo real."""
     
-    attempt_counter = 0  # Contador global de intentos
-    
-    def __init__(self, reader: SafeLogReader, parser: GameStateParser, genome_id: int):
-        self.reader = reader
-        self.parser = parser
-        self.genome_id = genome_id
-        
-        LevelSession.attempt_counter += 1
-        self.attempt_id = LevelSession.attempt_counter
-        
-        self.start_time = None
-        self.start_x = None
-        self.max_x = 0.0
-        self.frames_stuck = 0
-        
-    def wait_for_reset(self) -> bool:
-        """Espera spawn inmediato - sin detectar DEATH."""
-        
-        # Solo esperar a que X sea pequeño (jugador en spawn)
-        while True:
-            raw = self.reader.read_raw()
-            if raw:
-                event, state = self.parser.parse(raw)
-                
-                if event == EventType.STATE and state:
-                    if state.x <= 150:
-                        return True
-        
-        return True
+    name = "game"
     
-    def run(self, net: neat.nn.FeedForwardNetwork) -> float:
-        """Ejecuta un intento completo del nivel."""
-        self.start_time = time.time()
-        death_seen = False
-        valid_attempt = False
-        
-        while True:
-            raw = self.reader.read_raw()
-            if not raw:
-                continue
-            
-            event, state = self.parser.parse(raw)
-            elapsed = time.time() - self.start_time
-            
-            if event == EventType.DEATH:
-                if elapsed < IMMUNITY_WINDOW:
-                    continue
-                death_seen = True
-                break
-            
-            if event == EventType.WIN:
-                self.max_x += 50000
-                valid_attempt = True
-                break
-            
-            if event == EventType.STATE and state:
-                # Marcar que empezamos a recibir datos válidos
-                if not valid_attempt and state.x > 10:
-                    valid_attempt = True
-                
-                if self.start_x is None:
-                    self.start_x = state.x
-                    self.max_x = state.x
-                
-                if state.x > self.max_x + 0.5:
-                    self.max_x = state.x
-                    self.frames_stuck = 0
-                else:
-                    self.frames_stuck += 1
-                
-                if self.frames_stuck > STUCK_THRESHOLD:
-                    valid_attempt = True
-                    break
-                
-                inputs = self._build_inputs(state)
-                output = net.activate(inputs)
-                
-                if output[0] > 0.5:
-                    keyboard.press('space')
-                else:
-                    keyboard.release('space')
-        
-        keyboard.release('space')
-        
-        # Solo esperar si fue un intento válido y murió
-        if death_seen and valid_attempt:
-            time.sleep(0.08)
-        
-        if self.start_x is None or not valid_attempt:
+    def evaluate(self, genome_id: int, genome: neat.DefaultGenome,
+                 config: neat.Config) -> float:
+        net = neat.nn.FeedForwardNetwork.create(genome, config)
+        try:
+            return run_attempt(net, genome_id)
+        except AttemptTimeout as e:
+            sys.stdout.write(f"❌ {e} ")
             return 0.0
-        
-        distance = self.max_x - self.start_x
-        percentage = min((distance / 10000.0) * 100, 100)
-        fitness = (distance * distance) / 100.0
-        
-        sys.stdout.write(f"D:{distance:.0f}({percentage:.1f}%) ")
-        sys.stdout.flush()
-        
-        return fitness
-    
-    def _build_inputs(self, state: GameState) -> list[float]:
-        """Construye vector de 19 inputs: 4 físicos + 15 de visión."""
-        inputs = []
-        
-        inputs.append((state.y - 105.0) / 100.0)
-        inputs.append(state.vely / 20.0)
-        inputs.append(1.0 if state.ground else 0.0)
-        inputs.append(1.0)
-        
-        matrix = state.matrix[:15]
-        while len(matrix) < 15:
-            matrix.append(0.0)
-        
-        inputs.extend(matrix)
-        
-        return inputs
 
-# ============================================================================
-# INTEGRACIÓN CON NEAT
-# ============================================================================
+GAME_BACKEND = GameBackend()
+
 def evaluate_genome(genome_id: int, genome: neat.DefaultGenome, 
-                   config: neat.Config) -> float:
-    """Evalúa un genoma ejecutando un intento en el nivel."""
+                   config: neat.Config,
+                   backend: Optional[EvaluationBackend] = None) -> float:
+    """Evalúa un genoma con el backend indicado (por defecto, el juego real)."""
+    return (backend or GAME_BACKEND).evaluate(genome_id, genome, config)
+
+# Latencias de los intentos en vivo de la generación en curso
+generation_latency = FrameStats(attempts=0)
+_latency_lock = threading.Lock()
+
+# Curvas élite y estadísticas del racing (se conservan entre generaciones)
+race_tracker = RaceTracker(RACING_ELITES, RACING_SLACK, RACING_GRACE, RACING_AUDIT)
+
+# Archivo de métricas del entrenamiento en curso (lo abre run())
+metrics: Optional[MetricsWriter] = None
+
+# Origen de la fitness de cada genoma de la generación: game, cache o sim
+evaluation_sources: dict[int, str] = {}
+
+# Genomas de la generación cuyo intento cortó el racing (fitness = cota inferior)
+aborted_genomes: set[int] = set()
+
+# Fitness de las redes ya jugadas en el cliente real (se guarda en el checkpoint)
+fitness_cache = FitnessCache(FITNESS_CACHE_SIZE, FITNESS_CACHE_QUANTUM)
+
+def run_attempt(net, genome_id: int, instance: Optional[GameInstance] = None) -> float:
+    """Reinicia el nivel y juega un intento con `net` (cualquier objeto con .activate).
+    
+    Lanza ``AttemptTimeout`` si el nivel no se reinicia o el juego deja de
+    enviar frames.
+    """
+    instance = instance or default_instance()
+    reader, parser = instance.create_transport()
     
-    net = neat.nn.FeedForwardNetwork.create(genome, config)
-    reader = SafeLogReader(LOG_PATH)
-    parser = GameStateParser()
+    # Descartar las líneas del intento anterior antes de reiniciar
+    reader.skip_to_end()
     
-    # Reiniciar nivel
-    keyboard.release('space')
-    keyboard.press_and_release('r')
-    time.sleep(0.05)
+    recorder = None
+    if TRACE_DIR:
+        from gd_trace import TraceRecorder
+        recorder = TraceRecorder(genome_id, source=instance.transport)
     
-    # Limpiar caché del reader para evitar datos viejos
-    reader._last_content = ""
-    reader._last_mtime = 0.0
+    stats = FrameStats() if LATENCY_STATS else None
+    racer = race_tracker.start() if RACING else None
+    session = LevelSession(reader, parser, genome_id,
+                           controller=instance.create_controller(),
+                           recorder=recorder, stats=stats,
+                           previous_session_id=instance.last_session_id,
+                           racer=racer)
     
-    session = LevelSession(reader, parser, genome_id)
+    try:
+        # Reiniciar nivel y empezar en cuanto llegue el primer frame del intento nuevo
+        for retry in range(RESET_RETRIES + 1):
+            session.controller.restart()
+            if session.wait_for_reset(RESET_TIMEOUT):
+                break
+            if retry < RESET_RETRIES:
+                sys.stdout.write("⏳ sin SESSION_START, reintentando ")
+                sys.stdout.flush()
+        else:
+            raise AttemptTimeout(f"{instance.name}: el nivel no se reinició")
+        
+        run_start = time.perf_counter()
+        fitness = session.run(net, STALL_TIMEOUT)
+        run_time = time.perf_counter() - run_start
+    finally:
+        reader.close()
+        if session.session_id is not None:
+            instance.last_session_id = session.session_id
     
-    if not session.wait_for_reset():
-        return 0.0
+    if racer is not None:
+        race_tracker.finish(racer, session.distance, session.duration, session.aborted,
+                            distance_fitness)
+    if session.aborted:
+        aborted_genomes.add(genome_id)
     
-    fitness = session.run(net)
+    controller = session.controller
+    if metrics is not None:
+        record = dict(genome=genome_id, instance=instance.name, fitness=round(fitness, 2),
+                      distance=round(session.distance, 1), time=round(run_time, 3),
+                      events=controller.event_count, decisions=controller.decision_count,
+                      aborted=session.aborted)
+        if stats is not None:
+            record.update(frames=stats.frames, dropped=stats.dropped, skipped=stats.skipped,
+                          read_p50=round(stats.read.percentile(50) / 1000, 1),
+                          ai_p50=round(stats.ai_p50_us(), 1))
+        metrics.write('attempt', **record)
+    
+    sys.stdout.write(f"⌨ {controller.event_count}/{controller.decision_count} "
+                     f"({controller.action_rate(run_time):.1f}/s) ")
+    
+    if recorder is not None:
+        recorder.save(TRACE_DIR, session.attempt_id, fitness)
+    
+    if stats is not None:
+        with _latency_lock:
+            generation_latency.merge(stats)
+        if stats.frames:
+            sys.stdout.write(f"{stats.short()} ")
+            sys.stdout.flush()
     
     return fitness
 
 def eval_genomes(genomes, config):
     """Callback NEAT para evaluar generación."""
-    for genome_id, genome in genomes:
-        sys.stdout.write(f"G{genome_id:2d}:")
-        genome.fitness = evaluate_genome(genome_id, genome, config)
+    genomes = list(genomes)
+    to_play = genomes
+    
+    if EVAL_MODE in ("sim", "prescreen"):
+        to_play = simulate_genomes(genomes, config)
+    
+    pending = to_play
+    if FITNESS_CACHE and to_play:
+        pending = fitness_cache.lookup(to_play, config)
+        if len(pending) < len(to_play):
+            print(f"♻ {len(to_play) - len(pending)} genomas con fitness en caché")
+    
+    evaluation_sources.clear()
+    evaluation_sources.update((genome_id, "sim") for genome_id, _ in genomes)
+    evaluation_sources.update((genome_id, "cache") for genome_id, _ in to_play)
+    evaluation_sources.update((genome_id, "game") for genome_id, _ in pending)
+    aborted_genomes.clear()
+    
+    play_genomes(pending, config)
+    
+    if FITNESS_CACHE:
+        # Un intento cortado solo da una cota: no se guarda y sus duplicados
+        # juegan su propio intento
+        unresolved = fitness_cache.update(pending, aborted_genomes)
+        if unresolved:
+            evaluation_sources.update((genome_id, "game") for genome_id, _ in unresolved)
+            play_genomes(unresolved, config)
+    
+    if not to_play:
+        return
     
     print()
+    
+    if EVAL_MODE == "prescreen":
+        # Los descartados nunca superan a un genoma evaluado en el juego real
+        floor = min(genome.fitness for _, genome in to_play)
+        played = {genome_id for genome_id, _ in to_play}
+        for genome_id, genome in genomes:
+            if genome_id not in played:
+                genome.fitness = min(genome.fitness, floor)
+
+def play_genomes(genomes, config):
+    """Juega ``genomes`` en el cliente real y asigna su fitness."""
+    if INSTANCES:
+        # Clientes configurados (uno o varios): cada genoma va a la primera
+        # instancia libre, con su log/ring, transporte y ventana
+        fitnesses = get_instance_scheduler().evaluate(genomes, config)
+        for (_, genome), fitness in zip(genomes, fitnesses):
+            genome.fitness = fitness
+    else:
+        for genome_id, genome in genomes:
+            sys.stdout.write(f"G{genome_id:2d}:")
+            genome.fitness = evaluate_genome(genome_id, genome, config)
+
+def simulate_genomes(genomes, config) -> list:
+    """Evalúa todos en gd_sim y devuelve los que todavía deben ir al juego real.
+    
+    En "sim" no queda ninguno; en "prescreen" pasa la mejor PRESCREEN_FRACTION.
+    Con EVAL_WORKERS != 1 la simulación se reparte en procesos (gd_parallel).
+    """
+    evaluator = get_sim_evaluator()
+    
+    for (genome_id, genome), fitness in zip(genomes, evaluator.evaluate(genomes, config)):
+        genome.fitness = fitness
+    
+    ranked = sorted(genomes, key=lambda item: item[1].fitness, reverse=True)
+    best_distance = (ranked[0][1].fitness * 100) ** 0.5
+    
+    if EVAL_MODE == "sim":
+        print(f"🧪 Sim: mejor {best_distance:.0f}u")
+        return []
+    
+    keep = max(1, int(len(ranked) * PRESCREEN_FRACTION))
+    print(f"🧪 Sim: mejor {best_distance:.0f}u → {keep} al juego")
+    return ranked[:keep]
+
+_instance_scheduler = None
+
+def get_instance_scheduler():
+    """Planificador de INSTANCES (gd_instances), creado una vez."""
+    global _instance_scheduler
+    if _instance_scheduler is None:
+        from gd_instances import InstanceScheduler
+        _instance_scheduler = InstanceScheduler(load_instances(), run_attempt)
+    return _instance_scheduler
+
+_sim_evaluator = None
+
+def get_sim_evaluator():
+    """Evaluador del simulador, creado una vez y reutilizado entre generaciones."""
+    global _sim_evaluator
+    
+    if _sim_evaluator is None:
+        from functools import partial
+        from gd_parallel import ParallelEvaluator, SerialEvaluator
+        from gd_sim import SimBackend
+        
+        factory = partial(SimBackend, SIM_LEVEL_PATH)
+        if EVAL_WORKERS == 1:
+            _sim_evaluator = SerialEvaluator(factory)
+        else:
+            _sim_evaluator = ParallelEvaluator(factory, EVAL_WORKERS or None)
+    
+    return _sim_evaluator
 
 class GenerationReporter(neat.reporting.BaseReporter):
-    """Reporter para checkpoint por generación."""
+    """Reporter por generación: resumen, reportes y checkpoint (``store``)."""
     
-    def __init__(self):
+    def __init__(self, store=None, best_genome=None):
+        self.store = store
         self.generation = 0
+        self.best_genome = best_genome
+        self.generation_start = time.time()
+    
+    def start_generation(self, generation):
+        self.generation = generation + 1
+        self.generation_start = time.time()
     
     def post_evaluate(self, config, population, species, best_genome):
-        self.generation += 1
-        
         best_distance = (best_genome.fitness * 100) ** 0.5
         best_percentage = min((best_distance / 10000.0) * 100, 100)
         
-        import pickle
-        filename = f'checkpoint_gen_{self.generation}.pkl'
-        
-        with open(filename, 'wb') as f:
-            data = {
-                'generation': self.generation,
-                'population': population,
-                'species_set': species,
-                'rndstate': random.getstate(),
-                'best_genome': best_genome,
-                'best_fitness': best_genome.fitness,
-                'best_distance': best_distance,
-                'best_percentage': best_percentage
-            }
-            pickle.dump(data, f)
+        if self.best_genome is None or best_genome.fitness > self.best_genome.fitness:
+            self.best_genome = best_genome
         
         print(f"💾 Gen{self.generation} → Best:{best_distance:.0f}u ({best_percentage:.1f}%) Fit:{best_genome.fitness:.0f}")
+        
+        if metrics is not None:
+            self._write_metrics(population, species, best_genome, best_distance)
+        
+        global generation_latency
+        if generation_latency.frames:
+            print(generation_latency.report(f"⏱ Gen{self.generation} latencia"))
+        generation_latency = FrameStats(attempts=0)
+        
+        if RACING:
+            print(race_tracker.report(f"🏁 Gen{self.generation} racing"))
+            race_tracker.next_generation()
+        
+        if FITNESS_CACHE:
+            print(fitness_cache.report(f"♻ Gen{self.generation} caché"))
+            fitness_cache.next_generation()
+    
+    def _write_metrics(self, population, species, best_genome, best_distance):
+        fitnesses = [g.fitness for g in population.values() if g.fitness is not None]
+        for genome_id, genome in population.items():
+            if genome.fitness is None:
+                continue
+            metrics.write('genome', gen=self.generation, genome=genome_id,
+                          fitness=round(genome.fitness, 2),
+                          distance=round((max(genome.fitness, 0.0) * 100) ** 0.5, 1),
+                          species=species.get_species_id(genome_id),
+                          nodes=len(genome.nodes), connections=len(genome.connections),
+                          source=evaluation_sources.get(genome_id, "game"))
+        
+        mean = sum(fitnesses) / len(fitnesses)
+        record = dict(gen=self.generation, wall=round(time.time() - self.generation_start, 2),
+                      best=round(best_genome.fitness, 2), mean=round(mean, 2),
+                      std=round((sum((f - mean) ** 2 for f in fitnesses) / len(fitnesses)) ** 0.5, 2),
+                      best_distance=round(best_distance, 1), best_genome=best_genome.key,
+                      species=len(species.species),
+                      species_sizes={str(k): len(s.members) for k, s in species.species.items()},
+                      played=sum(1 for v in evaluation_sources.values() if v == "game"))
+        if FITNESS_CACHE:
+            record['cache_hits'] = fitness_cache.generation_hits
+        if RACING:
+            record['aborted'] = race_tracker.aborted
+        if generation_latency.frames:
+            record.update(frames=generation_latency.frames, dropped=generation_latency.dropped,
+                          read_p50=round(generation_latency.read.percentile(50) / 1000, 1),
+                          read_p99=round(generation_latency.read.percentile(99) / 1000, 1),
+                          ai_p50=round(generation_latency.ai_p50_us(), 1))
+        metrics.write('generation', **record)
+        metrics.flush()
+    
+    def end_generation(self, config, population, species_set):
+        # Estado de la generación siguiente, ya reproducida: se retoma sin reevaluar
+        if self.store is not None:
+            self.store.save(self.generation, config, population, species_set, self.best_genome,
+                            {'fitness_cache': fitness_cache.state()})
+
+def resume_population(config: neat.Config) -> neat.Population:
+    """Población desde RESUME_FROM; si no hay checkpoint, una nueva (o
+    preentrenada con WARM_START_TRACES)."""
+    from gd_checkpoint import load_population
+    
+    if RESUME_FROM is not None:
+        source = CHECKPOINT_DIR if RESUME_FROM == "latest" else RESUME_FROM
+        p, state = load_population(config, source)
+        if p is not None:
+            if 'fitness_cache' in state:
+                fitness_cache.load(state['fitness_cache'])
+            print(f"🔄 Continuando desde Gen {p.generation} ({source})")
+            return p
+        if RESUME_FROM != "latest":
+            print(f"⚠ Checkpoint no encontrado: {source}")
+    
+    if WARM_START_TRACES:
+        import glob
+        from gd_warmstart import warm_start_from_traces
+        
+        paths = sorted(glob.glob(WARM_START_TRACES))
+        if paths:
+            p, scores = warm_start_from_traces(config, paths)
+            print(f"🎓 Población inicial imitando {len(paths)} trazas: exactitud "
+                  f"media {scores.mean():.0%}, mejor {scores.max():.0%}")
+            return p
+        print(f"⚠ Sin trazas en {WARM_START_TRACES}: población aleatoria")
+    
+    return neat.Population(config)
 
 # ============================================================================
 # MAIN
 # ============================================================================
 def run():
+    global metrics
     sys.stdout.reconfigure(encoding='utf-8')
     
-    if not os.path.exists(LOG_PATH):
-        print(f"❌ Log no encontrado: {LOG_PATH}")
-        return
+    instances = load_instances()
+    for instance in instances:
+        if not os.path.exists(instance.source_path):
+            print(f"❌ Log no encontrado: {instance.source_path}")
+            return
     
     local_dir = os.path.dirname(__file__)
     config_path = os.path.join(local_dir, 'config.txt')
@@ -359,37 +512,33 @@ def run():
         config_path
     )
     
-    # ========================================================================
-    # CONTINUAR DESDE CHECKPOINT
-    # ========================================================================
-    checkpoint_file = 'checkpoint_gen_1.pkl'
-    import pickle
-    with open(checkpoint_file, 'rb') as f:
-        data = pickle.load(f)
-        p = neat.Population(config)
-        p.population = data['population']
-        p.species = data['species_set']
-        random.setstate(data['rndstate'])
-        p.generation = data['generation']
-        print(f"🔄 Continuando desde Gen {p.generation}")
-    # ========================================================================
-    
-    # CREAR POBLACIÓN NUEVA (comentar si usas checkpoint)
-    # p = neat.Population(config)
+    from gd_checkpoint import CheckpointStore
+    
+    p = resume_population(config)
+    store = CheckpointStore(CHECKPOINT_DIR, CHECKPOINT_KEEP, CHECKPOINT_KEEP_EVERY)
     
     p.add_reporter(neat.StdOutReporter(True))
-    p.add_reporter(neat.StatisticsReporter())
-    p.add_reporter(GenerationReporter())
+    if METRICS_PATH:
+        metrics = MetricsWriter(METRICS_PATH, METRICS_FLUSH_EVERY)
+    p.add_reporter(GenerationReporter(store, p.best_genome))
     
     print("="*60)
     print(" 🎮 GEOMETRY DASH NEAT AI")
     print("="*60)
-    print(f" 📁 Log: {os.path.basename(LOG_PATH)}")
+    for instance in instances:
+        print(f" 📁 {instance.name}: {os.path.basename(instance.source_path)} ({instance.transport})")
     print(f" 🧬 Generaciones: {GENERATIONS}")
     print(f" 👥 Población: {config.pop_size}")
     print("="*60 + "\n")
     
-    winner = p.run(eval_genomes, GENERATIONS)
+    try:
+        winner = p.run(eval_genomes, GENERATIONS)
+    finally:
+        store.close()
+        if _instance_scheduler is not None:
+            _instance_scheduler.close()
+        if metrics is not None:
+            metrics.close()
     
     import pickle
     winner_path = 'winner_genome.pkl'
@@ -411,5 +560,77 @@ def run():
     print(f" 🏆 {winner_distance:.0f}u ({winner_percentage:.1f}%) Fit:{winner.fitness:.0f}")
     print("="*60 + "\n")
 
+def play(winner_path: str = 'winner_genome.pkl', attempts: int = 0):
+    """Solo inferencia: juega con el genoma ganador usando su función generada."""
+    from gd_compiled import load_generated
+    import pickle
+    
+    sys.stdout.reconfigure(encoding='utf-8')
+    
+    if not os.path.exists(winner_path):
+        print(f"❌ Genoma no encontrado: {winner_path}")
+        return
+    
+    local_dir = os.path.dirname(os.path.abspath(__file__))
+    config = neat.Config(
+        neat.DefaultGenome, 
+        neat.DefaultReproduction,
+        neat.DefaultSpeciesSet, 
+        neat.DefaultStagnation,
+        os.path.join(local_dir, 'config.txt')
+    )
+    
+    with open(winner_path, 'rb') as f:
+        genome = pickle.load(f)['genome']
+    
+    # Primera instancia de INSTANCES (o la de LOG_PATH/RING_PATH si está vacío)
+    instance = load_instances()[0]
+    
+    net = load_generated(genome, config, os.path.join(local_dir, 'compiled_nets'))
+    generic = neat.nn.FeedForwardNetwork.create(genome, config)
+    
+    # Latencia de activación: genérica vs generada (mismos inputs)
+    rng = random.Random(0)
+    samples = [[rng.uniform(-1.0, 2.0) for _ in range(NUM_INPUTS)] for _ in range(2000)]
+    timings = {}
+    for name, activate in (('genérica', generic.activate), ('generada', net.activate)):
+        start = time.perf_counter()
+        for inputs in samples:
+            activate(inputs)
+        timings[name] = (time.perf_counter() - start) / len(samples) * 1e6
+    
+    print("="*60)
+    print(" 🎮 GEOMETRY DASH NEAT AI - PLAY")
+    print("="*60)
+    print(f" 🧬 Genoma: {genome.key} ({net.key[:12]})")
+    print(f" ⚡ Activación: genérica {timings['genérica']:.2f}µs → generada {timings['generada']:.2f}µs")
+    print("="*60 + "\n")
+    
+    attempt = 0
+    while attempts <= 0 or attempt < attempts:
+        attempt += 1
+        sys.stdout.write(f"#{attempt}: ")
+        try:
+            run_attempt(net, genome.key, instance)
+        except AttemptTimeout as e:
+            sys.stdout.write(f"❌ {e}")
+        print()
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Geometry Dash NEAT AI")
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('train', help="Entrenar (por defecto)")
+    play_parser = sub.add_parser('play', help="Jugar con el genoma ganador")
+    play_parser.add_argument('--winner', default='winner_genome.pkl')
+    play_parser.add_argument('--attempts', type=int, default=0, help="0 = infinito")
+    args = parser.parse_args()
+    
+    if args.command == 'play':
+        play(args.winner, args.attempts)
+    else:
+        run()
+
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Evaluación paralela de genomas
+================================================================================
+
+Descripción:
+    Reparte la evaluación de una generación entre procesos cuando el backend no
+    depende del cliente real (por ejemplo ``gd_sim.SimBackend``).
+
+    - SerialEvaluator: mismo contrato, en el proceso actual (referencia).
+    - ParallelEvaluator: ``ProcessPoolExecutor`` cuyo inicializador construye
+      el backend UNA vez por proceso (nivel cargado, caché de redes compiladas)
+      y lo reutiliza en todas las generaciones. Se usa en lugar de
+      ``neat.ParallelEvaluator`` porque ese crea la red en cada tarea y no
+      tiene estado por worker.
+
+    Con un backend determinista la fitness es idéntica a la serie: cada genoma
+    se evalúa con exactamente las mismas operaciones, solo cambia el proceso.
+================================================================================
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Estado caliente de cada proceso worker
+_worker_backend = None
+_worker_config = None
+
+
+def _init_worker(backend_factory, config):
+    global _worker_backend, _worker_config
+    _worker_backend = backend_factory()
+    _worker_config = config
+
+
+def _evaluate_chunk(chunk: list) -> list[float]:
+    return [_worker_backend.evaluate(genome_id, genome, _worker_config)
+            for genome_id, genome in chunk]
+
+
+class SerialEvaluator:
+    """Evalúa en el proceso actual con un único backend reutilizado."""
+
+    def __init__(self, backend_factory):
+        self.backend = backend_factory()
+
+    def evaluate(self, genomes, config) -> list[float]:
+        """Devuelve las fitness en el mismo orden que ``genomes``."""
+        return [self.backend.evaluate(genome_id, genome, config) for genome_id, genome in genomes]
+
+    def close(self):
+        self.backend.close()
+
+
+class ParallelEvaluator:
+    """Evalúa una generación en ``workers`` procesos con backend caliente por proceso.
+
+    ``backend_factory`` debe ser picklable (una clase o ``functools.partial``).
+    """
+
+    def __init__(self, backend_factory, workers: int = None, chunks_per_worker: int = 4):
+        self.backend_factory = backend_factory
+        self.workers = workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+        self._pool = None
+        self._config = None
+
+    def evaluate(self, genomes, config) -> list[float]:
+        """Devuelve las fitness en el mismo orden que ``genomes``."""
+        genomes = list(genomes)
+        if not genomes:
+            return []
+
+        if self._pool is None or config is not self._config:
+            self.close()
+            self._config = config
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.backend_factory, config)
+            )
+
+        # Trozos contiguos: menos pickling que una tarea por genoma y buen balanceo
+        size = max(1, -(-len(genomes) // (self.workers * self.chunks_per_worker)))
+        chunks = [genomes[i:i + size] for i in range(0, len(genomes), size)]
+
+        fitnesses = []
+        for result in self._pool.map(_evaluate_chunk, chunks):
+            fitnesses.extend(result)
+        return fitnesses
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,200 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Racing: cortar intentos que ya no pueden ganar
+================================================================================
+
+Descripción:
+    Compara la curva progreso-vs-tiempo de cada intento con las curvas de los
+    mejores intentos (élite) de la generación. La referencia es la k-ésima
+    élite: si ni avanzando a la máxima velocidad vista en las élites el
+    intento puede llegar a su distancia antes de ``slack`` veces su tiempo, el
+    intento es inútil y se corta.
+
+    La fitness del intento cortado es la de la distancia ya recorrida: una
+    cota inferior de la real y, por construcción, menor que la de la
+    referencia, así que el top-k de la generación no cambia.
+
+    Como el cubo avanza a velocidad constante mientras vive, en la práctica
+    esto detecta antes los intentos trabados (avanzan a saltitos y reinician
+    el contador de STUCK_THRESHOLD) y limita el tiempo de los que se quedan.
+
+    Impacto medido: una fracción ``audit`` de los intentos que se cortarían
+    juega igual hasta el final; el reporte por generación dice cuántos habrían
+    superado la referencia (cortes erróneos), cuánto de la fitness real
+    conserva la cota y el tiempo ahorrado estimado.
+================================================================================
+"""
+
+import random
+import threading
+from typing import Optional
+
+SAMPLE_INTERVAL = 0.1    # segundos entre muestras de la curva
+SPEED_MARGIN = 1.05      # margen sobre la velocidad máxima observada
+
+
+class ProgressCurve:
+    """Muestras (t, distancia) de un intento."""
+
+    __slots__ = ('times', 'distances', '_next_sample')
+
+    def __init__(self):
+        self.times: list[float] = []
+        self.distances: list[float] = []
+        self._next_sample = 0.0
+
+    def observe(self, t: float, distance: float):
+        if t >= self._next_sample:
+            self.times.append(t)
+            self.distances.append(distance)
+            self._next_sample = t + SAMPLE_INTERVAL
+
+    @property
+    def distance(self) -> float:
+        return self.distances[-1] if self.distances else 0.0
+
+    @property
+    def duration(self) -> float:
+        return self.times[-1] if self.times else 0.0
+
+    def max_speed(self) -> float:
+        best = 0.0
+        for i in range(1, len(self.times)):
+            dt = self.times[i] - self.times[i - 1]
+            if dt > 0:
+                best = max(best, (self.distances[i] - self.distances[i - 1]) / dt)
+        return best
+
+
+class Racer:
+    """Decide, para un intento en curso, si ya no puede alcanzar la referencia."""
+
+    __slots__ = ('curve', 'target', 'budget', 'speed', 'grace', 'audit', 'abort_at')
+
+    def __init__(self, target: float, budget: float, speed: float, grace: float,
+                 audit: bool):
+        self.curve = ProgressCurve()
+        self.target = target
+        self.budget = budget
+        self.speed = speed
+        self.grace = grace
+        self.audit = audit
+        self.abort_at: Optional[float] = None
+
+    def hopeless(self, t: float, distance: float) -> bool:
+        """Registra el progreso y devuelve True si hay que cortar el intento."""
+        self.curve.observe(t, distance)
+
+        if self.abort_at is not None or self.speed <= 0.0 or t < self.grace:
+            return False
+
+        reachable = distance + self.speed * max(0.0, self.budget - t)
+        if reachable >= self.target:
+            return False
+
+        self.abort_at = t
+        # En auditoría se deja terminar para medir la fitness real
+        return not self.audit
+
+
+class RaceTracker:
+    """Curvas élite de la generación y estadísticas del impacto del racing."""
+
+    def __init__(self, elites: int = 3, slack: float = 1.2, grace: float = 1.0,
+                 audit: float = 0.1, seed: Optional[int] = None):
+        self.elites = elites
+        self.slack = slack
+        self.grace = grace
+        self.audit = audit
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._curves: list[ProgressCurve] = []
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.attempts = 0
+        self.aborted = 0
+        self.played_time = 0.0
+        self.audited = 0
+        self.false_aborts = 0
+        self.saved_time = 0.0       # tiempo que se habría jugado de más (auditoría)
+        self.bound_ratio = 0.0      # suma de fitness cota / fitness real (auditoría)
+
+    def start(self) -> Racer:
+        """Racer para un intento nuevo (sin cortes mientras no haya k élites)."""
+        with self._lock:
+            if len(self._curves) < self.elites:
+                return Racer(0.0, 0.0, 0.0, self.grace, False)
+            reference = self._curves[self.elites - 1]
+            speed = max(curve.max_speed() for curve in self._curves) * SPEED_MARGIN
+            return Racer(reference.distance, reference.duration * self.slack, speed,
+                         self.grace, self._rng.random() < self.audit)
+
+    def finish(self, racer: Racer, distance: float, duration: float, aborted: bool,
+               fitness_fn=None):
+        """Registra el intento terminado y, si fue completo, lo suma a las élites."""
+        with self._lock:
+            self.attempts += 1
+            self.played_time += duration
+
+            if aborted:
+                self.aborted += 1
+                return
+
+            if racer.audit and racer.abort_at is not None:
+                self.audited += 1
+                self.saved_time += duration - racer.abort_at
+                if distance >= racer.target:
+                    self.false_aborts += 1
+                if fitness_fn is not None:
+                    real = fitness_fn(distance)
+                    bound = fitness_fn(_distance_at(racer.curve, racer.abort_at))
+                    self.bound_ratio += bound / real if real > 0 else 1.0
+
+            racer.curve.times.append(duration)
+            racer.curve.distances.append(distance)
+            self._add_curve(racer.curve)
+
+    def _add_curve(self, curve: ProgressCurve):
+        if not curve.times:
+            return
+        self._curves.append(curve)
+        self._curves.sort(key=lambda c: c.distance, reverse=True)
+        del self._curves[self.elites:]
+
+    def next_generation(self):
+        """Descarta las élites y reinicia las estadísticas.
+
+        Las curvas de la generación anterior son de otras redes: la referencia
+        se reconstruye con los primeros intentos completos de la nueva.
+        """
+        with self._lock:
+            self._curves = []
+            self._reset_stats()
+
+    def report(self, title: str) -> str:
+        if not self.attempts:
+            return f"{title}: sin intentos"
+
+        lines = [f"{title}: {self.aborted}/{self.attempts} cortados, "
+                 f"{self.played_time:.0f}s jugados"]
+        if self.audited:
+            mean_saved = self.saved_time / self.audited
+            lines.append(f"   auditoría {self.audited}: {self.false_aborts} habrían superado la "
+                         f"referencia, la cota conserva {self.bound_ratio / self.audited:.0%} "
+                         f"de la fitness real, ahorro ≈{mean_saved:.1f}s por corte "
+                         f"(≈{mean_saved * self.aborted:.0f}s en la generación)")
+        if self._curves:
+            reference = self._curves[-1]
+            lines.append(f"   referencia: {reference.distance:.0f}u en {reference.duration:.1f}s "
+                         f"(top {len(self._curves)})")
+        return "\n".join(lines)
+
+
+def _distance_at(curve: ProgressCurve, t: float) -> float:
+    distance = 0.0
+    for sample_t, sample_d in zip(curve.times, curve.distances):
+        if sample_t > t:
+            break
+        distance = sample_d
+    return distance
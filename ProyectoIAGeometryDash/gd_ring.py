@@ -0,0 +1,250 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Transporte binario por buffer circular (mmap)
+================================================================================
+
+Descripción:
+    Alternativa opcional al log de texto. El mod escribe registros binarios de
+    tamaño fijo en un archivo mapeado en memoria (gd_ai_ring.bin) y Python los
+    decodifica directamente desde el mapa con ``struct.unpack_from``, sin
+    formatear ni partir strings.
+
+Formato (little-endian, sin padding, igual que ``RingHeader``/``RingRecord``
+en main.cpp):
+    Cabecera (64 bytes):
+        magic 'GDRB' | version u32 | record_size u32 | capacity u32 |
+        write_seq u64 (último registro publicado) | reservado
+    Registro (52 bytes), slot = (seq - 1) % capacity:
+        seq u64 | kind u32 | x f32 | y f32 | vely f32 | ground u8 | matrix 15 x u8 |
+        frame u32 | t_us u64 (contador de STATE e instante de emisión, µs desde epoch)
+    En SESSION_START el campo x lleva el id de intento.
+
+Protocolo:
+    El escritor pone seq=0 en el slot, escribe los datos, publica el seq del
+    registro y por último actualiza write_seq. El lector copia el registro y
+    vuelve a leer seq: si cambió, el escritor lo pisó mientras se leía y el
+    registro se cuenta como perdido. Si el lector se atrasa más de
+    ``capacity`` registros, salta a los más recientes (también se cuentan).
+================================================================================
+"""
+
+import mmap
+import os
+import struct
+import time
+from collections import deque
+from typing import Optional
+
+from gd_watch import PollingWatcher
+
+# ============================================================================
+# FORMATO
+# ============================================================================
+RING_MAGIC = b'GDRB'
+RING_VERSION = 2
+RING_CAPACITY = 4096
+
+KIND_STATE = 1
+KIND_DEATH = 2
+KIND_WIN = 3
+KIND_SESSION_START = 4
+
+HEADER = struct.Struct('<4sIIIQ40x')
+RECORD = struct.Struct('<QIfffB15BIQ')
+SEQ = struct.Struct('<Q')
+
+WRITE_SEQ_OFFSET = 16
+
+
+def ring_file_size(capacity: int) -> int:
+    return HEADER.size + capacity * RECORD.size
+
+
+class RingBufferReader:
+    """Lee registros del buffer circular con la misma interfaz que SafeLogReader.
+
+    ``read_raw``/``read_lines`` devuelven tuplas ya decodificadas
+    ``(seq, kind, x, y, vely, ground, m0..m14, frame, t_us)`` en orden de secuencia.
+
+    Las escrituras por mmap no generan eventos de inotify, por eso la espera
+    siempre es por sondeo adaptativo.
+    """
+
+    def __init__(self, filepath: str, watcher=None):
+        self.filepath = filepath
+        self._file = None
+        self._map = None
+        self._capacity = 0
+        self._next_seq = 1
+        self._pending: deque[tuple] = deque()
+        self._watcher = watcher if watcher is not None else PollingWatcher(filepath)
+        self.dropped = 0
+
+    def read_raw(self) -> Optional[tuple]:
+        if not self._pending:
+            self._poll()
+
+        if self._pending:
+            return self._pending.popleft()
+        return None
+
+    def read_lines(self) -> list[tuple]:
+        if not self._pending:
+            self._poll()
+
+        records = list(self._pending)
+        self._pending.clear()
+        return records
+
+    def wait(self, timeout: float = 0.05) -> bool:
+        if self._pending:
+            return True
+        return self._watcher.wait(timeout)
+
+    def skip_to_end(self):
+        self._pending.clear()
+        if self._open():
+            self._next_seq = self._write_seq() + 1
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._next_seq = 1
+
+    def _open(self) -> bool:
+        if self._map is not None:
+            return True
+
+        try:
+            f = open(self.filepath, 'rb')
+        except OSError:
+            return False
+
+        try:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                f.close()
+                return False
+
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            f.close()
+            return False
+
+        magic, version, record_size, capacity, _ = HEADER.unpack_from(mm, 0)
+        if (magic != RING_MAGIC or version != RING_VERSION or record_size != RECORD.size
+                or len(mm) < ring_file_size(capacity)):
+            # Todavía se está creando o es de otra versión del mod
+            mm.close()
+            f.close()
+            return False
+
+        self._file = f
+        self._map = mm
+        self._capacity = capacity
+        self._next_seq = max(1, self._write_seq() - capacity + 1)
+        return True
+
+    def _write_seq(self) -> int:
+        return SEQ.unpack_from(self._map, WRITE_SEQ_OFFSET)[0]
+
+    def _poll(self):
+        if not self._open():
+            return
+
+        write_seq = self._write_seq()
+
+        if write_seq < self._next_seq - 1:
+            # El juego se reinició y el anillo empezó de nuevo
+            self._next_seq = 1
+
+        if write_seq < self._next_seq:
+            return
+
+        oldest = write_seq - self._capacity + 1
+        if self._next_seq < oldest:
+            self.dropped += oldest - self._next_seq
+            self._next_seq = oldest
+
+        mm = self._map
+        capacity = self._capacity
+
+        for seq in range(self._next_seq, write_seq + 1):
+            offset = HEADER.size + ((seq - 1) % capacity) * RECORD.size
+            record = RECORD.unpack_from(mm, offset)
+
+            if record[0] != seq or SEQ.unpack_from(mm, offset)[0] != seq:
+                self.dropped += 1
+                continue
+
+            self._pending.append(record)
+
+        self._next_seq = write_seq + 1
+        self._watcher.reset()
+
+
+class RingBufferWriter:
+    """Escritor de reemplazo (igual que el del mod) para probar sin el juego."""
+
+    def __init__(self, filepath: str, capacity: int = RING_CAPACITY):
+        self.filepath = filepath
+        self.capacity = capacity
+        self.seq = 0
+        self.frame = 0
+
+        with open(filepath, 'wb') as f:
+            f.truncate(ring_file_size(capacity))
+
+        self._file = open(filepath, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), ring_file_size(capacity))
+        HEADER.pack_into(self._map, 0, RING_MAGIC, RING_VERSION, RECORD.size, capacity, 0)
+
+    def write_state(self, x: float, y: float, vely: float, ground: bool, matrix):
+        self.frame += 1
+        self._write(KIND_STATE, x, y, vely, ground, matrix, self.frame, time.time_ns() // 1000)
+
+    def write_event(self, kind: int):
+        self._write(kind, 0.0, 0.0, 0.0, False, ())
+
+    def write_session_start(self, attempt_id: int):
+        self._write(KIND_SESSION_START, float(attempt_id), 0.0, 0.0, False, ())
+
+    def _write(self, kind, x, y, vely, ground, matrix, frame=0, t_us=0):
+        self.seq += 1
+        offset = HEADER.size + ((self.seq - 1) % self.capacity) * RECORD.size
+
+        cells = list(matrix[:15])
+        cells.extend([0] * (15 - len(cells)))
+
+        SEQ.pack_into(self._map, offset, 0)
+        RECORD.pack_into(self._map, offset, 0, kind, x, y, vely, 1 if ground else 0, *cells,
+                         frame, t_us)
+        SEQ.pack_into(self._map, offset, self.seq)
+        SEQ.pack_into(self._map, WRITE_SEQ_OFFSET, self.seq)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+if __name__ == "__main__":
+    # Demo: escribe unos frames y los lee de vuelta
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(), 'gd_ai_ring.bin')
+    writer = RingBufferWriter(path, capacity=8)
+    reader = RingBufferReader(path)
+
+    writer.write_session_start(1)
+    for i in range(5):
+        writer.write_state(i * 10.0, 105.0, 0.0, True, [0, 1, 2] * 5)
+    writer.write_event(KIND_DEATH)
+
+    start = time.perf_counter()
+    for record in reader.read_lines():
+        print(record[:6], record[6:21], record[21:])
+    print(f"{(time.perf_counter() - start) * 1e6:.0f} µs, perdidos: {reader.dropped}")
@@ -0,0 +1,376 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Simulador headless del modo cubo
+================================================================================
+
+Descripción:
+    Simula la física del cubo (velocidad horizontal 1x, salto, gravedad, suelo
+    y bloques) y la matriz de visión 3x5 de ``scanPoint`` del mod, sin abrir el
+    juego y mucho más rápido que tiempo real. Produce el mismo flujo de estados
+    que consume el entrenador:
+
+    - ``state_line()``: línea STATE idéntica a la del mod (para el parser o
+      para escribir un log sintético).
+    - ``fill(state)``: camino rápido directo a ``CompactState``.
+
+    ``simulate_attempt`` replica la lógica de ``LevelSession.run`` (progreso,
+    atascos, muerte, victoria y la misma fórmula de fitness) para evaluar un
+    genoma en milisegundos.
+
+Nivel (ASCII, una columna = 30 unidades, la última fila apoya en el suelo):
+    .  aire
+    #  bloque sólido (30x30)
+    ^  pincho (hitbox 6x12 como el spike 8)
+    El nivel termina (WIN) al pasar la última columna.
+
+    Ejemplo:
+        ..............##.......
+        .......^.....###...^^..
+
+Constantes físicas (unidades del juego, velocidad en unidades por frame de 60 Hz
+como ``m_yVelocity``):
+    x 311.58 u/s, salto 11.18, gravedad 0.958 por frame, suelo y=105 (centro)
+================================================================================
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from gd_common import (
+    CompactState, EvaluationBackend, EventType, STUCK_THRESHOLD, MATRIX_SIZE,
+    distance_fitness
+)
+
+# ============================================================================
+# CONFIGURACIÓN
+# ============================================================================
+PHYSICS_HZ = 240
+SIM_FPS = 60
+
+BLOCK = 30.0
+FLOOR_TOP = 90.0
+PLAYER_HALF = 15.0
+GROUND_Y = FLOOR_TOP + PLAYER_HALF   # 105: mismo origen que _build_inputs
+INNER_HALF = 4.5                     # hitbox interna: chocar un bloque de frente mata
+
+X_SPEED = 311.58
+JUMP_VELOCITY = 11.180032
+GRAVITY = 0.958199
+MAX_FALL = 15.0
+
+SCAN_HALF = 4.0                      # CCRect(x - 4, y - 4, 8, 8) del mod
+SCAN_OFFSETS = (-20.0, 0.0, 30.0)    # bajo, medio, alto
+SCAN_DISTANCES = (30.0, 60.0, 90.0, 120.0, 150.0)
+
+AIR = 0
+SOLID = 1
+DEADLY = 2
+
+DEMO_LEVEL = """
+.................................................##.............^.................#.................
+..........^.......^^......###....^......^^.....####.....^.....#####.....^^....#...#.....^^..........
+"""
+
+
+@dataclass
+class LevelObject:
+    kind: int
+    left: float
+    bottom: float
+    right: float
+    top: float
+
+
+class Level:
+    """Objetos del nivel indexados por columna para consultas locales rápidas."""
+
+    def __init__(self, objects: list[LevelObject], length: float):
+        self.objects = objects
+        self.length = length
+
+        columns = int(length // BLOCK) + 2
+        self.columns: list[list[LevelObject]] = [[] for _ in range(columns)]
+        for obj in objects:
+            first = max(0, int(obj.left // BLOCK))
+            last = min(columns - 1, int(obj.right // BLOCK))
+            for col in range(first, last + 1):
+                self.columns[col].append(obj)
+
+    @staticmethod
+    def from_ascii(text: str) -> 'Level':
+        rows = [row.rstrip() for row in text.strip('\n').splitlines() if row.strip()]
+        objects = []
+        width = max((len(row) for row in rows), default=0)
+
+        for r, row in enumerate(rows):
+            bottom = FLOOR_TOP + (len(rows) - 1 - r) * BLOCK
+            for c, ch in enumerate(row):
+                left = c * BLOCK
+                if ch == '#':
+                    objects.append(LevelObject(SOLID, left, bottom, left + BLOCK, bottom + BLOCK))
+                elif ch == '^':
+                    cx = left + BLOCK / 2
+                    cy = bottom + BLOCK / 2
+                    objects.append(LevelObject(DEADLY, cx - 3.0, cy - 6.0, cx + 3.0, cy + 6.0))
+
+        return Level(objects, width * BLOCK)
+
+    def near(self, x: float) -> list[LevelObject]:
+        col = int(x // BLOCK)
+        if col < 0 or col >= len(self.columns):
+            return []
+        return self.columns[col]
+
+    def scan_point(self, x: float, y: float) -> int:
+        """Igual que scanPoint del mod: primer objeto que toca el cuadrado 8x8."""
+        left, right = x - SCAN_HALF, x + SCAN_HALF
+        bottom, top = y - SCAN_HALF, y + SCAN_HALF
+
+        for col_x in (left, right):
+            for obj in self.near(col_x):
+                if obj.left < right and obj.right > left and obj.bottom < top and obj.top > bottom:
+                    return obj.kind
+
+        return AIR
+
+
+def load_level(path: Optional[str] = None) -> Level:
+    """Carga un nivel ASCII desde archivo o devuelve DEMO_LEVEL."""
+    if not path:
+        return Level.from_ascii(DEMO_LEVEL)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return Level.from_ascii(f.read())
+
+
+class CubeSimulator:
+    """Un intento del cubo. ``step(jump)`` avanza un frame emitido por el mod."""
+
+    def __init__(self, level: Level, fps: int = SIM_FPS):
+        self.level = level
+        self.substeps = max(1, PHYSICS_HZ // fps)
+        self.reset()
+
+    def reset(self):
+        self.x = 0.0
+        self.y = GROUND_Y
+        self.vely = 0.0
+        self.on_ground = True
+        self.frame = 0
+        self.matrix = [AIR] * MATRIX_SIZE
+
+    def step(self, jump: bool) -> EventType:
+        """Avanza un frame con el salto mantenido o no. Devuelve STATE, DEATH o WIN."""
+        dt = 1.0 / PHYSICS_HZ
+        k = 60.0 * dt
+        level = self.level
+
+        for _ in range(self.substeps):
+            if jump and self.on_ground:
+                self.vely = JUMP_VELOCITY
+
+            prev_bottom = self.y - PLAYER_HALF
+            self.vely = max(self.vely - GRAVITY * k, -MAX_FALL)
+            self.x += X_SPEED * dt
+            self.y += self.vely * k
+            self.on_ground = False
+
+            if self.y <= GROUND_Y:
+                self.y = GROUND_Y
+                self.vely = 0.0
+                self.on_ground = True
+
+            left = self.x - PLAYER_HALF
+            right = self.x + PLAYER_HALF
+            for obj in level.near(left) + level.near(right):
+                if not (obj.left < right and obj.right > left
+                        and obj.bottom < self.y + PLAYER_HALF and obj.top > self.y - PLAYER_HALF):
+                    continue
+
+                if obj.kind == DEADLY:
+                    return EventType.DEATH
+
+                if self.vely <= 0.0 and prev_bottom >= obj.top - 1e-6:
+                    # Cae sobre el bloque: aterriza
+                    self.y = obj.top + PLAYER_HALF
+                    self.vely = 0.0
+                    self.on_ground = True
+                elif (obj.left < self.x + INNER_HALF and obj.right > self.x - INNER_HALF
+                        and obj.bottom < self.y + INNER_HALF and obj.top > self.y - INNER_HALF):
+                    return EventType.DEATH
+
+            if self.x >= level.length:
+                return EventType.WIN
+
+        self.frame += 1
+        self._scan()
+        return EventType.STATE
+
+    def _scan(self):
+        level = self.level
+        matrix = self.matrix
+        i = 0
+        for dist in SCAN_DISTANCES:
+            check_x = self.x + dist
+            for offset in SCAN_OFFSETS:
+                matrix[i] = level.scan_point(check_x, self.y + offset)
+                i += 1
+
+    def state_line(self, t_us: int = 0) -> str:
+        """Línea STATE con el mismo formato que ``MyPlayLayer::updateBot``.
+
+        ``t_us`` es el instante de emisión (µs desde epoch) para medir latencia.
+        """
+        matrix = "".join(f"{v}," for v in self.matrix)
+        return (f"STATE|{self.x:.1f}|{self.y:.1f}|{self.vely:.1f}|"
+                f"{1 if self.on_ground else 0}|{matrix}|{self.frame}|{t_us}")
+
+    def fill(self, state: CompactState):
+        """Igual que ``GameStateParser.parse_into(self.state_line(), state)`` sin texto."""
+        # Redondeo a 1 decimal como el log del mod
+        state.x = round(self.x, 1)
+        state.y = round(self.y, 1)
+        state.vely = round(self.vely, 1)
+        state.ground = self.on_ground
+        state.frame = self.frame
+        state.emit_us = 0
+
+        inputs = state.inputs
+        inputs[0] = (state.y - 105.0) / 100.0
+        inputs[1] = state.vely / 20.0
+        inputs[2] = 1.0 if state.ground else 0.0
+        for i, v in enumerate(self.matrix):
+            inputs[4 + i] = float(v)
+
+
+@dataclass
+class SimResult:
+    fitness: float
+    distance: float
+    frames: int
+    outcome: str   # "death", "win", "stuck" o "timeout"
+
+
+def simulate_attempt(net, level: Level, fps: int = SIM_FPS,
+                     max_frames: Optional[int] = None) -> SimResult:
+    """Juega un intento simulado con la misma lógica de ``LevelSession.run``."""
+    sim = CubeSimulator(level, fps)
+    state = CompactState()
+
+    start_x = None
+    max_x = 0.0
+    frames_stuck = 0
+    valid_attempt = False
+    won = False
+    outcome = "timeout"
+    jump = False
+
+    while max_frames is None or sim.frame < max_frames:
+        event = sim.step(jump)
+
+        if event == EventType.DEATH:
+            outcome = "death"
+            break
+
+        if event == EventType.WIN:
+            won = True
+            valid_attempt = True
+            outcome = "win"
+            break
+
+        sim.fill(state)
+
+        if not valid_attempt and state.x > 10:
+            valid_attempt = True
+
+        if start_x is None:
+            start_x = state.x
+            max_x = state.x
+
+        if state.x > max_x + 0.5:
+            max_x = state.x
+            frames_stuck = 0
+        else:
+            frames_stuck += 1
+
+        if frames_stuck > STUCK_THRESHOLD:
+            valid_attempt = True
+            outcome = "stuck"
+            break
+
+        jump = net.activate(state.inputs)[0] > 0.5
+
+    if start_x is None or not valid_attempt:
+        return SimResult(0.0, 0.0, sim.frame, outcome)
+
+    distance = max_x - start_x
+    return SimResult(distance_fitness(distance, won), distance, sim.frame, outcome)
+
+
+class SimBackend(EvaluationBackend):
+    """Backend determinista sin el juego: el nivel se carga una vez por proceso
+    y las redes se compilan a funciones generadas (caché por hash de la red,
+    así los élites que sobreviven entre generaciones no se recompilan).
+    """
+
+    name = "sim"
+
+    def __init__(self, level_path: Optional[str] = None, fps: int = SIM_FPS,
+                 max_frames: Optional[int] = None, cache_size: int = 512):
+        self.level = load_level(level_path)
+        self.fps = fps
+        self.max_frames = max_frames
+        self.cache_size = cache_size
+        self._networks: dict = {}
+
+    def evaluate(self, genome_id, genome, config) -> float:
+        return self.simulate(genome, config).fitness
+
+    def simulate(self, genome, config) -> SimResult:
+        return simulate_attempt(self._network(genome, config), self.level,
+                                self.fps, self.max_frames)
+
+    def _network(self, genome, config):
+        from gd_compiled import compile_generated, genome_hash
+
+        key = genome_hash(genome, config)
+        net = self._networks.pop(key, None)
+        if net is None:
+            net = compile_generated(genome, config, key=key)
+            if len(self._networks) >= self.cache_size:
+                # LRU: el primero del dict es el menos usado
+                del self._networks[next(iter(self._networks))]
+        self._networks[key] = net
+        return net
+
+
+if __name__ == "__main__":
+    # Demo: una generación aleatoria sobre DEMO_LEVEL y velocidad vs tiempo real
+    import time
+    import neat
+
+    local_dir = os.path.dirname(os.path.abspath(__file__))
+    config = neat.Config(
+        neat.DefaultGenome,
+        neat.DefaultReproduction,
+        neat.DefaultSpeciesSet,
+        neat.DefaultStagnation,
+        os.path.join(local_dir, 'config.txt')
+    )
+    level = load_level()
+    population = neat.Population(config)
+
+    start = time.perf_counter()
+    frames = 0
+    best = None
+    for genome_id, genome in population.population.items():
+        result = simulate_attempt(neat.nn.FeedForwardNetwork.create(genome, config), level)
+        frames += result.frames
+        if best is None or result.distance > best.distance:
+            best = result
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(population.population)} genomas, {frames} frames en {elapsed:.2f}s "
+          f"→ {frames / elapsed:,.0f} frames/s ({frames / SIM_FPS / elapsed:.0f}x tiempo real)")
+    print(f"mejor: {best.distance:.0f}u de {level.length:.0f}u ({best.outcome})")
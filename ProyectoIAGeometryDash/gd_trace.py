@@ -0,0 +1,393 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Grabación y repetición de intentos
+================================================================================
+
+Descripción:
+    ``TraceRecorder`` se pasa a ``LevelSession`` (``TRACE_DIR`` en
+    gd_neat_ai) y guarda cada evento que la sesión consume: estados, DEATH,
+    WIN, la acción tomada, el lote de lectura en que llegó y cada lectura del
+    reloj. Al terminar el intento se escribe un ``.npz`` comprimido de arrays
+    contiguos (float32 para posición/velocidad, uint8 para la matriz).
+
+    ``TraceReader`` implementa la misma interfaz que ``SafeLogReader``
+    (read_raw/read_lines/wait/skip_to_end/close) y entrega las líneas del
+    protocolo reconstruidas con los mismos lotes, así que la traza pasa otra
+    vez por ``GameStateParser`` y ``LevelSession`` sin el juego y a máxima
+    velocidad. Con el reloj grabado la ventana de inmunidad y los atascos se
+    deciden igual que en vivo.
+
+    Usos: regresión (la repetición con las acciones grabadas debe dar la misma
+    fitness y las mismas acciones) y dataset offline (``Trace.dataset``).
+
+Formato (.npz, una fila por evento consumido):
+    kind       uint8    EventType (0 otro, 1 STATE, 2 DEATH, 3 WIN, 4 SESSION_START)
+    batch      uint32   lote de lectura (read_lines / read_raw)
+    recv_time  float64  instante de recepción del lote
+    x, y, vely float32  estado (0 si no es STATE; en SESSION_START x es el id)
+    ground     uint8
+    matrix     uint8    (N, 15)
+    action     int8     1 salto, 0 soltar, -1 sin acción en esa fila
+    clock      float64  lecturas de ``LevelSession.clock`` en orden
+    + metadatos: version, genome_id, attempt_id, fitness, source
+
+Uso:
+    python gd_trace.py info traces/*.npz
+    python gd_trace.py replay traces/*.npz [--winner winner_genome.pkl]
+================================================================================
+"""
+
+import os
+from array import array
+from dataclasses import dataclass
+
+import numpy as np
+
+from gd_common import EventType, MATRIX_SIZE, NUM_INPUTS
+from gd_live import GameStateParser, LevelSession, RecordingController
+
+TRACE_VERSION = 2
+NO_ACTION = -1
+
+
+class TraceExhausted(EOFError):
+    """La sesión pidió más datos de los que hay en la traza."""
+
+
+# ============================================================================
+# GRABACIÓN
+# ============================================================================
+class TraceRecorder:
+    """Acumula los eventos de un intento en arrays compactos."""
+
+    def __init__(self, genome_id: int, source: str = "text"):
+        self.genome_id = genome_id
+        self.source = source
+
+        self.kind = array('B')
+        self.batch = array('I')
+        self.recv_time = array('d')
+        self.x = array('f')
+        self.y = array('f')
+        self.vely = array('f')
+        self.ground = array('B')
+        self.matrix = array('B')
+        self.action = array('b')
+        self.clock = array('d')
+
+        self._batch = -1
+        self._recv_time = 0.0
+        self._last_state = -1
+
+    def wrap_clock(self, clock):
+        """Devuelve ``clock`` envuelto para guardar cada lectura."""
+        samples = self.clock
+
+        def recorded_clock() -> float:
+            now = clock()
+            samples.append(now)
+            return now
+
+        return recorded_clock
+
+    def begin_batch(self, recv_time: float):
+        self._batch += 1
+        self._recv_time = recv_time
+
+    def record_event(self, event: EventType, state):
+        self.kind.append(event.value)
+        self.batch.append(self._batch)
+        self.recv_time.append(self._recv_time)
+        self.action.append(NO_ACTION)
+
+        if event == EventType.STATE:
+            self.x.append(state.x)
+            self.y.append(state.y)
+            self.vely.append(state.vely)
+            self.ground.append(1 if state.ground else 0)
+            self.matrix.extend(int(v) for v in state.inputs[4:])
+            self._last_state = len(self.kind) - 1
+        else:
+            self.x.append(state.session if event == EventType.SESSION_START else 0.0)
+            self.y.append(0.0)
+            self.vely.append(0.0)
+            self.ground.append(0)
+            self.matrix.extend(bytes(MATRIX_SIZE))
+
+    def record_action(self, jump: bool):
+        """Marca la acción tomada sobre el último STATE grabado."""
+        if self._last_state >= 0:
+            self.action[self._last_state] = 1 if jump else 0
+
+    def arrays(self) -> dict:
+        return {
+            'kind': np.frombuffer(self.kind, dtype=np.uint8),
+            'batch': np.frombuffer(self.batch, dtype=np.uint32),
+            'recv_time': np.frombuffer(self.recv_time, dtype=np.float64),
+            'x': np.frombuffer(self.x, dtype=np.float32),
+            'y': np.frombuffer(self.y, dtype=np.float32),
+            'vely': np.frombuffer(self.vely, dtype=np.float32),
+            'ground': np.frombuffer(self.ground, dtype=np.uint8),
+            'matrix': np.frombuffer(self.matrix, dtype=np.uint8).reshape(-1, MATRIX_SIZE),
+            'action': np.frombuffer(self.action, dtype=np.int8),
+            'clock': np.frombuffer(self.clock, dtype=np.float64),
+        }
+
+    def save(self, directory: str, attempt_id: int, fitness: float) -> str:
+        """Escribe ``trace_<intento>_g<genoma>.npz`` en ``directory`` y devuelve la ruta."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"trace_{attempt_id:06d}_g{self.genome_id}.npz")
+        np.savez_compressed(
+            path,
+            version=TRACE_VERSION,
+            genome_id=self.genome_id,
+            attempt_id=attempt_id,
+            fitness=fitness,
+            source=self.source,
+            **self.arrays()
+        )
+        return path
+
+
+# ============================================================================
+# LECTURA Y REPETICIÓN
+# ============================================================================
+class Trace:
+    """Traza cargada en memoria."""
+
+    def __init__(self, data: dict):
+        self.kind = data['kind']
+        self.batch = data['batch']
+        self.recv_time = data['recv_time']
+        self.x = data['x']
+        self.y = data['y']
+        self.vely = data['vely']
+        self.ground = data['ground']
+        self.matrix = data['matrix']
+        self.action = data['action']
+        self.clock = data['clock']
+        self.genome_id = int(data['genome_id'])
+        self.attempt_id = int(data['attempt_id'])
+        self.fitness = float(data['fitness'])
+        self.source = str(data['source'])
+
+    @staticmethod
+    def load(path: str) -> 'Trace':
+        with np.load(path) as data:
+            if int(data['version']) != TRACE_VERSION:
+                raise ValueError(f"versión de traza no soportada: {path}")
+            return Trace({key: data[key] for key in data.files})
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def lines(self) -> list[str]:
+        """Reconstruye las líneas del protocolo que produjeron cada evento."""
+        # El log de texto usa 1 decimal; el ring entrega el float32 tal cual
+        if self.source == "text":
+            fmt = "{:.1f}".format
+        else:
+            fmt = repr
+
+        lines = []
+        for i, kind in enumerate(self.kind.tolist()):
+            if kind == EventType.STATE.value:
+                matrix = "".join(f"{v}," for v in self.matrix[i].tolist())
+                lines.append(f"STATE|{fmt(float(self.x[i]))}|{fmt(float(self.y[i]))}|"
+                             f"{fmt(float(self.vely[i]))}|{self.ground[i]}|{matrix}")
+            elif kind == EventType.DEATH.value:
+                lines.append("DEATH")
+            elif kind == EventType.WIN.value:
+                lines.append("WIN")
+            elif kind == EventType.SESSION_START.value:
+                lines.append(f"SESSION_START|{int(self.x[i])}")
+            else:
+                lines.append("NONE")
+        return lines
+
+    def inputs(self) -> np.ndarray:
+        """Inputs normalizados (como ``parse_into``) de cada STATE, forma (S, 19)."""
+        states = self.kind == EventType.STATE.value
+        y = self.y[states].astype(np.float64)
+        vely = self.vely[states].astype(np.float64)
+
+        inputs = np.empty((int(states.sum()), NUM_INPUTS))
+        inputs[:, 0] = (y - 105.0) / 100.0
+        inputs[:, 1] = vely / 20.0
+        inputs[:, 2] = self.ground[states]
+        inputs[:, 3] = 1.0
+        inputs[:, 4:] = self.matrix[states]
+        return inputs
+
+    def dataset(self) -> tuple[np.ndarray, np.ndarray]:
+        """(inputs, acciones) de los frames en que la red actuó."""
+        states = self.kind == EventType.STATE.value
+        actions = self.action[states]
+        acted = actions != NO_ACTION
+        return self.inputs()[acted], actions[acted].astype(np.float64)
+
+
+class TraceReader:
+    """Misma interfaz que ``SafeLogReader`` pero sirviendo una traza grabada."""
+
+    def __init__(self, trace: Trace):
+        self._lines = trace.lines()
+        self._batch = trace.batch.tolist()
+        self._clock = trace.clock.tolist()
+        self._pos = 0
+        self._tick = 0
+
+    def read_raw(self):
+        if self._pos >= len(self._lines):
+            return None
+        line = self._lines[self._pos]
+        self._pos += 1
+        return line
+
+    def read_lines(self) -> list[str]:
+        start = self._pos
+        if start >= len(self._lines):
+            return []
+
+        end = start + 1
+        batch = self._batch[start]
+        while end < len(self._lines) and self._batch[end] == batch:
+            end += 1
+
+        self._pos = end
+        return self._lines[start:end]
+
+    def wait(self, timeout: float = None) -> bool:
+        if self._pos >= len(self._lines):
+            raise TraceExhausted("la sesión esperó más eventos de los grabados")
+        return True
+
+    def skip_to_end(self):
+        # La traza ya empieza después del skip_to_end del intento grabado
+        pass
+
+    def close(self):
+        pass
+
+    def clock(self) -> float:
+        """Devuelve las lecturas de reloj grabadas, en orden."""
+        if self._tick >= len(self._clock):
+            raise TraceExhausted("la sesión leyó el reloj más veces que en la grabación")
+        now = self._clock[self._tick]
+        self._tick += 1
+        return now
+
+
+class RecordedPolicy:
+    """'Red' que repite las acciones grabadas (regresión del pipeline)."""
+
+    def __init__(self, trace: Trace):
+        self._actions = [float(a) for a in trace.action.tolist() if a != NO_ACTION]
+        self._next = 0
+
+    def activate(self, inputs) -> list[float]:
+        action = self._actions[self._next] if self._next < len(self._actions) else 0.0
+        self._next += 1
+        return [action]
+
+
+@dataclass
+class ReplayResult:
+    fitness: float
+    actions: list[int]
+    agreement: float   # fracción de acciones iguales a las grabadas
+
+
+def replay(trace: Trace, net=None) -> ReplayResult:
+    """Pasa la traza por ``GameStateParser`` y ``LevelSession`` a máxima velocidad.
+
+    Sin ``net`` se repiten las acciones grabadas. La fitness solo depende de
+    los estados grabados (la traza no reacciona a la red); ``agreement`` dice
+    cuánto se parece la decisión de ``net`` a la del intento original.
+    """
+    reader = TraceReader(trace)
+    controller = RecordingController()
+    session = LevelSession(reader, GameStateParser(), trace.genome_id,
+                           controller=controller, clock=reader.clock)
+
+    session.wait_for_reset()
+    fitness = session.run(net or RecordedPolicy(trace))
+
+    recorded = [a for a in trace.action.tolist() if a != NO_ACTION]
+    same = sum(1 for a, b in zip(controller.actions, recorded) if a == b)
+    agreement = same / len(recorded) if recorded else 1.0
+    return ReplayResult(fitness, controller.actions, agreement)
+
+
+def load_dataset(paths: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Concatena ``Trace.dataset`` de varias trazas."""
+    inputs, actions = [], []
+    for path in paths:
+        x, y = Trace.load(path).dataset()
+        inputs.append(x)
+        actions.append(y)
+    if not inputs:
+        return np.empty((0, NUM_INPUTS)), np.empty(0)
+    return np.concatenate(inputs), np.concatenate(actions)
+
+
+if __name__ == "__main__":
+    import argparse
+    import pickle
+    import sys
+    import time
+
+    import neat
+
+    parser = argparse.ArgumentParser(description="Trazas de intentos de Geometry Dash")
+    sub = parser.add_subparsers(dest='command', required=True)
+    info_parser = sub.add_parser('info', help="Resumen de cada traza")
+    info_parser.add_argument('paths', nargs='+')
+    replay_parser = sub.add_parser('replay', help="Repetir trazas por LevelSession")
+    replay_parser.add_argument('paths', nargs='+')
+    replay_parser.add_argument('--winner', default=None,
+                               help="genoma a comparar (por defecto, las acciones grabadas)")
+    args = parser.parse_args()
+
+    sys.stdout.reconfigure(encoding='utf-8')
+
+    if args.command == 'info':
+        for path in args.paths:
+            trace = Trace.load(path)
+            states = int((trace.kind == EventType.STATE.value).sum())
+            duration = trace.recv_time[-1] - trace.recv_time[0] if len(trace) else 0.0
+            print(f"{os.path.basename(path)}: genoma {trace.genome_id}  {len(trace)} eventos "
+                  f"({states} STATE)  {duration:.2f}s  fitness {trace.fitness:.0f}  "
+                  f"{os.path.getsize(path) / 1024:.1f} KiB")
+        sys.exit(0)
+
+    net = None
+    if args.winner:
+        local_dir = os.path.dirname(os.path.abspath(__file__))
+        config = neat.Config(
+            neat.DefaultGenome,
+            neat.DefaultReproduction,
+            neat.DefaultSpeciesSet,
+            neat.DefaultStagnation,
+            os.path.join(local_dir, 'config.txt')
+        )
+        with open(args.winner, 'rb') as f:
+            genome = pickle.load(f)['genome']
+        net = neat.nn.FeedForwardNetwork.create(genome, config)
+
+    mismatches = 0
+    events = 0
+    start = time.perf_counter()
+    for path in args.paths:
+        trace = Trace.load(path)
+        result = replay(trace, net)
+        events += len(trace)
+        same = result.fitness == trace.fitness
+        mismatches += 0 if same else 1
+        print(f"  {os.path.basename(path)}: fitness {result.fitness:.0f} "
+              f"(grabada {trace.fitness:.0f}{'' if same else ' ≠'})  "
+              f"acciones iguales {result.agreement * 100:.1f}%")
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(args.paths)} trazas, {events} eventos en {elapsed:.2f}s "
+          f"({events / elapsed:,.0f} eventos/s), {mismatches} con fitness distinta")
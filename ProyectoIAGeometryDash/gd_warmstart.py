@@ -0,0 +1,178 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Arranque en caliente por imitación de trazas
+================================================================================
+
+Descripción:
+    Una población aleatoria tarda muchas generaciones en tiempo real antes de
+    que algún genoma pase el primer pincho. ``warm_start`` ajusta offline los
+    pesos de la población inicial para imitar intentos grabados (gd_trace:
+    inputs de cada frame + acción tomada) y la devuelve lista para ``p.run``.
+
+    1. Mínimos cuadrados (topología fija): con la topología inicial de
+       config.txt (19 entradas → salida, sin ocultas) la salida es
+       ``act(bias + response * Σ w·x)``. Se resuelve una regresión ridge en
+       el espacio antes de la activación (targets act⁻¹(0.9) para saltar y
+       act⁻¹(0.1) para no saltar), con las clases balanceadas. Cada genoma
+       usa su propio remuestreo bootstrap, así la población no queda idéntica.
+    2. Búsqueda sin gradiente (cualquier topología): escalada en paralelo;
+       toda la población se perturba y se evalúa en una sola llamada de
+       ``gd_compiled.PopulationNetwork`` sobre todo el dataset, y cada genoma
+       conserva su perturbación solo si mejora.
+
+    La medida es la exactitud balanceada (media de aciertos en frames con y
+    sin salto): los saltos son pocos y "nunca saltar" ya acierta la mayoría.
+
+    Los genomas se crean con ``neat.Population(config)`` (innovaciones y ids
+    válidos) y al final se re-especian con los pesos nuevos.
+================================================================================
+"""
+
+import copy
+from typing import Optional
+
+import neat
+import numpy as np
+
+from gd_compiled import PopulationNetwork
+
+JUMP_THRESHOLD = 0.5
+TARGET_HIGH = 0.9
+TARGET_LOW = 0.1
+
+# act⁻¹ de las activaciones de neat (sigmoid de neat es 1 / (1 + e^(-5z)))
+_INVERSE = {
+    'tanh': np.arctanh,
+    'sigmoid': lambda v: np.log(v / (1.0 - v)) / 5.0,
+    'relu': lambda v: v,
+    'identity': lambda v: v,
+}
+
+
+def imitation_scores(genomes, config: neat.Config, inputs: np.ndarray,
+                     actions: np.ndarray) -> np.ndarray:
+    """Exactitud balanceada de cada genoma de ``genomes`` [(id, genome)] → (G,)."""
+    outputs = PopulationNetwork.create(genomes, config).activate_batch(inputs)[:, :, 0]
+    predicted = outputs > JUMP_THRESHOLD
+    jumps = actions > 0.5
+
+    scores = np.zeros(len(outputs))
+    classes = 0
+    for mask, expected in ((jumps, True), (~jumps, False)):
+        if mask.any():
+            scores += (predicted[:, mask] == expected).mean(axis=1)
+            classes += 1
+    return scores / max(1, classes)
+
+
+def _direct_links(genome, config: neat.Config) -> Optional[list[int]]:
+    """Entradas conectadas a la salida si la red es una sola neurona; si no, None."""
+    net = neat.nn.FeedForwardNetwork.create(genome, config)
+    if len(net.node_evals) != 1 or len(net.output_nodes) != 1:
+        return None
+    node, *_, links = net.node_evals[0]
+    if node != net.output_nodes[0] or any(i >= 0 for i, _ in links):
+        return None
+    if genome.nodes[node].activation not in _INVERSE:
+        return None
+    return [i for i, _ in links]
+
+
+def fit_least_squares(genome, config: neat.Config, inputs: np.ndarray, actions: np.ndarray,
+                      rng: np.random.Generator, ridge: float = 1e-2) -> bool:
+    """Ajusta en el lugar pesos y bias de un genoma de una sola neurona.
+
+    Devuelve False (sin cambios) si la topología no es la directa.
+    """
+    links = _direct_links(genome, config)
+    if links is None:
+        return False
+
+    gc = config.genome_config
+    output = gc.output_keys[0]
+    node = genome.nodes[output]
+    inverse = _INVERSE[node.activation]
+
+    sample = rng.integers(0, len(inputs), len(inputs))
+    x = inputs[sample][:, [-i - 1 for i in links]]
+    y = actions[sample] > 0.5
+
+    target = np.where(y, inverse(TARGET_HIGH), inverse(TARGET_LOW))
+    n_jump = max(1, int(y.sum()))
+    n_idle = max(1, len(y) - n_jump)
+    weight = np.where(y, 0.5 / n_jump, 0.5 / n_idle)
+
+    design = np.hstack([x, np.ones((len(x), 1))])
+    weighted = design * weight[:, None]
+    gram = design.T @ weighted + ridge * np.eye(design.shape[1])
+    theta = np.linalg.solve(gram, weighted.T @ target)
+
+    response = node.response if node.response else 1.0
+    for i, value in zip(links, theta[:-1]):
+        w = value / response
+        genome.connections[(i, output)].weight = float(np.clip(w, gc.weight_min_value,
+                                                               gc.weight_max_value))
+    node.bias = float(np.clip(theta[-1], gc.bias_min_value, gc.bias_max_value))
+    return True
+
+
+def _perturb(genome, config: neat.Config, rng: np.random.Generator, sigma: float):
+    gc = config.genome_config
+    child = copy.deepcopy(genome)
+    for conn in child.connections.values():
+        if conn.enabled:
+            conn.weight = float(np.clip(conn.weight + rng.normal(0.0, sigma),
+                                        gc.weight_min_value, gc.weight_max_value))
+    for node in child.nodes.values():
+        node.bias = float(np.clip(node.bias + rng.normal(0.0, sigma),
+                                  gc.bias_min_value, gc.bias_max_value))
+    return child
+
+
+def refine(population: dict, config: neat.Config, inputs: np.ndarray, actions: np.ndarray,
+           rng: np.random.Generator, steps: int = 30, sigma: float = 0.3) -> np.ndarray:
+    """Escalada en paralelo de pesos/bias; reemplaza genomas en ``population``.
+
+    Devuelve la exactitud balanceada final de cada genoma (orden de ``population``).
+    """
+    keys = list(population)
+    scores = imitation_scores(list(population.items()), config, inputs, actions)
+
+    for _ in range(steps):
+        children = [(key, _perturb(population[key], config, rng, sigma)) for key in keys]
+        child_scores = imitation_scores(children, config, inputs, actions)
+        for index, (key, child) in enumerate(children):
+            if child_scores[index] > scores[index]:
+                population[key] = child
+                scores[index] = child_scores[index]
+
+    return scores
+
+
+def warm_start(config: neat.Config, inputs: np.ndarray, actions: np.ndarray,
+               steps: int = 30, sigma: float = 0.3, ridge: float = 1e-2,
+               seed: int = 0) -> tuple[neat.Population, np.ndarray]:
+    """Población inicial ajustada a (``inputs``, ``actions``) y su exactitud balanceada."""
+    if len(inputs) == 0:
+        raise ValueError("Dataset vacío: no hay frames con acción en las trazas")
+
+    rng = np.random.default_rng(seed)
+    p = neat.Population(config)
+
+    for genome in p.population.values():
+        fit_least_squares(genome, config, inputs, actions, rng, ridge)
+    scores = refine(p.population, config, inputs, actions, rng, steps, sigma)
+
+    # Los pesos cambiaron: las especies iniciales ya no valen
+    p.species = config.species_set_type(config.species_set_config, p.reporters)
+    p.species.speciate(config, p.population, p.generation)
+    return p, scores
+
+
+def warm_start_from_traces(config: neat.Config, paths: list[str],
+                           **kwargs) -> tuple[neat.Population, np.ndarray]:
+    """``warm_start`` con el dataset de las trazas ``paths`` (gd_trace)."""
+    from gd_trace import load_dataset
+
+    inputs, actions = load_dataset(paths)
+    return warm_start(config, inputs, actions, **kwargs)
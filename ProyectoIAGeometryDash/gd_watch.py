@@ -0,0 +1,135 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Espera de cambios en el log
+================================================================================
+
+Descripción:
+    Permite que el entrenador duerma hasta que el mod escriba algo nuevo en el
+    log, en lugar de girar en ``while True`` ocupando un núcleo completo.
+
+    - Linux: inotify (vía ctypes, sin dependencias externas) sobre la carpeta
+      del log, así también se detecta la creación/truncado del archivo.
+    - Otros sistemas (o si inotify falla): sondeo con espera adaptativa que
+      empieza en microsegundos y se duplica mientras no llegan datos.
+================================================================================
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import time
+
+# ============================================================================
+# CONFIGURACIÓN
+# ============================================================================
+POLL_MIN_DELAY = 0.00005   # 50 µs justo después de recibir datos
+POLL_MAX_DELAY = 0.002     # 2 ms como máximo (medio frame a 240 FPS)
+
+# Constantes de <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+
+class PollingWatcher:
+    """Espera por sondeo con retroceso exponencial entre POLL_MIN y POLL_MAX."""
+
+    def __init__(self, filepath: str,
+                 min_delay: float = POLL_MIN_DELAY,
+                 max_delay: float = POLL_MAX_DELAY):
+        self.filepath = filepath
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._delay = min_delay
+
+    def wait(self, timeout: float) -> bool:
+        """Duerme un paso de sondeo. Siempre devuelve True (hay que volver a leer)."""
+        time.sleep(min(self._delay, timeout))
+        self._delay = min(self._delay * 2, self.max_delay)
+        return True
+
+    def reset(self):
+        """Llamar cuando llegaron datos: la siguiente espera vuelve a ser corta."""
+        self._delay = self.min_delay
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Espera bloqueante con inotify sobre la carpeta del log (solo Linux)."""
+
+    _libc = None
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._fd = -1
+
+        libc = InotifyWatcher._load_libc()
+        directory = os.path.dirname(os.path.abspath(filepath))
+
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falló")
+
+        wd = libc.inotify_add_watch(fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, f"inotify_add_watch falló en {directory}")
+
+        self._fd = fd
+
+    @classmethod
+    def _load_libc(cls):
+        if cls._libc is None:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            cls._libc = libc
+        return cls._libc
+
+    def wait(self, timeout: float) -> bool:
+        """Bloquea hasta que cambie algo en la carpeta o venza el timeout."""
+        if self._fd < 0:
+            time.sleep(timeout)
+            return False
+
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return False
+
+        # Vaciar la cola de eventos: solo importa que hubo un cambio
+        try:
+            while os.read(self._fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+        return True
+
+    def reset(self):
+        pass
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(filepath: str):
+    """Devuelve un InotifyWatcher en Linux o un PollingWatcher como respaldo."""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(filepath)
+        except (OSError, AttributeError):
+            pass
+
+    return PollingWatcher(filepath)
@@ -0,0 +1,103 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Prueba: hash canónico de la red expresada
+================================================================================
+
+Descripción:
+    ``genome_hash`` (clave del caché de fitness y del caché en disco) no debe
+    depender de los ids de los nodos ocultos ni del orden de los genes: dos
+    genomas con la misma red expresada comparten clave; otra red no.
+
+Uso:
+    python -m pytest test_compiled.py
+================================================================================
+"""
+
+import copy
+import random
+import sys
+import types
+
+sys.modules.setdefault('keyboard', types.ModuleType('keyboard'))
+
+import neat
+import pytest
+
+from bench_activation import load_config, mutated_population, random_inputs
+from gd_compiled import genome_hash
+from gd_memo import FitnessCache
+
+
+def renumbered(genome, config, seed: int):
+    """Copia con otros ids de nodos ocultos y los genes en otro orden."""
+    rng = random.Random(seed)
+    outputs = set(config.genome_config.output_keys)
+    hidden = [key for key in genome.nodes if key not in outputs]
+    new_ids = rng.sample(range(1000, 5000), len(hidden))
+    mapping = dict(zip(hidden, new_ids))
+
+    def rename(key):
+        return mapping.get(key, key)
+
+    clone = copy.deepcopy(genome)
+    nodes = list(clone.nodes.values())
+    rng.shuffle(nodes)
+    clone.nodes = {}
+    for node in nodes:
+        node.key = rename(node.key)
+        clone.nodes[node.key] = node
+
+    connections = list(clone.connections.values())
+    rng.shuffle(connections)
+    clone.connections = {}
+    for conn in connections:
+        conn.key = (rename(conn.key[0]), rename(conn.key[1]))
+        clone.connections[conn.key] = conn
+    return clone
+
+
+def with_hidden(config):
+    genomes = [genome for _, genome in mutated_population(config, 30, seed=2)]
+    outputs = set(config.genome_config.output_keys)
+    chosen = [g for g in genomes
+              if sum(1 for node in neat.nn.FeedForwardNetwork.create(g, config).node_evals
+                     if node[0] not in outputs) >= 2]
+    assert chosen, "la población mutada no tiene redes con ocultos"
+    return chosen
+
+
+def test_isomorphic_genomes_share_hash():
+    config = load_config()
+    inputs = random_inputs(20)
+    for genome in with_hidden(config)[:10]:
+        clone = renumbered(genome, config, genome.key)
+        assert set(clone.nodes) != set(genome.nodes)
+        assert genome_hash(clone, config) == genome_hash(genome, config)
+        assert genome_hash(clone, config, 0.01) == genome_hash(genome, config, 0.01)
+
+        net = neat.nn.FeedForwardNetwork.create(genome, config)
+        twin = neat.nn.FeedForwardNetwork.create(clone, config)
+        for row in inputs:
+            # Otro orden de genes solo cambia el orden de las sumas
+            assert twin.activate(list(row)) == pytest.approx(net.activate(list(row)), abs=1e-9)
+
+
+def test_different_network_changes_hash():
+    config = load_config()
+    genome = with_hidden(config)[0]
+    clone = renumbered(genome, config, 7)
+    conn = next(c for c in clone.connections.values() if c.enabled)
+    conn.weight += 0.5
+    assert genome_hash(clone, config) != genome_hash(genome, config)
+
+
+def test_fitness_cache_hits_renumbered_duplicate():
+    config = load_config()
+    genome = with_hidden(config)[0]
+    clone = renumbered(genome, config, 3)
+    cache = FitnessCache()
+    pending = cache.lookup([(1, genome), (2, clone)], config)
+    assert [genome_id for genome_id, _ in pending] == [1]
+    genome.fitness = 42.0
+    assert cache.update(pending) == []
+    assert clone.fitness == 42.0
@@ -0,0 +1,81 @@
+"""
+================================================================================
+GEOMETRY DASH NEAT AI - Prueba: varias instancias con gd_neat_ai como script
+================================================================================
+
+Descripción:
+    ``python gd_neat_ai.py`` carga el script como ``__main__``. Con INSTANCES
+    configuradas, los intentos que juegan los hilos de gd_instances deben
+    escribir en el estado de ese ``__main__`` (métricas, latencias, genomas
+    cortados) y no en una segunda copia importada como ``gd_neat_ai``; con
+    TRACE_DIR, gd_trace tampoco debe importar esa copia.
+
+Uso:
+    python -m pytest test_instances.py
+================================================================================
+"""
+
+import importlib.util
+import os
+import sys
+import types
+
+sys.modules.setdefault('keyboard', types.ModuleType('keyboard'))
+
+from bench_activation import load_config, mutated_population
+from gd_instances import FakeGameInstance
+from gd_metrics import MetricsWriter, read_metrics
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gd_neat_ai.py')
+
+
+def load_as_main():
+    """Ejecuta gd_neat_ai.py como ``__main__`` (``--help`` corta antes de entrenar)."""
+    spec = importlib.util.spec_from_file_location('__main__', SCRIPT)
+    script = importlib.util.module_from_spec(spec)
+    previous_main, previous_argv = sys.modules['__main__'], sys.argv
+    sys.modules['__main__'], sys.argv = script, [SCRIPT, '--help']
+    try:
+        spec.loader.exec_module(script)
+    except SystemExit:
+        pass
+    finally:
+        sys.modules['__main__'], sys.argv = previous_main, previous_argv
+    return script
+
+
+def test_instance_attempts_reach_main_script(tmp_path, capsys):
+    imported_before = 'gd_neat_ai' in sys.modules
+    script = load_as_main()
+    instances = [FakeGameInstance(f"fake{i}", seed=i) for i in range(2)]
+    path = str(tmp_path / 'metrics.jsonl')
+
+    script.INSTANCES = [{'name': instance.name} for instance in instances]
+    script.load_instances = lambda: instances
+    script.RESET_TIMEOUT = 0.2
+    script.RESET_RETRIES = 1
+    script.LATENCY_STATS = True
+    script.metrics = MetricsWriter(path)
+    script.TRACE_DIR = str(tmp_path / 'traces')
+
+    config = load_config()
+    genomes = mutated_population(config, 5, seed=1)[:4]
+    try:
+        script.play_genomes(genomes, config)
+        scheduler = script.get_instance_scheduler()
+    finally:
+        if script._instance_scheduler is not None:
+            script._instance_scheduler.close()
+        for instance in instances:
+            instance.close()
+        script.metrics.close()
+
+    attempts = list(read_metrics(path, 'attempt'))
+    assert sorted(record['genome'] for record in attempts) == [key for key, _ in genomes]
+    assert {record['instance'] for record in attempts} <= {i.name for i in instances}
+    assert script.generation_latency.frames > 0
+    assert len(os.listdir(script.TRACE_DIR)) == len(genomes)
+    assert scheduler.run_attempt.__globals__ is script.__dict__
+    if not imported_before:
+        assert 'gd_neat_ai' not in sys.modules
+    assert all(genome.fitness is not None for _, genome in genomes)
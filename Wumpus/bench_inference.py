@@ -0,0 +1,192 @@
+# bench_inference.py
+# Inferencia probabilística de peligros (wumpus_inference):
+#
+# 1) Exactitud: en tableros pequeños compara P(hoyo) y P(Wumpus) de cada
+#    casilla con la fuerza bruta sobre TODAS las colocaciones de los
+#    peligros restantes (sin partir la frontera, sin caché ni combinatoria).
+#    También mide el error de la estimación que se usa para las componentes
+#    de más de MAX_COMPONENT_CELLS casillas, forzándola en todas.
+# 2) Coste: explora mundos revelando casillas sin peligro al azar y mide el
+#    tiempo de inferencia frente al tamaño de la frontera, con la caché de
+#    componentes vacía (frío) y tras haber visto los estados anteriores
+#    (caliente, como entre pasos y episodios). Los estados con alguna
+#    componente estimada se cuentan aparte.
+# 3) Decisión: juega los mismos mundos con semilla con y sin riesgo
+#    (Agent.take_risks) y comprueba que el agente llega a elegir casillas
+#    por P(muerte) y que eso cambia los resultados (muertes, éxitos,
+#    episodios agotados).
+#
+# Uso:
+#     python bench_inference.py [--checks 300] [--sizes 10,20,40] [--states 400]
+#                               [--episodes 500]
+
+import argparse
+import random
+import statistics
+import time
+from itertools import combinations
+
+from wumpus_engine import (
+    DEFAULT_PITS, DEFAULT_WUMPUS, GOLD, MAX_PITS, MAX_WUMPUS, TIMEOUT, World, run_episode,
+)
+from wumpus_inference import MAX_COMPONENT_CELLS, count_component, hazard_probabilities
+
+
+def observe(world, visited):
+    """Lo que percibe un agente que ha pisado ``visited`` (sin morir)."""
+    board = world.board
+    breeze = visited & world.breeze
+    stench = visited & world.stench
+    pit_free = visited | board.expand(visited & ~breeze)
+    wumpus_free = visited | board.expand(visited & ~stench)
+    return pit_free, wumpus_free, breeze, stench
+
+
+def explore(world, rng, steps):
+    """Revela ``steps`` casillas sin peligro conectadas con la salida, al azar."""
+    board = world.board
+    hazards = world.wumpus | world.pit
+    visited = board.bit(world.start_pos)
+    for _ in range(steps):
+        options = board.expand(visited) & ~visited & ~hazards
+        if not options:
+            break
+        cells = list(board.indices(options))
+        visited |= 1 << rng.choice(cells)
+    return visited
+
+
+def brute_force(world, pit_free, wumpus_free, breeze, stench):
+    """Marginales contando una a una todas las colocaciones consistentes."""
+    board = world.board
+    cells = [i for i in range(world.size * world.size)
+             if not (pit_free >> i) & (wumpus_free >> i) & 1]
+    pit_hits = dict.fromkeys(cells, 0)
+    wumpus_hits = dict.fromkeys(cells, 0)
+    total = 0
+    for wumpus in combinations(cells, world.num_wumpus):
+        w_mask = sum(1 << i for i in wumpus)
+        if w_mask & wumpus_free or board.expand(w_mask) & stench != stench:
+            continue
+        rest = [i for i in cells if not (w_mask >> i) & 1]
+        for pits in combinations(rest, world.num_pits):
+            p_mask = sum(1 << i for i in pits)
+            if p_mask & pit_free or board.expand(p_mask) & breeze != breeze:
+                continue
+            total += 1
+            for i in wumpus:
+                wumpus_hits[i] += 1
+            for i in pits:
+                pit_hits[i] += 1
+    return {i: (pit_hits[i] / total, wumpus_hits[i] / total) for i in cells}
+
+
+def check_exact(checks, rng):
+    """Error máximo exacto (sin límite) y con todas las componentes estimadas."""
+    worst = estimated = 0.0
+    for n in range(checks):
+        size = rng.choice((4, 5))
+        world = World(rng.randint(0, 2), rng.randint(0, 3), size, rng)
+        visited = explore(world, rng, rng.randint(0, size * size // 2))
+        obs = observe(world, visited)
+        expected = brute_force(world, *obs)
+        exact = hazard_probabilities(world.board, *obs, 0, 0, world.num_pits,
+                                     world.num_wumpus, max_cells=None)
+        rough = hazard_probabilities(world.board, *obs, 0, 0, world.num_pits,
+                                     world.num_wumpus, max_cells=0)
+        for index, (pit, wumpus) in expected.items():
+            got_pit, got_wumpus = exact.at(index)
+            worst = max(worst, abs(got_pit - pit), abs(got_wumpus - wumpus))
+            got_pit, got_wumpus = rough.at(index)
+            estimated = max(estimated, abs(got_pit - pit), abs(got_wumpus - wumpus))
+    return worst, estimated
+
+
+def frontier_size(world, pit_free, wumpus_free, breeze, stench):
+    board = world.board
+    unknown = board.full & ~(pit_free & wumpus_free)
+    return bin(board.expand(breeze | stench) & unknown).count("1")
+
+
+def timed(world, obs):
+    """Segundos de una inferencia y si alguna componente se estimó."""
+    start = time.perf_counter()
+    probs = hazard_probabilities(world.board, *obs, 0, 0, world.num_pits, world.num_wumpus)
+    return time.perf_counter() - start, bool(probs.approximate)
+
+
+def compare_risk(episodes, seed):
+    """Resultados por modo (sin riesgo, con riesgo) en los mismos mundos."""
+    totals = {}
+    for take_risks in (False, True):
+        results = [run_episode(DEFAULT_WUMPUS, DEFAULT_PITS, seed=f"{seed}:{i}",
+                               take_risks=take_risks)
+                   for i in range(episodes)]
+        totals[take_risks] = {
+            "éxitos": sum(r.outcome == GOLD for r in results),
+            "agotados": sum(r.outcome == TIMEOUT for r in results),
+            "muertes": sum(r.deaths for r in results),
+            "pasos con riesgo": sum(r.risky_moves for r in results),
+            "puntos medios": sum(r.score for r in results) / episodes,
+        }
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inferencia exacta de peligros")
+    parser.add_argument("--checks", type=int, default=300)
+    parser.add_argument("--sizes", default="10,20,40")
+    parser.add_argument("--states", type=int, default=400)
+    parser.add_argument("--episodes", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    worst, estimated = check_exact(args.checks, rng)
+    print(f"exactitud: {args.checks} estados en 4x4/5x5, error máximo {worst:.2e} "
+          f"(estimando todas las componentes: {estimated:.2f})")
+
+    states = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        for _ in range(args.states):
+            world = World(MAX_WUMPUS, MAX_PITS, size, rng)
+            visited = explore(world, rng, rng.randint(1, size * size // 2))
+            obs = observe(world, visited)
+            states.append((size, frontier_size(world, *obs), world, obs))
+
+    cold = {}
+    approximate = 0
+    for size, frontier, world, obs in states:
+        count_component.cache_clear()
+        seconds, estimated = timed(world, obs)
+        cold.setdefault((size, frontier // 5), []).append(seconds)
+        approximate += estimated
+    count_component.cache_clear()
+    warm = {}
+    for size, frontier, world, obs in states:
+        warm.setdefault((size, frontier // 5), []).append(timed(world, obs)[0])
+    info = count_component.cache_info()
+
+    print(f"{'tamaño':>7}{'frontera':>10}{'estados':>9}{'frío ms':>10}{'caliente ms':>13}{'máx frío ms':>13}")
+    for key in sorted(cold):
+        size, bucket = key
+        print(f"{size:>7}{f'{5 * bucket}-{5 * bucket + 4}':>10}{len(cold[key]):>9}"
+              f"{1000 * statistics.median(cold[key]):>10.2f}"
+              f"{1000 * statistics.median(warm[key]):>13.2f}"
+              f"{1000 * max(cold[key]):>13.2f}")
+    print(f"caché de componentes: {info.hits} aciertos, {info.misses} fallos, "
+          f"{info.currsize} firmas")
+    print(f"estados con alguna componente de más de {MAX_COMPONENT_CELLS} casillas "
+          f"(estimada): {approximate} de {len(states)}")
+
+    totals = compare_risk(args.episodes, args.seed)
+    print(f"decisión: {args.episodes} mundos {DEFAULT_WUMPUS}W/{DEFAULT_PITS}H")
+    print(f"{'':>18}{'sin riesgo':>12}{'con riesgo':>12}")
+    for name in totals[True]:
+        print(f"{name:>18}{totals[False][name]:>12.1f}{totals[True][name]:>12.1f}")
+    if not totals[True]["pasos con riesgo"] or totals[True] == totals[False]:
+        raise AssertionError("el agente nunca decidió por P(muerte)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# bench_knowledge.py
+# Equivalencia y coste de la inferencia incremental (HazardConstraints)
+# frente a la versión anterior, que reconstruía possible_wumpus y
+# possible_pits intersectando todo stench_info / breeze_info en cada paso.
+#
+# Juega los mismos mundos con semilla con los dos agentes a la vez y, tras
+# cada paso, comprueba que los eventos, las posiciones y las máscaras de
+# posibles Wumpus y hoyos son idénticos, y que cada restricción guardada es
+# exactamente "vecinos de la fuente que aún no son seguros". Después mide
+# episodios por segundo de cada uno por tamaño de mundo.
+#
+# Uso:
+#     python bench_knowledge.py [--episodes 300] [--sizes 10,20,40]
+
+import argparse
+import random
+import sys
+import time
+
+from wumpus_engine import (
+    DEFAULT_PITS, MAX_PITS, MAX_WUMPUS, Agent, HazardConstraints, World,
+)
+
+
+class RebuildAgent(Agent):
+    """Referencia: la intersección completa de antes, recalculada en cada paso."""
+
+    def update_knowledge(self):
+        if isinstance(self.stench_info, HazardConstraints):
+            # reset() acaba de crear contenedores vacíos
+            self.stench_info, self.breeze_info = {}, {}
+
+        pos = self.pos
+        index = self.board.index(pos)
+        b = 1 << index
+        self.visited |= b
+        self.known_safe |= b
+        self.visit_count[pos] = self.visit_count.get(pos, 0) + 1
+
+        stench = self.world.stench & b
+        breeze = self.world.breeze & b
+        neighbors = self.board.neighbor_mask[index]
+        if not stench and not breeze:
+            self.known_safe |= neighbors
+        # Percepciones de la inferencia probabilística (igual que Agent)
+        self.pit_free |= b | (0 if breeze else neighbors)
+        self.wumpus_free |= b | (0 if stench else neighbors)
+        self.breeze_seen = self.breeze_seen | b if breeze else self.breeze_seen & ~b
+        self.stench_seen = self.stench_seen | b if stench else self.stench_seen & ~b
+        unknown_neighbors = neighbors & ~self.known_safe
+        if stench and unknown_neighbors:
+            self.stench_info[pos] = unknown_neighbors
+        if breeze and unknown_neighbors:
+            self.breeze_info[pos] = unknown_neighbors
+
+        self.possible_wumpus = self._intersect(self.stench_info)
+        self.possible_pits = self._intersect(self.breeze_info)
+
+    def _intersect(self, info):
+        if not info:
+            return 0
+        inter = self.board.full
+        for m in info.values():
+            inter &= m
+        return inter & ~self.known_safe
+
+
+def pair(seed, size, num_wumpus, num_pits):
+    agents = []
+    for cls in (Agent, RebuildAgent):
+        rng = random.Random(seed)
+        agents.append(cls(World(num_wumpus, num_pits, size, rng), rng))
+    return agents
+
+
+def check_constraints(agent):
+    """Cada restricción incremental = vecinos de su fuente no seguros."""
+    board = agent.board
+    for info in (agent.stench_info, agent.breeze_info):
+        for index, mask in info.masks.items():
+            if mask != board.neighbor_mask[index] & ~agent.known_safe:
+                return False
+    return True
+
+
+def lockstep(seed, size, num_wumpus, num_pits, max_attempts=20):
+    """Juega un episodio con ambos agentes; devuelve el nº de pasos comparados o lanza."""
+    fast, ref = pair(seed, size, num_wumpus, num_pits)
+    max_steps = 4 * size * size
+    compared = 0
+    for attempt in range(max_attempts):
+        if attempt:
+            fast.reset()
+            ref.reset()
+        for _ in range(max_steps):
+            a = fast.step()
+            b = ref.step()
+            compared += 1
+            same = (a == b
+                    and fast.pos == ref.pos
+                    and fast.possible_wumpus == ref.possible_wumpus
+                    and fast.possible_pits == ref.possible_pits
+                    and check_constraints(fast))
+            if not same:
+                raise AssertionError(
+                    f"diferencia: semilla {seed}, tamaño {size}, "
+                    f"W={num_wumpus} H={num_pits}, intento {attempt}, paso {compared}")
+            if fast.done:
+                break
+        if not (fast.done and not fast.alive):
+            break
+    return compared
+
+
+def rate(cls, seeds, size, num_wumpus, num_pits):
+    start = time.perf_counter()
+    for seed in seeds:
+        rng = random.Random(seed)
+        cls(World(num_wumpus, num_pits, size, rng), rng).run_episode()
+    return len(seeds) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inferencia incremental vs. reconstrucción")
+    parser.add_argument("--episodes", type=int, default=300)
+    parser.add_argument("--sizes", default="10,20,40")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    compared = 0
+    worlds = 0
+    for size in sizes:
+        for num_wumpus in range(MAX_WUMPUS + 1):
+            for num_pits in range(0, MAX_PITS + 1, 2):
+                for seed in range(args.episodes // 10):
+                    compared += lockstep(seed, size, num_wumpus, num_pits)
+                    worlds += 1
+    print(f"equivalencia: {worlds} mundos, {compared} pasos idénticos")
+
+    print(f"{'tamaño':>7}{'reconstrucción ep/s':>22}{'incremental ep/s':>19}{'aceleración':>13}")
+    for size in sizes:
+        seeds = range(args.episodes if size <= 10 else max(1, args.episodes // (size // 10) ** 2))
+        ref = rate(RebuildAgent, seeds, size, MAX_WUMPUS, DEFAULT_PITS)
+        fast = rate(Agent, seeds, size, MAX_WUMPUS, DEFAULT_PITS)
+        print(f"{size:>7}{ref:>22,.0f}{fast:>19,.0f}{fast / ref:>13.2f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+# bench_montecarlo.py
+# Evaluación Monte-Carlo del agente Pedro con el motor sin interfaz.
+# Recorre num_wumpus 0..MAX_WUMPUS y num_pits 0..MAX_PITS, juega N mundos
+# con semilla por configuración en un pool de procesos y reporta, con
+# intervalos de confianza del 95 %: tasa de éxito, puntos (MOVE_COST /
+# DEATH_PENALTY / GOLD_REWARD ...), pasos por episodio, muertes antes del
+# oro y episodios por segundo.
+#
+# La semilla de cada episodio depende solo de (--seed, wumpus, hoyos,
+# índice), y los resultados se agregan en orden de episodio: las métricas
+# son idénticas con cualquier número de procesos y se pueden comparar entre
+# commits (--json guarda el informe). Los puntos cuentan la flecha una vez;
+# la interfaz original la contaba dos (ver Agent.shoot_arrow). Con
+# --take-risks el agente juega con Agent.take_risks (apuesta por la casilla
+# de menor P(muerte) cuando no le quedan seguras); sin él, la política base.
+#
+# Uso:
+#     python bench_montecarlo.py [--episodes 500] [--workers N] [--seed 0]
+#                                [--wumpus 0-5] [--pits 0-8] [--take-risks]
+#                                [--json out.json]
+
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from wumpus_engine import MAX_PITS, MAX_WUMPUS, run_episode
+
+Z_95 = 1.96
+
+
+def episode_seed(base, num_wumpus, num_pits, index):
+    """Semilla estable de un episodio (random.Random acepta cadenas sin usar hash())."""
+    return f"{base}:{num_wumpus}:{num_pits}:{index}"
+
+
+def play_chunk(task):
+    """Juega los episodios [start, stop) de una configuración en el worker.
+
+    Cada fila lleva los segundos del episodio: la velocidad y su intervalo
+    salen de las muestras por episodio, no de una por tarea.
+    """
+    base, num_wumpus, num_pits, start, stop, max_attempts, take_risks = task
+    rows = []
+    for i in range(start, stop):
+        t0 = time.perf_counter()
+        result = run_episode(num_wumpus, num_pits,
+                             seed=episode_seed(base, num_wumpus, num_pits, i),
+                             max_attempts=max_attempts, take_risks=take_risks)
+        rows.append((result.success, result.score, result.steps, result.deaths,
+                     time.perf_counter() - t0))
+    return rows
+
+
+def mean_ci(values):
+    """Media y semiancho del intervalo normal del 95 %."""
+    n = len(values)
+    if n == 0:
+        return float("nan"), float("nan")
+    mean = sum(values) / n
+    if n < 2:
+        return mean, float("nan")
+    var = sum((v - mean) ** 2 for v in values) / (n - 1)
+    return mean, Z_95 * math.sqrt(var / n)
+
+
+def rate_ci(seconds):
+    """Episodios por segundo con intervalo del 95 % a partir de los tiempos.
+
+    La velocidad es 1 / media del tiempo por episodio; el semiancho se
+    propaga por el método delta (semiancho del tiempo / media²).
+    """
+    mean, half = mean_ci(seconds)
+    if not mean > 0:
+        return float("nan"), float("nan")
+    return 1.0 / mean, half / (mean * mean)
+
+
+def format_ci(mean, half, width, digits):
+    """``media ±semiancho``; sin semiancho (una sola muestra) solo la media."""
+    if math.isnan(half):
+        return f"{mean:>{width},.{digits}f}{'':>7}"
+    return f"{mean:>{width},.{digits}f} ±{half:>5,.{digits}f}"
+
+
+def wilson_ci(successes, n):
+    """Proporción con intervalo de Wilson del 95 % (estable cerca de 0 y 1)."""
+    if n == 0:
+        return float("nan"), float("nan"), float("nan")
+    p = successes / n
+    z2 = Z_95 * Z_95
+    center = (p + z2 / (2 * n)) / (1 + z2 / n)
+    half = Z_95 * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / (1 + z2 / n)
+    return p, center - half, center + half
+
+
+def summarize(num_wumpus, num_pits, rows):
+    successes = sum(r[0] for r in rows)
+    rate, low, high = wilson_ci(successes, len(rows))
+    score = mean_ci([r[1] for r in rows])
+    steps = mean_ci([r[2] for r in rows])
+    deaths = mean_ci([r[3] for r in rows if r[0]])
+    speed = rate_ci([r[4] for r in rows])
+    return {
+        "wumpus": num_wumpus,
+        "pits": num_pits,
+        "episodes": len(rows),
+        "success": [rate, low, high],
+        "score": list(score),
+        "steps": list(steps),
+        "deaths_before_success": list(deaths),
+        "episodes_per_sec": list(speed),
+    }
+
+
+def parse_range(text, upper):
+    lo, _, hi = text.partition("-")
+    lo = int(lo)
+    hi = int(hi) if hi else lo
+    return range(max(0, lo), min(upper, hi) + 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte-Carlo del agente Pedro")
+    parser.add_argument("--episodes", type=int, default=500,
+                        help="mundos por configuración (wumpus, hoyos)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk", type=int, default=50,
+                        help="episodios por tarea del pool")
+    parser.add_argument("--max-attempts", type=int, default=50)
+    parser.add_argument("--wumpus", default=f"0-{MAX_WUMPUS}")
+    parser.add_argument("--pits", default=f"0-{MAX_PITS}")
+    parser.add_argument("--take-risks", action="store_true",
+                        help="arriesgarse cuando no quedan casillas seguras")
+    parser.add_argument("--json", default=None, help="guardar el informe en JSON")
+    args = parser.parse_args()
+
+    configs = [(w, p) for w in parse_range(args.wumpus, MAX_WUMPUS)
+               for p in parse_range(args.pits, MAX_PITS)]
+    tasks = [(args.seed, w, p, start, min(start + args.chunk, args.episodes),
+              args.max_attempts, args.take_risks)
+             for w, p in configs
+             for start in range(0, args.episodes, args.chunk)]
+
+    start = time.perf_counter()
+    if args.workers <= 1:
+        outputs = list(map(play_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(args.workers) as pool:
+            # map conserva el orden de las tareas: agregación independiente de los workers
+            outputs = list(pool.map(play_chunk, tasks))
+    elapsed = time.perf_counter() - start
+
+    per_config = {config: [] for config in configs}
+    for task, rows in zip(tasks, outputs):
+        per_config[(task[1], task[2])].extend(rows)
+    report = [summarize(w, p, per_config[(w, p)]) for w, p in configs]
+
+    total = len(configs) * args.episodes
+    print(f"workers: {args.workers}  semilla: {args.seed}  episodios: {total} "
+          f"en {elapsed:.2f}s ({total / elapsed:,.0f}/s)"
+          f"{'  take_risks' if args.take_risks else ''}")
+    print(f"{'W':>2}{'H':>3}{'éxito % [IC95]':>22}{'puntos':>17}{'pasos':>17}"
+          f"{'muertes/éxito':>17}{'ep/s (worker)':>18}")
+    for row in report:
+        rate, low, high = row["success"]
+        print(f"{row['wumpus']:>2}{row['pits']:>3}"
+              f"{100 * rate:>9.1f} [{100 * low:5.1f},{100 * high:5.1f}]"
+              f"{format_ci(*row['score'], 10, 1)}"
+              f"{format_ci(*row['steps'], 10, 1)}"
+              f"{format_ci(*row['deaths_before_success'], 10, 2)}"
+              f"{format_ci(*row['episodes_per_sec'], 11, 0)}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"seed": args.seed, "episodes": args.episodes,
+                       "workers": args.workers, "seconds": elapsed,
+                       "take_risks": args.take_risks,
+                       "configs": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
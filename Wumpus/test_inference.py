@@ -0,0 +1,78 @@
+# test_inference.py
+# Inferencia de peligros (wumpus_inference): exacta frente a la fuerza bruta
+# de bench_inference en tableros pequeños, y estimación acotada y rápida
+# para las componentes de más de MAX_COMPONENT_CELLS casillas.
+#
+# Uso:
+#     python -m pytest test_inference.py
+
+import random
+import time
+
+import pytest
+
+from bench_inference import brute_force, explore, observe
+from wumpus_engine import World, bit_board, run_episode
+from wumpus_inference import MAX_COMPONENT_CELLS, hazard_probabilities, popcount
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_exact_matches_brute_force(seed):
+    rng = random.Random(seed)
+    size = rng.choice((4, 5))
+    world = World(rng.randint(0, 2), rng.randint(0, 3), size, rng)
+    obs = observe(world, explore(world, rng, rng.randint(0, size * size // 2)))
+    probs = hazard_probabilities(world.board, *obs, 0, 0, world.num_pits, world.num_wumpus)
+    assert not probs.approximate
+    for index, (pit, wumpus) in brute_force(world, *obs).items():
+        assert probs.at(index) == pytest.approx((pit, wumpus), abs=1e-12)
+
+
+def breeze_chain(size):
+    """Columnas pares de la fila 1 visitadas y con brisa: una sola componente.
+
+    Las casillas impares de la fila 1 las comparten dos brisas vecinas, así
+    que filas 0 y 2 (pares) y fila 1 (impares) quedan encadenadas.
+    """
+    board = bit_board(size)
+    visited = board.mask((1, c) for c in range(0, size, 2))
+    return board, visited, visited, board.full, visited, 0
+
+
+def test_large_component_is_estimated():
+    size = 16
+    board, visited, pit_free, wumpus_free, breeze, stench = breeze_chain(size)
+
+    start = time.perf_counter()
+    probs = hazard_probabilities(board, pit_free, wumpus_free, breeze, stench,
+                                 0, 0, 8, 0)
+    assert time.perf_counter() - start < 0.5
+
+    frontier = board.expand(visited) & ~visited
+    assert popcount(frontier) > MAX_COMPONENT_CELLS
+    assert probs.approximate == frontier
+    for index in board.indices(frontier):
+        pit, wumpus = probs.at(index)
+        assert 0.0 < pit <= 1.0
+        assert wumpus == 0.0
+    for index in board.indices(visited):
+        assert probs.at(index) == (0.0, 0.0)
+
+
+def test_estimate_respects_constraints():
+    """Una casilla que es la única opción de una brisa queda como hoyo casi seguro."""
+    board = bit_board(4)
+    visited = board.bit((0, 0))
+    pit_free = visited | board.bit((0, 1))
+    probs = hazard_probabilities(board, pit_free, board.full, visited, 0, 0, 0, 1, 0,
+                                 max_cells=0)
+    assert probs.approximate == board.bit((1, 0))
+    assert probs.at(board.index((1, 0))) == (1.0, 0.0)
+
+
+def test_take_risks_is_opt_in():
+    """Sin pedirlo, Pedro sigue la política base y nunca se arriesga."""
+    results = [run_episode(1, 6, seed=f"risk:{i}") for i in range(50)]
+    assert not any(r.risky_moves for r in results)
+    assert any(run_episode(1, 6, seed=f"risk:{i}", take_risks=True).risky_moves
+               for i in range(50))
@@ -0,0 +1,89 @@
+# test_knowledge.py
+# Equivalencia de la inferencia incremental (HazardConstraints) con la
+# reconstrucción completa de bench_knowledge.RebuildAgent: en episodios con
+# semilla, tras cada paso, los eventos, la posición, possible_wumpus y
+# possible_pits deben ser idénticos y cada restricción guardada debe ser
+# "vecinos de la fuente que aún no son seguros".
+#
+# Uso:
+#     python -m pytest test_knowledge.py
+
+import random
+
+import pytest
+
+from bench_knowledge import RebuildAgent, check_constraints, pair
+from wumpus_engine import MAX_PITS, MAX_WUMPUS, Agent, HazardConstraints, World
+
+
+def replay(seed, size, num_wumpus, num_pits, max_attempts=20):
+    """Juega ambos agentes a la par y compara su conocimiento en cada paso."""
+    fast, ref = pair(seed, size, num_wumpus, num_pits)
+    steps = 0
+    for attempt in range(max_attempts):
+        if attempt:
+            fast.reset()
+            ref.reset()
+        for _ in range(4 * size * size):
+            a = fast.step()
+            b = ref.step()
+            steps += 1
+            where = f"semilla {seed}, intento {attempt}, paso {steps}"
+            assert a == b, where
+            assert fast.pos == ref.pos, where
+            assert fast.possible_wumpus == ref.possible_wumpus, where
+            assert fast.possible_pits == ref.possible_pits, where
+            assert check_constraints(fast), where
+            if fast.done:
+                break
+        if not (fast.done and not fast.alive):
+            break
+    return steps
+
+
+@pytest.mark.parametrize("size", [4, 10])
+@pytest.mark.parametrize("num_wumpus", range(0, MAX_WUMPUS + 1, 2))
+@pytest.mark.parametrize("num_pits", range(0, MAX_PITS + 1, 4))
+def test_incremental_matches_rebuild(size, num_wumpus, num_pits):
+    steps = sum(replay(seed, size, num_wumpus, num_pits) for seed in range(15))
+    assert steps > 0
+
+
+def test_constraints_with_random_safe_marks():
+    """HazardConstraints frente a la intersección completa con altas y seguras al azar."""
+    rng = random.Random(0)
+    for _ in range(200):
+        world = World(1, 1, rng.choice((4, 6, 10)), rng)
+        board = world.board
+        constraints = HazardConstraints(board)
+        rebuilt = {}
+        safe = 0
+        for _ in range(rng.randint(1, 30)):
+            if rng.random() < 0.5:
+                index = rng.randrange(board.size * board.size)
+                mask = board.neighbor_mask[index] & ~safe
+                if mask:
+                    constraints.add(index, mask)
+                    rebuilt[index] = mask
+            else:
+                new = 1 << rng.randrange(board.size * board.size)
+                safe |= new
+                constraints.mark_safe(new)
+            expected = 0
+            if rebuilt:
+                expected = board.full
+                for mask in rebuilt.values():
+                    expected &= mask
+                expected &= ~safe
+            assert constraints.possible == expected
+            for index, mask in constraints.masks.items():
+                assert mask == rebuilt[index] & ~safe
+
+
+def test_rebuild_agent_is_reference():
+    """La referencia no usa HazardConstraints: la comparación no es trivial."""
+    rng = random.Random(1)
+    agent = RebuildAgent(World(2, 4, 6, rng), rng)
+    agent.run_episode(max_attempts=3)
+    assert isinstance(agent.stench_info, dict)
+    assert not isinstance(Agent(World(2, 4, 6, rng), rng).stench_info, dict)
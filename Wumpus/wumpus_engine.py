@@ -0,0 +1,662 @@
+# wumpus_engine.py
+# Motor del Mundo de Wumpus sin interfaz: mundo, percepciones, puntos y el
+# razonamiento del agente Pedro. No importa Tkinter, así se pueden simular
+# miles de episodios por segundo; wumpus_gui.py solo dibuja este estado.
+
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from wumpus_inference import hazard_probabilities
+
+# Tamaño del mundo
+GRID_SIZE = 10
+
+# Límites para Wumpus y hoyos
+MAX_WUMPUS = 5
+MAX_PITS = 8
+DEFAULT_WUMPUS = 1
+DEFAULT_PITS = 6
+
+# Sistema de puntos
+MOVE_COST = -1          # cada movimiento cuesta 1 punto
+DEATH_PENALTY = -50     # morir en hoyo o Wumpus
+GOLD_REWARD = 100       # encontrar el oro
+ARROW_COST = -5         # disparar la flecha cuesta puntos
+KILL_REWARD = 30        # matar a un Wumpus
+IMPOSSIBLE_PENALTY = -10  # declarar que es imposible
+
+# Eventos de un paso del agente
+MOVE = "move"
+SHOOT = "shoot"
+DEATH = "death"
+GOLD = "gold"
+IMPOSSIBLE = "impossible"
+TIMEOUT = "timeout"
+
+
+def get_neighbors(pos, size=GRID_SIZE):
+    r, c = pos
+    neighbors = []
+    if r > 0:
+        neighbors.append((r - 1, c))
+    if r < size - 1:
+        neighbors.append((r + 1, c))
+    if c > 0:
+        neighbors.append((r, c - 1))
+    if c < size - 1:
+        neighbors.append((r, c + 1))
+    return neighbors
+
+
+# --------------------------- MÁSCARAS DE BITS ---------------------- #
+class BitBoard:
+    """Geometría de una cuadrícula vista como máscaras de bits.
+
+    La casilla (r, c) es el bit ``r * size + c`` de un entero: un conjunto de
+    casillas es un solo int, la unión/intersección es ``|``/``&`` y los
+    vecinos de todo un conjunto salen con cuatro desplazamientos.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.full = (1 << (size * size)) - 1
+        first_col = sum(1 << (r * size) for r in range(size))
+        self.not_first_col = self.full & ~first_col
+        self.not_last_col = self.full & ~(first_col << (size - 1))
+
+        # Por índice: vecinos en el orden de get_neighbors (el agente elige
+        # al azar entre ellos, así que el orden fija la secuencia de semillas),
+        # su máscara y los rayos de la flecha en cada dirección.
+        self.neighbors = []
+        self.neighbor_bits = []
+        self.neighbor_mask = []
+        self.rays = []
+        for index in range(size * size):
+            pos = divmod(index, size)
+            cells = get_neighbors(pos, size)
+            self.neighbors.append(cells)
+            self.neighbor_bits.append([(p, self.bit(p)) for p in cells])
+            self.neighbor_mask.append(self.mask(cells))
+            rays = {}
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                r, c = pos[0] + dr, pos[1] + dc
+                ray = 0
+                while 0 <= r < size and 0 <= c < size:
+                    ray |= self.bit((r, c))
+                    r += dr
+                    c += dc
+                rays[(dr, dc)] = ray
+            self.rays.append(rays)
+
+    def index(self, pos):
+        return pos[0] * self.size + pos[1]
+
+    def bit(self, pos):
+        return 1 << (pos[0] * self.size + pos[1])
+
+    def pos(self, index):
+        return divmod(index, self.size)
+
+    def mask(self, cells):
+        m = 0
+        for p in cells:
+            m |= self.bit(p)
+        return m
+
+    def has(self, mask, pos):
+        return (mask >> (pos[0] * self.size + pos[1])) & 1 == 1
+
+    def expand(self, mask):
+        """Casillas vecinas de cualquier casilla de ``mask``."""
+        size = self.size
+        return ((mask >> size)
+                | (mask << size)
+                | ((mask & self.not_first_col) >> 1)
+                | ((mask & self.not_last_col) << 1)) & self.full
+
+    def indices(self, mask):
+        """Índices de los bits de ``mask`` en orden creciente."""
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def cells(self, mask):
+        """Posiciones de los bits de ``mask`` en orden de índice."""
+        for index in self.indices(mask):
+            yield self.pos(index)
+
+
+@lru_cache(maxsize=None)
+def bit_board(size):
+    """BitBoard compartido por todos los mundos del mismo tamaño."""
+    return BitBoard(size)
+
+
+# ------------------------------ MUNDO ------------------------------ #
+class World:
+    """Cuadrícula con oro, Wumpus, hoyos y sus percepciones (hedor y brisa).
+
+    Cada característica es una máscara de bits sobre ``board``.
+    """
+
+    def __init__(self, num_wumpus=DEFAULT_WUMPUS, num_pits=DEFAULT_PITS,
+                 size=GRID_SIZE, rng=None):
+        self.size = size
+        self.board = bit_board(size)
+        self.num_wumpus = max(0, min(MAX_WUMPUS, num_wumpus))
+        self.num_pits = max(0, min(MAX_PITS, num_pits))
+        self.start_pos = (size - 1, 0)
+        self.gold_pos = None
+        self.wumpus = 0
+        self.pit = 0
+        self.gold = 0
+        self.stench = 0
+        self.breeze = 0
+        self.generate(rng or random)
+
+    def neighbors(self, pos):
+        return self.board.neighbors[self.board.index(pos)]
+
+    def cell(self, pos):
+        """Características de una casilla como dict (para la interfaz)."""
+        b = self.board.bit(pos)
+        return {
+            "wumpus": bool(self.wumpus & b),
+            "pit": bool(self.pit & b),
+            "gold": bool(self.gold & b),
+            "stench": bool(self.stench & b),
+            "breeze": bool(self.breeze & b),
+        }
+
+    def generate(self, rng):
+        """Coloca oro, Wumpus, hoyos y percepciones."""
+        size = self.size
+        board = self.board
+        start = board.bit(self.start_pos)
+        safe_zone = start | board.expand(start)
+
+        # Oro
+        while True:
+            b = board.bit((rng.randrange(size), rng.randrange(size)))
+            if not b & safe_zone:
+                self.gold = b
+                self.gold_pos = board.pos(b.bit_length() - 1)
+                break
+
+        # Wumpus y hoyos
+        self.wumpus = self.pit = 0
+        for feature, amount in (("wumpus", self.num_wumpus), ("pit", self.num_pits)):
+            placed = 0
+            mask = 0
+            while placed < amount:
+                b = board.bit((rng.randrange(size), rng.randrange(size)))
+                if b & (safe_zone | self.wumpus | self.pit | self.gold | mask):
+                    continue
+                mask |= b
+                placed += 1
+            setattr(self, feature, mask)
+
+        # Hedor y brisa
+        self.stench = board.expand(self.wumpus)
+        self.breeze = board.expand(self.pit)
+
+    def shoot(self, origin, target):
+        """Flecha en línea recta desde ``origin`` hacia el vecino ``target``.
+
+        Mata al primer Wumpus del camino y devuelve True si hubo grito.
+        """
+        direction = (target[0] - origin[0], target[1] - origin[1])
+        hits = self.board.rays[self.board.index(origin)][direction] & self.wumpus
+        if not hits:
+            return False
+        if direction in ((-1, 0), (0, -1)):
+            # Hacia arriba o a la izquierda el primero es el índice más alto
+            first = 1 << (hits.bit_length() - 1)
+        else:
+            first = hits & -hits
+        self.wumpus &= ~first
+        self.recompute_stench()
+        return True
+
+    def recompute_stench(self):
+        """Recalcula el hedor en todo el mapa a partir de los Wumpus vivos."""
+        self.stench = self.board.expand(self.wumpus)
+
+
+# --------------------------- RESTRICCIONES ------------------------- #
+class HazardConstraints:
+    """Restricciones de un peligro: hedor para Wumpus, brisa para hoyos.
+
+    Cada casilla con la percepción guarda la máscara de sus vecinos aún no
+    seguros (el peligro está en alguno). ``possible`` es la intersección de
+    todas ellas y se mantiene al día sin recorrerlas:
+
+    - ``add`` la corta con la nueva máscara.
+    - ``mark_safe`` quita las casillas nuevas seguras solo de las
+      restricciones que las contienen: sus fuentes son los vecinos de esas
+      casillas, ``board.expand(safe) & sources``.
+
+    Una restricción que se queda vacía deja ``possible`` vacío, igual que la
+    intersección completa.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.masks = {}     # índice de la casilla con percepción -> vecinos no seguros
+        self.sources = 0    # máscara de las casillas con restricción
+        self.possible = 0
+
+    def __bool__(self):
+        return bool(self.masks)
+
+    def add(self, index, mask):
+        if self.masks:
+            self.possible &= mask
+        else:
+            self.possible = mask
+        self.masks[index] = mask
+        self.sources |= 1 << index
+
+    def mark_safe(self, safe):
+        touched = self.board.expand(safe) & self.sources
+        for index in self.board.indices(touched):
+            self.masks[index] &= ~safe
+        self.possible &= ~safe
+
+    def clear(self):
+        self.masks.clear()
+        self.sources = 0
+        self.possible = 0
+
+
+# ------------------------------ AGENTE ----------------------------- #
+@dataclass
+class Step:
+    event: str
+    pos: tuple
+    hazard: Optional[str] = None    # "wumpus" o "pit" si murió
+    killed: bool = False            # grito tras disparar
+
+
+@dataclass
+class EpisodeResult:
+    success: bool
+    outcome: str        # GOLD, IMPOSSIBLE o TIMEOUT
+    score: int
+    steps: int
+    attempts: int
+    deaths: int
+    risky_moves: int = 0    # pasos hacia una casilla no segura elegida por P(muerte)
+
+
+class Agent:
+    """Pedro: explora el mundo con lo que percibe y recuerda dónde murió.
+
+    El conocimiento (visitadas, seguras, peligrosas, posibles Wumpus y hoyos)
+    son máscaras de bits sobre ``world.board``.
+
+    ``take_risks``: cuando ya no queda ninguna casilla segura sin visitar,
+    va a la casilla de la frontera con menor P(muerte) en vez de dar
+    vueltas por las seguras hasta agotar los pasos. Desactivado por
+    defecto: sin él, Pedro sigue la política original de la GUI.
+    """
+
+    def __init__(self, world, rng=None, take_risks=False):
+        self.world = world
+        self.board = world.board
+        self.rng = rng or random
+        self.take_risks = take_risks
+        self.score = 0
+        self.risky_moves = 0
+
+        # Memoria entre intentos en el mismo mundo
+        self.global_danger = 0
+        self.known_pits = 0         # dónde murió y por qué
+        self.known_wumpus = 0
+        self.kills = 0              # gritos oídos: Wumpus vivos = num_wumpus - kills
+        self.reset()
+
+    @property
+    def pos(self):
+        return (self.row, self.col)
+
+    @property
+    def done(self):
+        return not self.alive or self.has_gold or self.impossible
+
+    # ----------------------- ESTADO DEL AGENTE ------------------- #
+    def reset(self):
+        """Reinicia intento en el mismo mundo (mantiene memoria global)."""
+        self.row, self.col = self.world.start_pos
+        self.alive = True
+        self.has_gold = False
+        self.impossible = False
+
+        # Conocimiento por intento
+        self.visited = 0
+        self.known_safe = self.board.bit(self.world.start_pos)
+        self.known_danger = self.global_danger
+        self.stench_info = HazardConstraints(self.board)
+        self.breeze_info = HazardConstraints(self.board)
+        self.possible_wumpus = 0
+        self.possible_pits = 0
+
+        # Percepciones para la inferencia probabilística
+        self.pit_free = self.known_safe
+        self.wumpus_free = self.known_safe
+        self.breeze_seen = 0
+        self.stench_seen = 0
+
+        # Para evitar bucles
+        self.visit_count = {}
+        self.prev_pos = None
+
+        # Nueva flecha para el nuevo intento
+        self.has_arrow = True
+
+        self.update_knowledge()
+
+    def step(self):
+        """Un paso del agente (disparar o moverse); None si el intento terminó."""
+        if self.done:
+            return None
+
+        current_pos = self.pos
+
+        # 1) Decisión de flecha (si hay un único vecino muy probable)
+        if self.has_arrow:
+            target = self.choose_shoot_target()
+            if target is not None:
+                killed = self.shoot_arrow(target)
+                return Step(SHOOT, current_pos, killed=killed)
+
+        # 2) Si no dispara flecha, se mueve
+        next_pos = self.choose_next_move()
+        if next_pos is None:
+            self.impossible = True
+            self.score += IMPOSSIBLE_PENALTY
+            return Step(IMPOSSIBLE, current_pos)
+
+        self.prev_pos = current_pos
+        self.row, self.col = next_pos
+        b = self.board.bit(next_pos)
+        world = self.world
+
+        # Coste del movimiento
+        self.score += MOVE_COST
+
+        # Muerte
+        if b & (world.wumpus | world.pit):
+            self.alive = False
+            self.global_danger |= b
+            self.known_danger |= b
+            if b & world.wumpus:
+                self.known_wumpus |= b
+            else:
+                self.known_pits |= b
+            self.score += DEATH_PENALTY
+            return Step(DEATH, next_pos, hazard="wumpus" if b & world.wumpus else "pit")
+
+        self.update_knowledge()
+
+        # Oro
+        if b & world.gold:
+            self.has_gold = True
+            self.score += GOLD_REWARD
+            return Step(GOLD, next_pos)
+
+        return Step(MOVE, next_pos)
+
+    def run_episode(self, max_attempts=50, max_steps=None):
+        """Intentos en el mismo mundo hasta el oro, rendirse o agotar el límite.
+
+        ``max_steps`` corta un intento que da vueltas entre casillas seguras
+        sin salida (por defecto 4 pasos por casilla del mundo).
+        """
+        if max_steps is None:
+            max_steps = 4 * self.world.size * self.world.size
+
+        steps = 0
+        deaths = 0
+        attempts = 0
+        outcome = TIMEOUT
+        while attempts < max_attempts:
+            if attempts:
+                self.reset()
+            attempts += 1
+
+            for _ in range(max_steps):
+                result = self.step()
+                steps += 1
+                if result.event in (MOVE, SHOOT):
+                    continue
+                outcome = result.event
+                break
+            else:
+                outcome = TIMEOUT
+
+            if outcome == DEATH:
+                deaths += 1
+                continue
+            break
+
+        if outcome == DEATH:
+            outcome = TIMEOUT
+        return EpisodeResult(outcome == GOLD, outcome, self.score, steps, attempts, deaths,
+                             self.risky_moves)
+
+    # --------------------- CONOCIMIENTO DEL AGENTE ---------------- #
+    def update_knowledge(self):
+        pos = self.pos
+        index = self.board.index(pos)
+        b = 1 << index
+        safe_before = self.known_safe
+        self.visited |= b
+        self.known_safe |= b
+
+        # Nº de veces que visita la casilla (para evitar bucles)
+        self.visit_count[pos] = self.visit_count.get(pos, 0) + 1
+
+        stench = self.world.stench & b
+        breeze = self.world.breeze & b
+        neighbors = self.board.neighbor_mask[index]
+
+        # Sin hedor ni brisa ⇒ vecinos seguros
+        if not stench and not breeze:
+            self.known_safe |= neighbors
+
+        # Cada percepción por separado, para hazard_probabilities
+        self.pit_free |= b | (0 if breeze else neighbors)
+        self.wumpus_free |= b | (0 if stench else neighbors)
+        self.breeze_seen = self.breeze_seen | b if breeze else self.breeze_seen & ~b
+        self.stench_seen = self.stench_seen | b if stench else self.stench_seen & ~b
+
+        # Casillas que pasan a ser seguras salen de las restricciones
+        newly_safe = self.known_safe & ~safe_before
+        if newly_safe:
+            self.stench_info.mark_safe(newly_safe)
+            self.breeze_info.mark_safe(newly_safe)
+
+        unknown_neighbors = neighbors & ~self.known_safe
+
+        # Info de hedor
+        if stench and unknown_neighbors:
+            self.stench_info.add(index, unknown_neighbors)
+
+        # Info de brisa
+        if breeze and unknown_neighbors:
+            self.breeze_info.add(index, unknown_neighbors)
+
+        # Posibles Wumpus y hoyos (intersección mantenida al día)
+        self.possible_wumpus = self.stench_info.possible
+        self.possible_pits = self.breeze_info.possible
+
+    # --------------------- FLECHA Y GRITO ------------------------- #
+    def choose_shoot_target(self):
+        """Decide si vale la pena disparar flecha a un vecino."""
+        if not self.has_arrow:
+            return None
+        # Solo dispara si hay EXACTAMENTE un vecino muy sospechoso de Wumpus
+        targets = self.board.neighbor_mask[self.board.index(self.pos)] & self.possible_wumpus
+        if targets and not targets & (targets - 1):
+            return self.board.pos(targets.bit_length() - 1)
+        return None
+
+    def shoot_arrow(self, target):
+        """Dispara la flecha en la dirección del vecino objetivo; True si hubo grito."""
+        killed = self.world.shoot(self.pos, target)
+
+        self.has_arrow = False
+        # Una sola vez: la interfaz original (antes de este motor) sumaba
+        # ARROW_COST y KILL_REWARD dos veces por disparo, así que sus puntos
+        # no se comparan con los de aquí (≈ +11 por episodio con 1W/6H)
+        self.score += ARROW_COST
+        if killed:
+            self.score += KILL_REWARD
+            self.kills += 1
+
+        # Limpiar inferencias de Wumpus (se reconstruyen con nuevas percepciones)
+        self.stench_info.clear()
+        self.possible_wumpus = 0
+        self.stench_seen = 0
+
+        # Actualizar conocimiento en la casilla actual con la nueva situación
+        self.update_knowledge()
+        return killed
+
+    # --------------------- ELECCIÓN DEL MOVIMIENTO --------------- #
+    def choose_next_move(self):
+        """Escoge la siguiente casilla a visitar (optimizada)."""
+        index = self.board.index(self.pos)
+        known_safe = self.known_safe
+
+        free = self.board.neighbor_mask[index] & ~self.known_danger
+        if not free:
+            return None
+        candidates = [(p, b) for p, b in self.board.neighbor_bits[index] if b & free]
+
+        # 0. Ninguna casilla segura por explorar: revisitar no aporta nada,
+        #    arriesgar en la frontera sí
+        if self.take_risks and not known_safe & ~self.visited & ~self.known_danger:
+            probabilities = self.hazard_probabilities()
+            if probabilities is not None:
+                return self.risky_move(probabilities)
+
+        # 1. Vecinos seguros no visitados
+        if free & known_safe & ~self.visited:
+            safe_unvisited = [p for p, b in candidates
+                              if b & known_safe and not b & self.visited]
+            return self.rng.choice(safe_unvisited)
+
+        # 2. Vecinos seguros (minimizar nº de visitas y evitar rebote)
+        if free & known_safe:
+            best_pos = None
+            best_score = float("inf")
+            for p, b in candidates:
+                if not b & known_safe:
+                    continue
+                visits = self.visit_count.get(p, 0)
+                back_penalty = 2 if p == self.prev_pos else 0
+                score = visits + back_penalty
+                if score < best_score:
+                    best_score = score
+                    best_pos = p
+            return best_pos
+
+        # 3. Sin nada claramente seguro: menor probabilidad de morir,
+        #    desempatando por visitas y rebote
+        probabilities = self.hazard_probabilities()
+        possible = self.possible_wumpus | self.possible_pits
+        best_pos = None
+        best_key = None
+        for p, b in candidates:
+            if probabilities is not None:
+                risk = probabilities.death(self.board.index(p))
+            else:
+                risk = 1 if b & possible else 0
+            score = 0
+            if not b & self.visited:
+                score -= 0.5
+            if p == self.prev_pos:
+                score += 2
+            visits = self.visit_count.get(p, 0)
+            score += 0.7 * visits
+            key = (risk, score)
+            if best_key is None or key < best_key:
+                best_key = key
+                best_pos = p
+        return best_pos
+
+    def risky_move(self, probabilities):
+        """Paso hacia la casilla de la frontera con menor P(muerte).
+
+        La frontera son las casillas desconocidas vecinas de las visitadas;
+        se llega por casillas seguras. None (imposible) si no hay frontera o
+        entrar en cualquiera es muerte segura.
+        """
+        board = self.board
+        walkable = self.known_safe & ~self.known_danger
+        frontier = board.expand(self.visited) & ~walkable & ~self.known_danger
+        target = None
+        best_risk = 1.0
+        for i in board.indices(frontier):
+            risk = probabilities.death(i)
+            if risk < best_risk - 1e-12:
+                best_risk = risk
+                target = i
+        if target is None:
+            return None
+
+        # BFS por capas desde el objetivo hasta la posición actual
+        here = board.bit(self.pos)
+        layers = [1 << target]
+        reached = layers[0]
+        while not layers[-1] & here:
+            layer = board.expand(layers[-1]) & walkable & ~reached
+            if not layer:
+                return None
+            reached |= layer
+            layers.append(layer)
+
+        self.risky_moves += 1
+        toward = layers[-2]
+        for p, b in board.neighbor_bits[board.index(self.pos)]:
+            if b & toward:
+                return p
+
+    def hazard_probabilities(self):
+        """P(hoyo) y P(Wumpus) exactas con lo percibido en este intento.
+
+        None si las observaciones no cuadran con los totales (por ejemplo,
+        la flecha mató al Wumpus de una casilla donde el agente murió).
+        """
+        return hazard_probabilities(
+            self.board, self.pit_free, self.wumpus_free,
+            self.breeze_seen, self.stench_seen,
+            self.known_pits, self.known_wumpus,
+            self.world.num_pits, self.world.num_wumpus - self.kills)
+
+
+def run_episode(num_wumpus=DEFAULT_WUMPUS, num_pits=DEFAULT_PITS, seed=None,
+                size=GRID_SIZE, max_attempts=50, max_steps=None, take_risks=False):
+    """Mundo nuevo + agente nuevo con la misma semilla; devuelve el EpisodeResult."""
+    rng = random.Random(seed)
+    world = World(num_wumpus, num_pits, size, rng)
+    return Agent(world, rng, take_risks).run_episode(max_attempts, max_steps)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    episodes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    start = time.perf_counter()
+    results = [run_episode(seed=seed) for seed in range(episodes)]
+    elapsed = time.perf_counter() - start
+    wins = sum(r.success for r in results)
+    print(f"{episodes} episodios en {elapsed:.2f}s ({episodes / elapsed:.0f}/s): "
+          f"oro {wins / episodes:.1%}, "
+          f"puntos medios {sum(r.score for r in results) / episodes:.1f}")
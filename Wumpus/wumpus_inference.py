@@ -0,0 +1,333 @@
+# wumpus_inference.py
+# Probabilidad exacta de hoyo y de Wumpus en cada casilla desconocida, dado
+# lo que el agente percibió y los totales conocidos (num_pits, Wumpus vivos).
+#
+# Modelo: cada casilla desconocida está vacía, tiene hoyo o tiene Wumpus
+# (nunca ambos, como en World.generate). Una casilla con brisa necesita al
+# menos un hoyo vecino y una con hedor al menos un Wumpus vecino; la falta
+# de brisa/hedor ya llega como casillas libres de ese peligro. Todos los
+# mundos consistentes pesan igual. La posición del oro se ignora.
+#
+# Para que sea tratable en mundos grandes:
+# - Frontera = casillas que aparecen en alguna restricción. Se parte en
+#   componentes conexas (dos casillas se unen si comparten restricción) y
+#   cada componente se enumera por separado, contando soluciones por
+#   (Wumpus usados, hoyos usados).
+# - El resto ("mar") no tiene restricciones: sus maneras de colocar los
+#   peligros restantes se cuentan con combinatoria, sin enumerar.
+# - Las componentes se combinan por convolución sobre (Wumpus, hoyos).
+# - El conteo de una componente se cachea por su firma (dominios y
+#   restricciones con las casillas renumeradas por orden), así que la misma
+#   forma se reutiliza entre pasos, episodios y posiciones del tablero.
+# - Enumerar una componente es exponencial en sus casillas: las de más de
+#   ``max_cells`` no se enumeran. Cuentan como mar para el resto y sus
+#   casillas reciben una estimación por casilla (``approximate``).
+
+from functools import lru_cache
+from math import comb
+
+CAN_PIT = 1
+CAN_WUMPUS = 2
+
+PIT = "pit"
+WUMPUS = "wumpus"
+
+# Componentes distintas que se guardan contadas
+COMPONENT_CACHE_SIZE = 1 << 16
+
+# Casillas máximas de una componente que se enumera exactamente
+MAX_COMPONENT_CELLS = 20
+
+
+@lru_cache(maxsize=None)
+def sea_ways(both, pit_only, wumpus_only, wumpus, pits):
+    """Maneras de poner ``wumpus`` y ``pits`` peligros en el mar, sin repetir casilla."""
+    if wumpus < 0 or pits < 0:
+        return 0
+    total = 0
+    for w_in_both in range(min(both, wumpus) + 1):
+        w_rest = wumpus - w_in_both
+        if w_rest > wumpus_only:
+            continue
+        total += (comb(both, w_in_both) * comb(wumpus_only, w_rest)
+                  * comb(both - w_in_both + pit_only, pits))
+    return total
+
+
+@lru_cache(maxsize=COMPONENT_CACHE_SIZE)
+def count_component(domains, constraints, max_wumpus, max_pits):
+    """Enumera una componente.
+
+    ``domains[i]`` combina CAN_PIT / CAN_WUMPUS; ``constraints`` son pares
+    (peligro, índices locales) que exigen al menos un peligro de ese tipo.
+    Devuelve {(wumpus, hoyos): (soluciones, hoyos por casilla, Wumpus por casilla)}.
+    """
+    n = len(domains)
+    # Cada restricción se comprueba al asignar su última casilla
+    closing = [[] for _ in range(n)]
+    for kind, cells in constraints:
+        closing[max(cells)].append((kind == PIT, cells))
+
+    table = {}
+    state = [0] * n     # 0 vacía, CAN_PIT hoyo, CAN_WUMPUS Wumpus
+
+    def record(w, p):
+        entry = table.get((w, p))
+        if entry is None:
+            entry = table[(w, p)] = [0, [0] * n, [0] * n]
+        entry[0] += 1
+        pit_counts, wumpus_counts = entry[1], entry[2]
+        for i, s in enumerate(state):
+            if s == CAN_PIT:
+                pit_counts[i] += 1
+            elif s == CAN_WUMPUS:
+                wumpus_counts[i] += 1
+
+    def assign(i, w, p):
+        if i == n:
+            record(w, p)
+            return
+        for value in (0, CAN_PIT, CAN_WUMPUS):
+            if value and not domains[i] & value:
+                continue
+            if value == CAN_PIT and p == max_pits:
+                continue
+            if value == CAN_WUMPUS and w == max_wumpus:
+                continue
+            state[i] = value
+            ok = True
+            for is_pit, cells in closing[i]:
+                wanted = CAN_PIT if is_pit else CAN_WUMPUS
+                if not any(state[j] == wanted for j in cells):
+                    ok = False
+                    break
+            if ok:
+                assign(i + 1, w + (value == CAN_WUMPUS), p + (value == CAN_PIT))
+        state[i] = 0
+
+    assign(0, 0, 0)
+    return {key: (c, tuple(pc), tuple(wc)) for key, (c, pc, wc) in table.items()}
+
+
+def convolve(a, b):
+    out = {}
+    for (w1, p1), c1 in a.items():
+        for (w2, p2), c2 in b.items():
+            key = (w1 + w2, p1 + p2)
+            out[key] = out.get(key, 0) + c1 * c2
+    return out
+
+
+class HazardProbabilities:
+    """Resultado: P(hoyo) y P(Wumpus) por índice de casilla."""
+
+    def __init__(self, pit, wumpus, sea, pit_free, wumpus_free, known_pits, known_wumpus,
+                 approximate=0):
+        self.pit = pit              # índice de frontera -> P(hoyo)
+        self.wumpus = wumpus        # índice de frontera -> P(Wumpus)
+        self.sea = sea              # dominio -> (P(hoyo), P(Wumpus)) fuera de la frontera
+        self.approximate = approximate  # máscara de casillas con valor estimado
+        self.pit_free = pit_free
+        self.wumpus_free = wumpus_free
+        self.known_pits = known_pits
+        self.known_wumpus = known_wumpus
+
+    def at(self, index):
+        """(P(hoyo), P(Wumpus)) de una casilla."""
+        b = 1 << index
+        if b & self.known_pits:
+            return 1.0, 0.0
+        if b & self.known_wumpus:
+            return 0.0, 1.0
+        if index in self.pit:
+            return self.pit[index], self.wumpus[index]
+        domain = (0 if b & self.pit_free else CAN_PIT) | (0 if b & self.wumpus_free else CAN_WUMPUS)
+        if not domain:
+            return 0.0, 0.0
+        return self.sea[domain]
+
+    def death(self, index):
+        """Probabilidad de morir al entrar (los dos peligros son excluyentes)."""
+        pit, wumpus = self.at(index)
+        return pit + wumpus
+
+
+def popcount(mask):
+    return bin(mask).count("1")
+
+
+def components(board, can_pit, can_wumpus, breeze, stench):
+    """Restricciones activas y su partición en componentes conexas.
+
+    Devuelve una lista de (máscara de casillas, restricciones) con las
+    restricciones como (peligro, máscara de casillas).
+    """
+    constraints = []
+    for kind, sources, allowed in ((PIT, breeze, can_pit), (WUMPUS, stench, can_wumpus)):
+        for source in board.indices(sources):
+            constraints.append((kind, board.neighbor_mask[source] & allowed))
+
+    # Unión de restricciones que comparten casilla
+    groups = []     # [máscara, [restricciones]]
+    for constraint in constraints:
+        mask = constraint[1]
+        merged = [mask, [constraint]]
+        rest = []
+        for group in groups:
+            if group[0] & merged[0]:
+                merged[0] |= group[0]
+                merged[1].extend(group[1])
+            else:
+                rest.append(group)
+        rest.append(merged)
+        groups = rest
+    return [tuple(group) for group in groups]
+
+
+def hazard_probabilities(board, pit_free, wumpus_free, breeze, stench,
+                         known_pits, known_wumpus, num_pits, num_wumpus,
+                         max_cells=MAX_COMPONENT_CELLS):
+    """P(hoyo) y P(Wumpus) para todas las casillas.
+
+    ``pit_free`` / ``wumpus_free``: casillas sin ese peligro (visitadas o
+    vecinas de una sin brisa / sin hedor). ``breeze`` / ``stench``: casillas
+    visitadas con esa percepción. ``known_pits`` / ``known_wumpus``: peligros
+    ya localizados (donde murió el agente). Devuelve None si lo observado no
+    es consistente con los totales.
+
+    Exactas salvo en las componentes de más de ``max_cells`` casillas
+    (None = sin límite), que se estiman (ver ``estimate_component``).
+    """
+    fixed = known_pits | known_wumpus
+    pits_left = num_pits - popcount(known_pits)
+    wumpus_left = num_wumpus - popcount(known_wumpus)
+    # Percepciones ya explicadas por un peligro localizado no restringen nada
+    breeze &= ~board.expand(known_pits)
+    stench &= ~board.expand(known_wumpus)
+
+    can_pit = board.full & ~fixed & ~pit_free
+    can_wumpus = board.full & ~fixed & ~wumpus_free
+
+    parts = components(board, can_pit, can_wumpus, breeze, stench)
+    large = []
+    if max_cells is not None:
+        large = [part for part in parts if popcount(part[0]) > max_cells]
+        parts = [part for part in parts if popcount(part[0]) <= max_cells]
+    frontier = 0
+    for mask, _ in parts:
+        frontier |= mask
+
+    # Mar: casillas variables fuera de toda restricción, por dominio
+    sea_pit = can_pit & ~frontier
+    sea_wumpus = can_wumpus & ~frontier
+    both = popcount(sea_pit & sea_wumpus)
+    pit_only = popcount(sea_pit & ~sea_wumpus)
+    wumpus_only = popcount(sea_wumpus & ~sea_pit)
+    sea_count = {CAN_PIT | CAN_WUMPUS: both, CAN_PIT: pit_only, CAN_WUMPUS: wumpus_only}
+
+    # Conteo cacheado de cada componente
+    tables = []
+    parts_cells = []
+    for mask, cons in parts:
+        cells = list(board.indices(mask))
+        local = {index: i for i, index in enumerate(cells)}
+        signature = tuple(sorted(
+            (kind, tuple(local[i] for i in board.indices(m))) for kind, m in cons
+        ))
+        if any(not cells_ for _, cells_ in signature):
+            return None     # una percepción sin ninguna casilla posible
+        domains = tuple(((can_pit >> i) & 1) * CAN_PIT | ((can_wumpus >> i) & 1) * CAN_WUMPUS
+                        for i in cells)
+        parts_cells.append(cells)
+        tables.append(count_component(domains, signature,
+                                      max(0, wumpus_left), max(0, pits_left)))
+    counts = [{key: entry[0] for key, entry in table.items()} for table in tables]
+
+    # Convoluciones prefijo/sufijo: "todas las demás componentes" de cada una
+    prefix = [{(0, 0): 1}]
+    for c in counts:
+        prefix.append(convolve(prefix[-1], c))
+    suffix = [{(0, 0): 1}]
+    for c in reversed(counts):
+        suffix.append(convolve(suffix[-1], c))
+    suffix.reverse()
+
+    def sea(w, p, d_both=0, d_pit=0, d_wumpus=0):
+        return sea_ways(both - d_both, pit_only - d_pit, wumpus_only - d_wumpus,
+                        wumpus_left - w, pits_left - p)
+
+    everything = prefix[-1]
+    total = sum(c * sea(w, p) for (w, p), c in everything.items())
+    if total == 0:
+        return None
+
+    pit_prob = {}
+    wumpus_prob = {}
+    for k, cells in enumerate(parts_cells):
+        others = convolve(prefix[k], suffix[k + 1])
+        pit_mass = [0] * len(cells)
+        wumpus_mass = [0] * len(cells)
+        for (w, p), (_, pit_counts, wumpus_counts) in tables[k].items():
+            weight = sum(c * sea(w + w2, p + p2) for (w2, p2), c in others.items())
+            if not weight:
+                continue
+            for i in range(len(cells)):
+                pit_mass[i] += pit_counts[i] * weight
+                wumpus_mass[i] += wumpus_counts[i] * weight
+        for i, index in enumerate(cells):
+            pit_prob[index] = pit_mass[i] / total
+            wumpus_prob[index] = wumpus_mass[i] / total
+
+    # Una casilla concreta del mar, por dominio
+    sea_prob = {}
+    for domain, (d_both, d_pit, d_wumpus) in ((CAN_PIT | CAN_WUMPUS, (1, 0, 0)),
+                                              (CAN_PIT, (0, 1, 0)),
+                                              (CAN_WUMPUS, (0, 0, 1))):
+        if not sea_count[domain]:
+            continue
+        pit = sum(c * sea(w, p + 1, d_both, d_pit, d_wumpus)
+                  for (w, p), c in everything.items()) if domain & CAN_PIT else 0
+        wumpus = sum(c * sea(w + 1, p, d_both, d_pit, d_wumpus)
+                     for (w, p), c in everything.items()) if domain & CAN_WUMPUS else 0
+        sea_prob[domain] = (pit / total, wumpus / total)
+
+    approximate = 0
+    for mask, cons in large:
+        estimate_component(board, mask, cons, can_pit, can_wumpus, sea_prob,
+                           pit_prob, wumpus_prob)
+        approximate |= mask
+
+    return HazardProbabilities(pit_prob, wumpus_prob, sea_prob, pit_free, wumpus_free,
+                               known_pits, known_wumpus, approximate)
+
+
+def estimate_component(board, mask, constraints, can_pit, can_wumpus, sea_prob,
+                       pit_prob, wumpus_prob):
+    """Marginales aproximadas de una componente demasiado grande para enumerar.
+
+    La componente se contó como mar, así que cada casilla parte de la
+    probabilidad del mar para su dominio. Cada percepción exige al menos un
+    peligro entre sus k casillas posibles: la casilla recibe como mínimo 1/k
+    por la restricción más fuerte que la contiene. Si P(hoyo) + P(Wumpus)
+    pasa de 1 se reescalan (son excluyentes).
+    """
+    floor_pit = {}
+    floor_wumpus = {}
+    for kind, cells in constraints:
+        allowed = cells & (can_pit if kind == PIT else can_wumpus)
+        share = 1.0 / popcount(allowed)
+        floor = floor_pit if kind == PIT else floor_wumpus
+        for index in board.indices(allowed):
+            floor[index] = max(floor.get(index, 0.0), share)
+
+    for index in board.indices(mask):
+        b = 1 << index
+        domain = (CAN_PIT if b & can_pit else 0) | (CAN_WUMPUS if b & can_wumpus else 0)
+        base_pit, base_wumpus = sea_prob.get(domain, (0.0, 0.0))
+        pit = max(base_pit, floor_pit.get(index, 0.0))
+        wumpus = max(base_wumpus, floor_wumpus.get(index, 0.0))
+        if pit + wumpus > 1.0:
+            scale = 1.0 / (pit + wumpus)
+            pit, wumpus = pit * scale, wumpus * scale
+        pit_prob[index] = pit
+        wumpus_prob[index] = wumpus